@@ -90,6 +90,42 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+# (movie detail responses are cached only w/ a backend shared between processes, ex. file or memcached,
+#  as writes by crawler, admin or other workers could not invalidate a process-local one)
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+
+# Autocomplete
+# (in-memory prefix indexes loaded from snapshot file if any, else built from database)
+
+AUTOCOMPLETE_SNAPSHOT = os.getenv("AUTOCOMPLETE_SNAPSHOT")
+AUTOCOMPLETE_REFRESH_INTERVAL = int(os.getenv("AUTOCOMPLETE_REFRESH_INTERVAL", 60))
+
+
+# Feeds
+# (activities of users w/ more followers are pulled by followers instead of pushed)
+
+FEED_FANOUT_LIMIT = int(os.getenv("FEED_FANOUT_LIMIT", 1000))
+
+
+# Matrix factorization
+# (versions of user & movie factor arrays memory-mapped by server processes)
+
+FACTORIZATION_DIR = os.getenv(
+    "FACTORIZATION_DIR", os.path.join(BASE_DIR, "factorization")
+)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
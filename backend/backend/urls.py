@@ -16,12 +16,14 @@ Including another URLconf
 from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
+from views import MetricsView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api-auth/", include("rest_framework.urls")),
     path("api/", include("accounts.urls")),
     path("api/", include("movies.urls")),
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),
 ]
 if settings.DEBUG:
     from django.conf.urls.static import static
@@ -1,51 +1,91 @@
 import re
+from collections.abc import Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import Field, fields, is_dataclass
+from functools import partial
 from importlib import import_module
-from typing import Literal, NewType, Type, Union, get_args, get_origin, get_type_hints
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Literal,
+    NewType,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
 
-from decorators import lazy_load_property
+from decorators import lazy_load_classmethod
 
 
 class TypeHintsMixin:
-    @lazy_load_property
-    def type_hints(self) -> dict[str, Type]:
+    __slots__ = ()
+
+    @lazy_load_classmethod
+    def class_type_hints(cls) -> dict[str, Type]:
+        """
+        resolved once per dataclass & shared by every instance of it
+        """
         try:
-            return get_type_hints(self)
+            return get_type_hints(cls)
         except NameError as e:
-            return self._error_handling(e)
+            return cls._error_handling(e)
 
-    def _error_handling(self, e: NameError) -> dict[str, Type]:
+    @property
+    def type_hints(self) -> dict[str, Type]:
+        return self.class_type_hints()
+
+    @classmethod
+    def _error_handling(cls, e: NameError) -> dict[str, Type]:
         name = re.search(
             r"(?<=name ')[a-zA-Z_][a-zA-Z0-9_]*(?=' is not defined)", e.args[0]
         ).group(0)
         _g = globals()
         _g[name] = getattr(import_module("movies.crawlers.custom_types"), name)
-        return self._with_args_kwargs(globalns=_g)
+        return cls._with_args_kwargs(globalns=_g)
 
-    def _with_args_kwargs(self, *args, **kwargs) -> dict[str, Type]:
+    @classmethod
+    def _with_args_kwargs(cls, *args, **kwargs) -> dict[str, Type]:
         try:
-            return get_type_hints(self, *args, **kwargs)
+            return get_type_hints(cls, *args, **kwargs)
         except NameError as e:
-            return self._error_handling(e)
+            return cls._error_handling(e)
 
 
 class EmptyStringToNoneMixin(TypeHintsMixin):
-    def is_optional_string_field(self, field: Field) -> bool:
-        ftype = self.type_hints.get(field.name)
+    __slots__ = ()
+
+    @staticmethod
+    def is_optional_string_type(ftype: Type) -> bool:
         origin_check = get_origin(ftype) is Union
         args_check = get_args(ftype) == (str, type(None))
         return origin_check and args_check
 
+    def is_optional_string_field(self, field: Field) -> bool:
+        return self.is_optional_string_type(self.type_hints.get(field.name))
+
     def get_optional_string_fields(self) -> list[Field]:
         return [f for f in fields(self) if self.is_optional_string_field(f)]
 
+    @lazy_load_classmethod
+    def optional_string_field_names(cls) -> tuple[str, ...]:
+        type_hints = cls.class_type_hints()
+        return tuple(
+            f.name
+            for f in fields(cls)
+            if cls.is_optional_string_type(type_hints.get(f.name))
+        )
+
     def __post_init__(self):
         if hasattr(super(), "__post_init__"):
             super().__post_init__()
 
-        for f in self.get_optional_string_fields():
-            if getattr(self, f.name) == "":
-                setattr(self, f.name, None)
+        for fname in self.optional_string_field_names():
+            if getattr(self, fname) == "":
+                setattr(self, fname, None)
 
 
 DataClass = NewType("DataClass", object)
@@ -55,15 +95,90 @@ DataClassArray = (
 )
 
 
+# {dataclass: {array field name: (index, raw item) -> whether to keep the item}}
+Projection = dict[Type, dict[str, Callable[[int, Any], bool]]]
+
+_decoding: ContextVar[tuple[Projection, bool]] = ContextVar(
+    "decoding", default=({}, False)
+)
+
+
+@contextmanager
+def projected_decoding(projection: Projection, lazy: bool = False):
+    """
+    NestedInitMixin dataclasses initialized inside this context
+      - keep only the raw array items passing `projection` filters
+      - lazy: convert nested arrays into dataclasses on first item access
+    """
+    token = _decoding.set((projection, lazy))
+    try:
+        yield
+    finally:
+        _decoding.reset(token)
+
+
+class LazyDataClassList(Sequence):
+    """
+    Sequence of raw items converted into dataclasses all at once on first item access
+      (len() & bool() are answered w/o conversion)
+      - wraps raw items instead of subclassing list, so that no list method or
+        C-level list access (ex. `+`, `json.dumps()`) can read unconverted items
+    """
+
+    __slots__ = ("_items", "_convert", "_decoding")
+
+    def __init__(self, raw_items: Iterable, convert: Callable[[Any], DataClass]):
+        self._items = list(raw_items)
+        self._convert = convert
+        self._decoding = _decoding.get()
+
+    def _load(self) -> list[DataClass]:
+        if self._convert is not None:
+            token = _decoding.set(self._decoding)
+            try:
+                self._items = list(map(self._convert, self._items))
+            finally:
+                _decoding.reset(token)
+            self._convert = None
+        return self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, idx):
+        return self._load()[idx]
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __reversed__(self):
+        return reversed(self._load())
+
+    def __contains__(self, item) -> bool:
+        return item in self._load()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyDataClassList):
+            other = other._load()
+        return self._load() == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._load()!r})"
+
+
 class NestedInitMixin(TypeHintsMixin):
-    def is_nested_field(self, field: Field) -> Literal[0, 1, 2]:
+    __slots__ = ()
+
+    @staticmethod
+    def nested_case(ftype: Type) -> Literal[0, 1, 2]:
         """
         return type:
           - 0: not a dataclass nested field or complex typed array
           - 1: dataclass nested in array like field
           - 2: bare dataclass field
         """
-        ftype = self.get_field_type(field)
         if is_dataclass(ftype):
             return 2
         else:
@@ -79,12 +194,27 @@ class NestedInitMixin(TypeHintsMixin):
             ) and is_dataclass(arg_types[0])
             return int(origin_check and args_check)
 
+    def is_nested_field(self, field: Field) -> Literal[0, 1, 2]:
+        return self.nested_case(self.get_field_type(field))
+
     def get_nested_fields(self) -> list[tuple[Field, int]]:
         return [(f, case) for f in fields(self) if (case := self.is_nested_field(f))]
 
     def get_field_type(self, field: Field) -> Type:
         return self.type_hints[field.name]
 
+    @lazy_load_classmethod
+    def nested_fields_plan(cls) -> tuple[tuple[str, int, DataClass], ...]:
+        """
+        (field name, nested case, dataclass to convert into) for each nested field
+        """
+        type_hints = cls.class_type_hints()
+        return tuple(
+            (f.name, case, get_args(ftype)[0] if case == 1 else ftype)
+            for f in fields(cls)
+            if (case := cls.nested_case(ftype := type_hints[f.name]))
+        )
+
     def to_dataclass_array(
         self, curr: ArrayLike, dataclass: DataClass
     ) -> DataClassArray:
@@ -114,22 +244,40 @@ class NestedInitMixin(TypeHintsMixin):
     def __post_init__(self):
         if hasattr(super(), "__post_init__"):
             super().__post_init__()
-        for f, case in self.get_nested_fields():
-            curr = getattr(self, f.name)
-            ftype = self.get_field_type(f)
+        projection, lazy = _decoding.get()
+        item_filters = projection.get(self.__class__, {})
+        for fname, case, dataclass in self.nested_fields_plan():
+            curr = getattr(self, fname)
             if case == 1:
-                if any([not is_dataclass(inner) for inner in curr]):
+                if item_filter := item_filters.get(fname):
+                    curr = type(curr)(
+                        item
+                        for idx, item in enumerate(curr)
+                        if is_dataclass(item) or item_filter(idx, item)
+                    )
+                if lazy and isinstance(curr, list):
+                    setattr(
+                        self,
+                        fname,
+                        LazyDataClassList(
+                            curr,
+                            convert=partial(self.to_dataclass, dataclass=dataclass),
+                        ),
+                    )
+                elif any([not is_dataclass(inner) for inner in curr]):
                     setattr(
                         self,
-                        f.name,
-                        self.to_dataclass_array(curr, dataclass=get_args(ftype)[0]),
+                        fname,
+                        self.to_dataclass_array(curr, dataclass=dataclass),
                     )
+                elif item_filter:
+                    setattr(self, fname, curr)
             elif case == 2:
                 if not is_dataclass(curr):
                     setattr(
                         self,
-                        f.name,
-                        self.to_dataclass(curr, dataclass=ftype),
+                        fname,
+                        self.to_dataclass(curr, dataclass=dataclass),
                     )
             else:
                 raise ValueError(f"Unexpected nested field case encoutnered: {case}")
@@ -1,45 +1,31 @@
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, fields
-from time import time
-from typing import Callable
-
-
-def execute_time(callable):
-    msg_template = (
-        "========== Time elapsed in {callable_name}: {time_elapsed} =========="
-    )
-
-    def time_checked(*args, **kwargs):
-        start = time()
-        result = callable(*args, **kwargs)
-        end = time()
-        time_elapsed = end - start
-        if time_elapsed >= 60:
-            msg = msg_template.format(
-                callable_name=f"{callable.__qualname__}()",
-                time_elapsed=f"{int(time_elapsed // 60)}m {round(time_elapsed % 60, 2):<00f}s",
-            )
-        else:
-            msg = msg_template.format(
-                callable_name=f"{callable.__qualname__}()",
-                time_elapsed=f"{round(time_elapsed, 2):<00f}s",
-            )
-        print(msg)
-        return result
-
-    return time_checked
-
-
-def flexible_dataclass(cls=None, /, **kwargs):
+from functools import wraps
+from sys import intern
+from typing import Callable, Iterable, Literal, Optional
+
+
+def flexible_dataclass(cls=None, /, *, interned: Iterable[str] = (), **kwargs):
+    """
+    Dataclass ignoring undefined keyword arguments on init
+      - interned: names of low cardinality string fields to `sys.intern()` on init
+      - other keyword arguments are passed to `dataclasses.dataclass()` (ex. slots=True)
+    """
+
     def decorator(cls):
         cls = dataclass(cls, **kwargs)
         cls.__init__.__qualname__ = f"{cls.__qualname__}.__default_init__"
         setattr(cls, "__default_init__", cls.__init__)
+        field_names = frozenset(f.name for f in fields(cls))
+        interned_names = tuple(interned)
 
         def __flexible_init__(self, *args, **kwargs):
-            filtered_kwargs = {
-                f.name: kwargs[f.name] for f in fields(cls) if f.name in kwargs.keys()
-            }
+            filtered_kwargs = {k: v for k, v in kwargs.items() if k in field_names}
             self.__default_init__(*args, **filtered_kwargs)
+            for fname in interned_names:
+                if type(value := getattr(self, fname)) is str:
+                    setattr(self, fname, intern(value))
 
         __flexible_init__.__qualname__ = f"{cls.__qualname__}.__init__"
         setattr(cls, "__init__", __flexible_init__)
@@ -52,31 +38,203 @@ def flexible_dataclass(cls=None, /, **kwargs):
     return decorator(cls)
 
 
+_MISSING = object()  # sentinel for values not cached yet (falsy values are cached too)
+
+
+class MemoStats:
+    """
+    Hit & miss counters of a memoized callable (registered in `memo_stats` by qualname)
+      - counted only while `MemoStats.counting` (ex. profiling runs), w/o any lock
+        (approximate under threads), not to slow down memo hits on hot paths
+    """
+
+    __slots__ = ("name", "hits", "misses")
+    counting = False
+
+    def __init__(self, name: str):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+
+    def reset(self):
+        self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / calls if (calls := self.hits + self.misses) else 0.0
+
+
+memo_stats: dict[str, MemoStats] = {}
+_memo_stats_lock = threading.Lock()
+
+
+def _register_memo_stats(method: Callable) -> MemoStats:
+    name = f"{method.__module__}.{method.__qualname__}"
+    with _memo_stats_lock:
+        return memo_stats.setdefault(name, MemoStats(name))
+
+
+def memo_report() -> list[str]:
+    """
+    Hit/miss counters of every memoized callable called so far (ex. for profiling runs)
+    """
+    called = [s for s in memo_stats.values() if s.hits or s.misses]
+    if not called:
+        return []
+    width = max(len(s.name) for s in called) + 2
+    lines = [f"{'memoized':<{width}}{'hits':>10}{'misses':>10}{'hit rate':>10}"]
+    for s in sorted(called, key=lambda s: s.hits + s.misses, reverse=True):
+        lines.append(f"{s.name:<{width}}{s.hits:>10}{s.misses:>10}{s.hit_rate:>10.1%}")
+    return lines
+
+
+def reset_memo_stats():
+    for s in memo_stats.values():
+        s.reset()
+
+
+def count_memo_stats(counting: bool = True):
+    MemoStats.counting = counting
+
+
 def lazy_load_property(method):
+    """
+    Compute once per instance on first access & cache as `_<name>` (falsy values too)
+      - `del instance.<name>` drops the cached value to recompute on next access
+      - first computations are guarded by a (reentrant) lock per property,
+        so that concurrent first accesses compute only once
+    """
     inst_var = f"_{method.__name__}"
+    stats = _register_memo_stats(method)
+    lock = threading.RLock()
+
+    def cached(instance):
+        if (val := getattr(instance, inst_var, _MISSING)) is _MISSING:
+            with lock:
+                if (val := getattr(instance, inst_var, _MISSING)) is _MISSING:
+                    if stats.counting:
+                        stats.misses += 1
+                    val = method(instance)
+                    setattr(instance, inst_var, val)
+                    return val
+        if stats.counting:
+            stats.hits += 1
+        return val
+
+    def uncache(instance):
+        if hasattr(instance, inst_var):
+            delattr(instance, inst_var)
+
+    cached.stats = stats
+    return property(cached, None, uncache, method.__doc__)
+
+
+def lazy_load_classmethod(method):
+    """
+    Compute once per class (not inherited by subclasses) & cache on the class itself
+    """
+    cls_var = f"_{method.__name__}"
+    stats = _register_memo_stats(method)
+    lock = threading.Lock()
+
+    def cached(cls):
+        if cls_var not in cls.__dict__:
+            with lock:
+                if cls_var not in cls.__dict__:
+                    if stats.counting:
+                        stats.misses += 1
+                    setattr(cls, cls_var, method(cls))
+                    return cls.__dict__[cls_var]
+        if stats.counting:
+            stats.hits += 1
+        return cls.__dict__[cls_var]
+
+    return classmethod(cached)
+
+
+def memoize(
+    method: Optional[Callable] = None,
+    /,
+    *,
+    scope: Literal["instance", "class"] = "instance",
+    maxsize: Optional[int] = None,
+):
+    """
+    Cache method results by arguments (falsy values too)
+      - scope: 'instance' to cache on each instance (as `_<name>_memo`),
+        'class' to share results among all instances of the same class
+      - maxsize: keep only N least recently used results per cache (unbounded if None)
+      - arguments should be hashable & caches are guarded by a lock per method
+        (results are computed outside of the lock)
+      - `<method>.cache_clear(instance_or_class)` drops a cache
+    """
+
+    def decorator(method):
+        inst_var = f"_{method.__name__}_memo"
+        stats = _register_memo_stats(method)
+        lock = threading.Lock()
+        class_caches: dict[type, dict] = {}
+
+        def get_cache(instance) -> dict:
+            if scope == "class":
+                owner = instance if isinstance(instance, type) else type(instance)
+                if (cache := class_caches.get(owner)) is None:
+                    cache = class_caches[owner] = OrderedDict() if maxsize else {}
+            elif (cache := getattr(instance, inst_var, None)) is None:
+                cache = OrderedDict() if maxsize else {}
+                setattr(instance, inst_var, cache)
+            return cache
+
+        @wraps(method)
+        def memoized(instance, *args, **kwargs):
+            key = (args, frozenset(kwargs.items())) if kwargs else args
+            with lock:
+                cache = get_cache(instance)
+                if (val := cache.get(key, _MISSING)) is not _MISSING:
+                    if stats.counting:
+                        stats.hits += 1
+                    if maxsize:
+                        cache.move_to_end(key)
+                    return val
+                if stats.counting:
+                    stats.misses += 1
 
-    def cached(instance, *args, **kwargs):
-        if not getattr(instance, inst_var, False):
             val = method(instance, *args, **kwargs)
-            setattr(instance, inst_var, val)
-        return getattr(instance, inst_var)
+            with lock:
+                cache[key] = val
+                if maxsize and len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return val
 
-    return property(cached)
+        def cache_clear(instance):
+            with lock:
+                get_cache(instance).clear()
+
+        memoized.cache_clear = cache_clear
+        memoized.stats = stats
+        return memoized
+
+    if method is None:
+        return decorator
+
+    return decorator(method)
 
 
 def validate_fields(fields: list[str], validator: Callable):
+    """
+    Run `validator` on field values before predefined `validate_<field>` methods (if any)
+      (predefined methods are resolved once on decoration, not on every validation)
+    """
+
+    def chained(predefined_method: Callable) -> Callable:
+        return lambda inst, v: predefined_method(inst, validator(v))
+
     def decorator(cls):
         for fname in fields:
             method_name = f"validate_{fname}"
             if predefined_method := getattr(cls, method_name, False):
-                setattr(
-                    cls, predefined_name := "__" + method_name + "__", predefined_method
-                )
-                setattr(
-                    cls,
-                    method_name,
-                    lambda inst, v: getattr(cls, predefined_name)(inst, validator(v)),
-                )
+                setattr(cls, "__" + method_name + "__", predefined_method)
+                setattr(cls, method_name, chained(predefined_method))
             else:
                 setattr(cls, method_name, lambda _, v: validator(v))
         return cls
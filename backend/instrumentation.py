@@ -0,0 +1,186 @@
+"""
+Lightweight timing spans aggregated into histograms (exported as JSON or Prometheus text)
+  - enable w/ `INSTRUMENTATION_ENABLED=1` env var or `registry.enable()`
+  - while disabled, `span()` & `@timed` cost a function call & a flag check only
+"""
+import os
+import threading
+from bisect import bisect_left
+from contextlib import nullcontext
+from functools import wraps
+from math import inf
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+Tags = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    inf,
+)
+
+
+class Histogram:
+    """
+    Durations (in seconds) of a span w/ the same name & tags
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)  # non-cumulative
+        self.count = 0
+        self.sum = 0.0
+        self.min = inf
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def cumulative_counts(self) -> list[int]:
+        cumulative, total = [], 0
+        for c in self.counts:
+            total += c
+            cumulative.append(total)
+        return cumulative
+
+
+class Registry:
+    metric_name = "watchb_span_seconds"
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple[str, Tags], Histogram] = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def observe(self, name: str, tags: Tags, seconds: float):
+        with self._lock:
+            if (histogram := self._histograms.get(key := (name, tags))) is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """
+        JSON serializable copy of every histogram recorded so far
+        """
+        with self._lock:
+            return [
+                {
+                    "name": name,
+                    "tags": dict(tags),
+                    "count": h.count,
+                    "sum": h.sum,
+                    "min": h.min,
+                    "max": h.max,
+                    "buckets": [
+                        ["+Inf" if le == inf else le, c]
+                        for le, c in zip(h.buckets, h.cumulative_counts())
+                    ],
+                }
+                for (name, tags), h in sorted(self._histograms.items())
+            ]
+
+    @classmethod
+    def to_prometheus(cls, snapshot: list[dict[str, Any]]) -> str:
+        """
+        Prometheus text exposition of a snapshot (a histogram labeled by span name & tags)
+        """
+
+        def labels(**kwargs) -> str:
+            escaped = (
+                str(v).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+                for v in kwargs.values()
+            )
+            return ",".join(f'{k}="{v}"' for k, v in zip(kwargs, escaped))
+
+        lines = [
+            f"# HELP {cls.metric_name} Duration of instrumented spans.",
+            f"# TYPE {cls.metric_name} histogram",
+        ]
+        for s in snapshot:
+            base = {"span": s["name"], **s["tags"]}
+            for le, c in s["buckets"]:
+                lines.append(f"{cls.metric_name}_bucket{{{labels(**base, le=le)}}} {c}")
+            lines.append(f"{cls.metric_name}_sum{{{labels(**base)}}} {s['sum']}")
+            lines.append(f"{cls.metric_name}_count{{{labels(**base)}}} {s['count']}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry(
+    enabled=os.getenv("INSTRUMENTATION_ENABLED", "").lower() in ("1", "true")
+)
+
+_disabled_span = nullcontext()
+
+
+class Span:
+    __slots__ = ("name", "tags", "start")
+
+    def __init__(self, name: str, tags: Tags):
+        self.name = name
+        self.tags = tags
+
+    def __enter__(self) -> "Span":
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        registry.observe(self.name, self.tags, perf_counter() - self.start)
+
+
+def span(name: str, **tags: Any):
+    """
+    Context to time a named span w/ tags (keep tag values low cardinality)
+    """
+    if not registry.enabled:
+        return _disabled_span
+    return Span(name, tuple(sorted((k, str(v)) for k, v in tags.items())))
+
+
+def timed(name: Optional[str] = None, **tags: Any):
+    """
+    Decorator timing each call as a span (named after the callable's qualname by default)
+    """
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+        span_tags = tuple(sorted((k, str(v)) for k, v in tags.items()))
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            with Span(span_name, span_tags):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
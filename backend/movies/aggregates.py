@@ -0,0 +1,87 @@
+"""
+Rating aggregates denormalized on movies (count, sum & histogram of scores)
+  - updated relatively in the transaction writing a rating (see `RatingViewSet`)
+  - reconciled w/ rating table in bulk, as deletes cascading from users or movies
+    & writes out of the rating API (ex. admin) bypass relative updates
+"""
+from typing import Any, Iterator, Optional
+
+from django.db.models import Count, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .caches import movie_detail_cache
+from .models import SCORE_CHOICES, Movie, Rating, histogram_field
+
+
+def update_rating_aggregates(
+    movie_id: Any, added: Optional[float] = None, removed: Optional[float] = None
+):
+    """
+    Apply a rating's score added and/or removed to its movie's aggregates
+      (call in the transaction writing the rating)
+    """
+    if changes := Movie.rating_changes(added=added, removed=removed):
+        Movie.objects.filter(pk=movie_id).update(**changes)
+        movie_detail_cache.invalidate(movie_id)
+
+
+def rating_aggregates() -> dict[str, Any]:
+    """
+    Aggregate expressions over ratings of each movie, keyed by movie field name
+    """
+    return {
+        "rating_count": Count("id"),
+        "rating_sum": Sum("score"),
+        **{
+            histogram_field(score): Count("id", filter=Q(score=score))
+            for score, _ in SCORE_CHOICES
+        },
+    }
+
+
+def aggregate_subqueries() -> dict[str, Any]:
+    """
+    Update expressions recomputing aggregates of each movie from its ratings
+    """
+    ratings = Rating.objects.filter(movie=OuterRef("pk")).order_by().values("movie")
+    return {
+        field: Coalesce(
+            Subquery(ratings.annotate(value=aggregate).values("value")),
+            Value(0, output_field=Movie._meta.get_field(field)),
+        )
+        for field, aggregate in rating_aggregates().items()
+    }
+
+
+def drifted_movies(chunk_size: int = 2000) -> Iterator[int]:
+    """
+    Pks of movies whose stored aggregates differ from ratings'
+      (ratings aggregated by movie in one pass, compared chunk by chunk of movies)
+    """
+    fields = Movie.rating_aggregate_fields
+    zero = dict.fromkeys(fields, 0)
+    expected = {
+        row.pop("movie"): row
+        for row in Rating.objects.order_by()
+        .values("movie")
+        .annotate(**rating_aggregates())
+    }
+    for row in Movie.objects.values("pk", *fields).iterator(chunk_size=chunk_size):
+        pk = row.pop("pk")
+        if row != expected.get(pk, zero):
+            yield pk
+
+
+def reconcile_rating_aggregates(fix: bool = True, batch_size: int = 500) -> list[int]:
+    """
+    Pks of movies w/ drifted aggregates, rebuilt from ratings in batches if `fix`
+      (each batch recomputed by one UPDATE, so that ratings written meanwhile count)
+    """
+    drifted = list(drifted_movies())
+    if fix:
+        subqueries = aggregate_subqueries()
+        for start in range(0, len(drifted), batch_size):
+            batch = drifted[start : start + batch_size]
+            Movie.objects.filter(pk__in=batch).update(**subqueries)
+            movie_detail_cache.invalidate(*batch)
+    return drifted
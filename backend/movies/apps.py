@@ -2,5 +2,8 @@ from django.apps import AppConfig
 
 
 class MoviesConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'movies'
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "movies"
+
+    def ready(self):
+        from . import signals  # noqa: F401
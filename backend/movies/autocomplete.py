@@ -0,0 +1,488 @@
+import heapq
+import json
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from time import monotonic, time
+from typing import Any, Iterable, Optional, Type
+
+from django.conf import settings
+from django.db import connection, models
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .models import AutocompleteChange, Movie, Person
+
+# Hangul syllable = (initial * 21 + medial) * 28 + final + 0xAC00
+INITIALS = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+MEDIALS = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+FINALS = ("", *"ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ")
+# compound jamo typed w/ 2 keystrokes (ex. 고 -> 과, 갈 -> 갉)
+COMPOUNDS = {
+    "ㅘ": "ㅗㅏ",
+    "ㅙ": "ㅗㅐ",
+    "ㅚ": "ㅗㅣ",
+    "ㅝ": "ㅜㅓ",
+    "ㅞ": "ㅜㅔ",
+    "ㅟ": "ㅜㅣ",
+    "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ",
+    "ㄵ": "ㄴㅈ",
+    "ㄶ": "ㄴㅎ",
+    "ㄺ": "ㄹㄱ",
+    "ㄻ": "ㄹㅁ",
+    "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ",
+    "ㄿ": "ㄹㅍ",
+    "ㅀ": "ㄹㅎ",
+    "ㅄ": "ㅂㅅ",
+}
+
+
+def _jamo_table() -> dict[int, str]:
+    table = {ord(c): d for c, d in COMPOUNDS.items()}
+    for i, initial in enumerate(INITIALS):
+        for m, medial in enumerate(MEDIALS):
+            for f, final in enumerate(FINALS):
+                syllable = chr(0xAC00 + (i * len(MEDIALS) + m) * len(FINALS) + f)
+                table[ord(syllable)] = "".join(
+                    COMPOUNDS.get(j, j) for j in (initial, medial, final)
+                )
+    return table
+
+
+JAMO_TABLE = _jamo_table()
+
+
+def decompose(text: str) -> str:
+    """
+    Lowercased text w/ Hangul syllables & compound jamo decomposed into keystroke jamo
+      (so that any text typed in progress is a prefix: 기생ㅊ -> ㄱㅣㅅㅐㅇㅊ < ㄱㅣㅅㅐㅇㅊㅜㅇ)
+    """
+    return " ".join(unicodedata.normalize("NFC", text).lower().split()).translate(
+        JAMO_TABLE
+    )
+
+
+@dataclass(frozen=True)
+class PrefixIndexState:
+    keys: list[str] = field(default_factory=list)  # sorted
+    pks: list[int] = field(default_factory=list)  # of doc each key belongs to
+    docs: dict[int, dict[str, Any]] = field(default_factory=dict)
+    tops: dict[str, list[int]] = field(default_factory=dict)  # of heavy prefixes
+
+
+class PrefixIndex:
+    """
+    In-memory prefix index of jamo decomposed word starts of model texts
+      - each doc is a dict of `display_fields` & popularity
+      - top docs of heavy prefixes (w/ more than `heavy_range` keys) are precomputed,
+        so that no lookup ranks more than `heavy_range` docs
+      - immutable state swapped on refresh, so that lookups need no lock
+      - refreshed from rows logged as changed by triggers on model's table
+        (inserts, deletes & updates of display fields) & on the related table
+        counted as popularity (inserts & deletes), see `ddl()`
+    """
+
+    heavy_range = 256
+    max_key_length = 32
+    max_k = 20
+
+    def __init__(
+        self,
+        model: Type[models.Model],
+        text_fields: tuple[str, ...],
+        display_fields: tuple[str, ...],
+        popularity_relation: str,
+    ):
+        self.model = model
+        self.text_fields = text_fields
+        self.display_fields = display_fields
+        self.popularity_relation = popularity_relation  # reverse FK counted
+        self.state = PrefixIndexState()
+
+    @property
+    def table(self) -> str:
+        return self.model._meta.db_table
+
+    def ddl(self) -> list[str]:
+        """
+        Statements creating triggers logging changed rows into `AutocompleteChange`
+          (SQLite drops triggers when it remakes a table, so `install()` after
+          a migration altering model's or related table)
+        """
+        t, log = self.table, AutocompleteChange._meta.db_table
+        related = self.model._meta.get_field(self.popularity_relation)
+        r, fk = related.related_model._meta.db_table, related.field.column
+        columns = ", ".join(self.display_fields)
+
+        def insert(pk: str) -> str:
+            return (
+                f"INSERT INTO {log}(table_name, object_id, changed_at) "
+                f"VALUES ('{t}', {pk}, strftime('%Y-%m-%d %H:%M:%f', 'now'));"
+            )
+
+        return [
+            f"CREATE TRIGGER IF NOT EXISTS {t}_autocomplete_ai AFTER INSERT ON {t} "
+            f"BEGIN {insert('new.id')} END",
+            f"CREATE TRIGGER IF NOT EXISTS {t}_autocomplete_ad AFTER DELETE ON {t} "
+            f"BEGIN {insert('old.id')} END",
+            f"CREATE TRIGGER IF NOT EXISTS {t}_autocomplete_au "
+            f"AFTER UPDATE OF {columns} ON {t} BEGIN {insert('new.id')} END",
+            f"CREATE TRIGGER IF NOT EXISTS {r}_autocomplete_ai AFTER INSERT ON {r} "
+            f"BEGIN {insert(f'new.{fk}')} END",
+            f"CREATE TRIGGER IF NOT EXISTS {r}_autocomplete_ad AFTER DELETE ON {r} "
+            f"BEGIN {insert(f'old.{fk}')} END",
+        ]
+
+    def install(self):
+        with connection.cursor() as cursor:
+            for statement in self.ddl():
+                cursor.execute(statement)
+
+    def fetch_docs(
+        self, pks: Optional[Iterable[int]] = None, batch_size: int = 500
+    ) -> dict[int, dict[str, Any]]:
+        """
+        Docs of all rows, or of existing ones among `pks` (fetched in batches)
+        """
+        queryset = self.model._default_manager.annotate(
+            popularity=Count(self.popularity_relation)
+        ).values("pk", "popularity", *self.display_fields)
+        if pks is None:
+            return {row.pop("pk"): row for row in queryset}
+        pks, docs = list(pks), {}
+        for start in range(0, len(pks), batch_size):
+            for row in queryset.filter(pk__in=pks[start : start + batch_size]):
+                docs[row.pop("pk")] = row
+        return docs
+
+    def keys_of(self, doc: dict[str, Any]) -> set[str]:
+        keys = set()
+        for text in filter(None, (doc[f] for f in self.text_fields)):
+            words = decompose(text).split(" ")
+            for i in range(len(words)):
+                keys.add(" ".join(words[i:])[: self.max_key_length])
+        return keys
+
+    def entries_of(self, docs: dict[int, dict[str, Any]]) -> list[tuple[str, int]]:
+        return sorted(
+            (key, pk) for pk, doc in docs.items() for key in self.keys_of(doc)
+        )
+
+    @staticmethod
+    def prefixes_of(keys: Iterable[str]) -> set[str]:
+        return {key[:length] for key in keys for length in range(1, len(key) + 1)}
+
+    def rank(self, pks: Iterable[int], k: int, docs: dict[int, dict]) -> list[int]:
+        return heapq.nsmallest(
+            k, set(pks), key=lambda pk: (-docs[pk]["popularity"], pk)
+        )
+
+    @staticmethod
+    def key_range(
+        keys: list[str], prefix: str, lo: int = 0, hi: Optional[int] = None
+    ) -> tuple[int, int]:
+        """
+        keys[lo:hi] slice of keys starting w/ prefix
+        """
+        hi = len(keys) if hi is None else hi
+        lo = bisect_left(keys, prefix, lo, hi)
+        return lo, bisect_left(keys, prefix + "\U0010ffff", lo, hi)
+
+    def heavy_prefixes(self, keys: list[str], lo: int, hi: int, length: int = 1):
+        """
+        (prefix, lo, hi) of each prefix w/ more than `heavy_range` keys in keys[lo:hi]
+          (walking down only heavy prefixes, jumping over light ones)
+        """
+        while lo < hi:
+            if len(keys[lo]) < length:  # equals prefix of a heavy range
+                lo += 1
+                continue
+            prefix = keys[lo][:length]
+            _, end = self.key_range(keys, prefix, lo, hi)
+            if end - lo > self.heavy_range:
+                yield prefix, lo, end
+                yield from self.heavy_prefixes(keys, lo, end, length + 1)
+            lo = end
+
+    def build(self):
+        docs = self.fetch_docs()
+        entries = self.entries_of(docs)
+        keys, pks = [key for key, _ in entries], [pk for _, pk in entries]
+        self.state = PrefixIndexState(
+            keys=keys,
+            pks=pks,
+            docs=docs,
+            tops={
+                prefix: self.rank(pks[lo:hi], self.max_k, docs)
+                for prefix, lo, hi in self.heavy_prefixes(keys, 0, len(keys))
+            },
+        )
+
+    def refresh(self, changed: Iterable[int]) -> int:
+        """
+        Reindex docs of changed pks, dropping ones of deleted rows
+          - keys merged into (or filtered out of) sorted keys only if any changed
+          - tops of prefixes a doc left or lost popularity under are reranked,
+            others merged w/ docs added or gained popularity under them
+        """
+        state = self.state
+        if not (changed := set(changed)):
+            return 0
+        fetched = self.fetch_docs(changed)
+        docs = {pk: doc for pk, doc in state.docs.items() if pk not in changed}
+        docs.update(fetched)
+
+        old_entries = {
+            (key, pk)
+            for pk in changed & state.docs.keys()
+            for key in self.keys_of(state.docs[pk])
+        }
+        new_entries = set(self.entries_of(fetched))
+        if removed := old_entries - new_entries:
+            kept = (
+                entry for entry in zip(state.keys, state.pks) if entry not in removed
+            )
+        else:
+            kept = zip(state.keys, state.pks)
+        if (added := new_entries - old_entries) or removed:
+            entries = list(heapq.merge(kept, sorted(added)))
+            keys, pks = [key for key, _ in entries], [pk for _, pk in entries]
+        else:
+            keys, pks = state.keys, state.pks
+
+        shrunk = self.prefixes_of(key for key, _ in removed)
+        grown: dict[str, set[int]] = defaultdict(set)
+        for key, pk in new_entries:
+            old = state.docs.get(pk)
+            if old is not None and old["popularity"] > docs[pk]["popularity"]:
+                shrunk |= self.prefixes_of([key])
+            else:
+                for prefix in self.prefixes_of([key]):
+                    grown[prefix].add(pk)
+        tops = dict(state.tops)
+        for prefix in shrunk | grown.keys():
+            if prefix in tops and prefix not in shrunk:
+                tops[prefix] = self.rank(
+                    [*tops[prefix], *grown[prefix]], self.max_k, docs
+                )
+                continue
+            lo, hi = self.key_range(keys, prefix)
+            if hi - lo > self.heavy_range:
+                tops[prefix] = self.rank(pks[lo:hi], self.max_k, docs)
+            else:
+                tops.pop(prefix, None)
+
+        self.state = PrefixIndexState(keys=keys, pks=pks, docs=docs, tops=tops)
+        return len(changed)
+
+    def complete(self, query: str, k: int = 10) -> list[dict[str, Any]]:
+        """
+        Top k popular docs w/ any word starting w/ `query` (typed in progress)
+        """
+        state = self.state
+        if not (prefix := decompose(query)[: self.max_key_length]):
+            return []
+        if (pks := state.tops.get(prefix)) is not None:
+            pks = pks[:k]
+        else:
+            lo, hi = self.key_range(state.keys, prefix)
+            pks = self.rank(state.pks[lo:hi], k, state.docs)
+        return [{"id": pk, **state.docs[pk]} for pk in pks]
+
+    def lookup(self, terms: Iterable[str]) -> set[int]:
+        """
+        pks of docs w/ a word starting w/ each of terms
+          (whole terms, unlike `complete()` matching text typed in progress:
+          가 matches 가족 but not 각본)
+        """
+        state = self.state
+        terms = [unicodedata.normalize("NFC", term).lower() for term in terms]
+        pks: Optional[set[int]] = None
+        for term in terms:
+            lo, hi = self.key_range(state.keys, decompose(term)[: self.max_key_length])
+            pks = set(state.pks[lo:hi]) if pks is None else pks & set(state.pks[lo:hi])
+            if not pks:
+                return set()
+
+        def words_of(doc: dict[str, Any]) -> list[str]:
+            texts = filter(None, (doc[f] for f in self.text_fields))
+            return unicodedata.normalize("NFC", " ".join(texts)).lower().split()
+
+        return {
+            pk
+            for pk in pks or ()
+            if all(
+                any(word.startswith(term) for word in words_of(state.docs[pk]))
+                for term in terms
+            )
+        }
+
+    def to_snapshot(self) -> dict[str, Any]:
+        state = self.state
+        return {
+            "keys": state.keys,
+            "pks": state.pks,
+            "docs": [[pk, doc] for pk, doc in state.docs.items()],
+            "tops": state.tops,
+        }
+
+    def load_snapshot(self, snapshot: dict[str, Any]):
+        self.state = PrefixIndexState(
+            keys=snapshot["keys"],
+            pks=snapshot["pks"],
+            docs={pk: doc for pk, doc in snapshot["docs"]},
+            tops=snapshot["tops"],
+        )
+
+
+class Autocompleter:
+    """
+    Movie & person prefix indexes, built (or loaded from snapshot) on first use
+      & refreshed w/ rows changed since at most every `refresh_interval` seconds
+      - changes logged by triggers are read after `watermark` (last change id read),
+        so that rows written by any process (ex. crawls) are refreshed
+      - changes older than `change_retention` seconds are pruned on build, refresh
+        & save, so that indexes (or snapshots) not synced since are rebuilt instead
+    """
+
+    snapshot_version = 2
+    change_retention = 60 * 60 * 24
+
+    def __init__(self, indexes: dict[str, PrefixIndex]):
+        self.indexes = indexes
+        self.loaded_at: Optional[float] = None
+        self.watermark = 0
+        self.synced_at = 0.0  # wall clock, as compared w/ snapshot's
+        self._lock = threading.Lock()
+
+    @property
+    def snapshot_path(self) -> Optional[str]:
+        return getattr(settings, "AUTOCOMPLETE_SNAPSHOT", None)
+
+    @property
+    def refresh_interval(self) -> float:
+        return getattr(settings, "AUTOCOMPLETE_REFRESH_INTERVAL", 60)
+
+    def install(self):
+        for index in self.indexes.values():
+            index.install()
+
+    def prune(self, watermark: Optional[int] = None) -> int:
+        """
+        Delete changes older than retention (& read already, up to `watermark`)
+        """
+        cutoff = timezone.now() - timedelta(seconds=self.change_retention)
+        changes = AutocompleteChange.objects.filter(changed_at__lt=cutoff)
+        if watermark is not None:
+            changes = changes.filter(pk__lte=watermark)
+        deleted, _ = changes.delete()
+        return deleted
+
+    def build(self):
+        # read before fetching docs, so that changes meanwhile are reapplied
+        self.watermark = (
+            AutocompleteChange.objects.aggregate(last=Max("pk"))["last"] or 0
+        )
+        self.synced_at = time()
+        for index in self.indexes.values():
+            index.build()
+        self.loaded_at = monotonic()
+        self.prune()
+
+    def refresh(self) -> dict[str, int]:
+        """
+        Reindex rows changed since last build or refresh (number of each index's)
+        """
+        if time() - self.synced_at >= self.change_retention:
+            self.build()  # changes since may have been pruned
+            return {name: len(index.state.docs) for name, index in self.indexes.items()}
+        changed: dict[str, set[int]] = defaultdict(set)
+        watermark, synced_at = self.watermark, time()
+        for pk, table_name, object_id in AutocompleteChange.objects.filter(
+            pk__gt=self.watermark
+        ).values_list("pk", "table_name", "object_id"):
+            changed[table_name].add(object_id)
+            watermark = max(watermark, pk)
+        refreshed = {
+            name: index.refresh(changed[index.table])
+            for name, index in self.indexes.items()
+        }
+        self.watermark, self.synced_at = watermark, synced_at
+        self.loaded_at = monotonic()
+        self.prune(watermark)
+        return refreshed
+
+    def save(self, path: Optional[str] = None):
+        snapshot = {
+            "version": self.snapshot_version,
+            "watermark": self.watermark,
+            "synced_at": self.synced_at,
+            **{name: index.to_snapshot() for name, index in self.indexes.items()},
+        }
+        with open(path or self.snapshot_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+        self.prune()
+
+    def load(self, path: Optional[str] = None) -> bool:
+        """
+        Load indexes from snapshot
+          (False if missing, of other version or synced before changes retained)
+        """
+        try:
+            with open(path or self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (FileNotFoundError, TypeError, ValueError):
+            return False
+        if (
+            snapshot.get("version") != self.snapshot_version
+            or time() - snapshot["synced_at"] >= self.change_retention
+        ):
+            return False
+        for name, index in self.indexes.items():
+            index.load_snapshot(snapshot[name])
+        self.watermark, self.synced_at = snapshot["watermark"], snapshot["synced_at"]
+        self.loaded_at = monotonic()
+        return True
+
+    def ensure_fresh(self):
+        if (
+            self.loaded_at is not None
+            and monotonic() - self.loaded_at < self.refresh_interval
+        ):
+            return
+        with self._lock:
+            if self.loaded_at is None:
+                if self.load():
+                    self.refresh()  # rows changed after snapshot was saved
+                else:
+                    self.build()
+            elif monotonic() - self.loaded_at >= self.refresh_interval:
+                self.refresh()
+
+    def complete(self, query: str, k: int = 10) -> dict[str, list[dict[str, Any]]]:
+        self.ensure_fresh()
+        return {name: index.complete(query, k) for name, index in self.indexes.items()}
+
+
+autocompleter = Autocompleter(
+    {
+        "movies": PrefixIndex(
+            Movie,
+            text_fields=("title",),
+            display_fields=("title", "production_year"),
+            popularity_relation="ratings",
+        ),
+        "persons": PrefixIndex(
+            Person,
+            text_fields=("name", "en_name"),
+            display_fields=("name", "en_name"),
+            popularity_relation="credits_history",
+        ),
+    }
+)
@@ -0,0 +1,106 @@
+import json
+from functools import partial
+from hashlib import sha256
+from typing import Any, Iterable, Optional
+from uuid import uuid4
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+CachedResponse = tuple[str, dict[str, Any]]  # (ETag, data)
+
+
+class MovieDetailCache:
+    """
+    Versioned cache of movie detail response data w/ its strong ETag
+      - each movie has a random version token, replaced on invalidation
+        (so responses cached under former versions are never served again)
+      - invalidation is deferred until the writing transaction commits,
+        not to cache data of uncommitted writes under the new version
+      - disabled w/ a process-local backend, which invalidation by other processes
+        (crawler, admin or other server workers) would never reach
+    """
+
+    key_prefix = "movie-detail"
+    timeout: Optional[int] = 60 * 60 * 24
+    process_local_backends: tuple[type[BaseCache], ...] = (LocMemCache,)
+
+    def __init__(self, alias: str = DEFAULT_CACHE_ALIAS):
+        self.alias = alias
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[self.alias]
+
+    @property
+    def enabled(self) -> bool:
+        return not isinstance(self.cache, self.process_local_backends)
+
+    def version_key(self, pk: Any) -> str:
+        return f"{self.key_prefix}:version:{pk}"
+
+    def data_key(self, pk: Any, version: str) -> str:
+        return f"{self.key_prefix}:{pk}:{version}"
+
+    def version(self, pk: Any) -> str:
+        if not self.enabled:
+            return ""
+        if (version := self.cache.get(self.version_key(pk))) is None:
+            self.cache.add(self.version_key(pk), uuid4().hex, timeout=None)
+            version = self.cache.get(self.version_key(pk))
+        return version
+
+    def get(self, pk: Any) -> Optional[CachedResponse]:
+        if not self.enabled:
+            return None
+        return self.cache.get(self.data_key(pk, self.version(pk)))
+
+    def set(
+        self, pk: Any, data: dict[str, Any], version: Optional[str] = None
+    ) -> CachedResponse:
+        """
+        Cache response data under `version` (read before rendering data, current if None)
+          - only w/ ETag computed if disabled
+        """
+        cached = (self.etag(data), dict(data))
+        if self.enabled:
+            self.cache.set(
+                self.data_key(pk, version or self.version(pk)), cached, self.timeout
+            )
+        return cached
+
+    @staticmethod
+    def etag(data: dict[str, Any]) -> str:
+        rendered = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+        return f'"{sha256(rendered.encode()).hexdigest()[:32]}"'
+
+    def invalidate(self, *pks: Any):
+        if pks and self.enabled:
+            transaction.on_commit(partial(self._invalidate, pks))
+
+    def _invalidate(self, pks: Iterable[Any]):
+        self.cache.set_many(
+            {self.version_key(pk): uuid4().hex for pk in pks}, timeout=None
+        )
+
+    def warm(self, pks: Iterable[Any]) -> int:
+        """
+        Render & cache detail responses of movies (ex. newly registered ones)
+        """
+        if not self.enabled:
+            return 0
+
+        from .views import MovieRetrieveView
+
+        view = MovieRetrieveView()
+        movies = view.get_queryset().filter(pk__in=list(pks))
+        for movie in movies:
+            version = self.version(movie.pk)
+            self.set(movie.pk, view.get_serializer_class()(movie).data, version)
+        return len(movies)
+
+
+movie_detail_cache = MovieDetailCache()
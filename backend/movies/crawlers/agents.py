@@ -6,6 +6,7 @@ from urllib.parse import parse_qs, urlparse
 
 import requests
 from decorators import lazy_load_property
+from instrumentation import timed
 from retrying import Retrying
 
 from ..crawlers import custom_types as T
@@ -67,6 +68,7 @@ class TMDBAPIAgent(RequestPaginateMixin, SingletonRequestSessionMixin):
 
         return wait_func
 
+    @timed("agent.request", agent="tmdb")
     def request(self, *args, **kwargs) -> requests.Response:
         return self.retry.call(super().request, *args, **kwargs)
 
@@ -278,6 +280,7 @@ class KMDbAPIAgent(RequestPaginateMixin, SingletonRequestSessionMixin):
 
         return wait_func
 
+    @timed("agent.request", agent="kmdb")
     def request(self, *args, **kwargs) -> requests.Response:
         return self.retry.call(super().request, *args, **kwargs)
 
@@ -0,0 +1,388 @@
+from __future__ import annotations
+
+import gc
+import json
+import random
+import tracemalloc
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Any, Callable, Optional
+from unittest.mock import patch
+
+from .custom_types import MovieFromKMDb, MovieFromTMDB, SerializedPersonFromAPI
+from .mixins.crawler import (
+    ComplementaryDetailMixin,
+    KMDbSerializeMixin,
+    TMDBSerializeMixin,
+)
+
+TMDB_JOBS = ["Director", "Screenplay", "Story", "Writer", "Producer", "Editor"]
+KMDB_ROLE_GROUPS = ["감독", "각본", "출연", "제작", "촬영", "음악"]
+LANGUAGES = ["ko", "en", "ja", None]
+VIDEO_SITES = ["YouTube", "Vimeo"]
+
+
+def fake_tmdb_movie_payload(
+    movie_id: int, n_cast: int = 30, n_crew: int = 60, n_images: int = 20
+) -> dict[str, Any]:
+    """
+    TMDB movie detail API response shaped dict (w/ credits & kr_release_dates appended)
+    """
+    rand = random.Random(movie_id)
+    return {
+        "id": movie_id,
+        "title": f"영화 {movie_id}",
+        "original_title": f"Movie {movie_id}",
+        "genres": [
+            {"id": g, "name": name}
+            for g, name in rand.sample(
+                list(enumerate(["드라마", "모험", "코미디", "스릴러", "애니메이션"])), 2
+            )
+        ],
+        "production_countries": [{"iso_3166_1": "KR", "name": "South Korea"}],
+        "images": {
+            "posters": [
+                {
+                    "file_path": f"/poster/{movie_id}/{i}.jpg",
+                    "vote_count": rand.randint(0, 10),
+                    "vote_average": rand.random() * 10,
+                    "iso_639_1": rand.choice(LANGUAGES),
+                }
+                for i in range(n_images)
+            ],
+            "backdrops": [
+                {
+                    "file_path": f"/backdrop/{movie_id}/{i}.jpg",
+                    "vote_count": rand.randint(0, 10),
+                    "vote_average": rand.random() * 10,
+                    "iso_639_1": rand.choice(LANGUAGES),
+                }
+                for i in range(n_images)
+            ],
+        },
+        "videos": {
+            "results": [
+                {
+                    "site": rand.choice(VIDEO_SITES),
+                    "key": f"{movie_id:06d}{i:05d}",
+                    "name": f"예고편 {i}",
+                    "published_at": "2022-01-01T00:00:00.000Z",
+                    "iso_639_1": rand.choice(LANGUAGES),
+                }
+                for i in range(n_images // 4)
+            ]
+        },
+        "credits": {
+            "cast": [
+                {"id": movie_id * 1000 + i, "name": f"Actor {i}", "character": f"역 {i}"}
+                for i in range(n_cast)
+            ],
+            "crew": [
+                {
+                    "id": movie_id * 1000 + n_cast + i,
+                    "name": f"Staff {i}",
+                    "job": "Director" if i == 0 else rand.choice(TMDB_JOBS),
+                }
+                for i in range(n_crew)
+            ],
+        },
+        "kr_release_dates": [
+            {"type": 3, "release_date": "2022-05-01T00:00:00.000Z"},
+            {"type": 4, "release_date": "2022-08-01T00:00:00.000Z"},
+        ],
+        "runtime": rand.randint(80, 180),
+        "overview": "줄거리 " * 50,
+    }
+
+
+def fake_kmdb_movie_payload(movie_id: int, n_staff: int = 60) -> dict[str, Any]:
+    """
+    KMDb search API result shaped dict
+    """
+    rand = random.Random(movie_id)
+    return {
+        "movieId": "F",
+        "movieSeq": f"{movie_id % 100000:05d}",
+        "title": f"영화 {movie_id}",
+        "titleEng": f"Movie {movie_id}",
+        "titleOrg": "",
+        "staffs": {
+            "staff": [
+                {
+                    "staffRoleGroup": "감독" if i == 0 else rand.choice(KMDB_ROLE_GROUPS),
+                    "staffNm": f"사람{i}",
+                    "staffEnNm": f"Person {i}",
+                    "staffRole": "",
+                    "staffEtc": "",
+                    "staffId": f"{movie_id * 1000 + i:08d}"[-8:],
+                }
+                for i in range(n_staff)
+            ]
+        },
+        "plots": {
+            "plot": [
+                {"plotLang": "한국어", "plotText": "줄거리 " * 50},
+                {"plotLang": "영어", "plotText": "plot " * 50},
+            ]
+        },
+        "nation": "대한민국",
+        "prodYear": "2022",
+        "repRlsDate": "20220501",
+        "runtime": str(rand.randint(80, 180)),
+        "genre": "드라마,코메디",
+        "rating": "15세관람가",
+        "posters": "|".join(
+            f"http://file.koreafilm.or.kr/{movie_id}/{i}.jpg" for i in range(5)
+        ),
+        "stills": "|".join(
+            f"http://file.koreafilm.or.kr/{movie_id}/s{i}.jpg" for i in range(10)
+        ),
+    }
+
+
+class BenchmarkCrawler(ComplementaryDetailMixin):
+    """
+    Crawler w/o any network access for benchmarking serialize step only
+      (use w/ `no_person_lookup()` to skip DB & API person lookups as well)
+    """
+
+    def __init__(self):
+        self.tmdb_agent = SimpleNamespace(
+            image_base_url="https://image.tmdb.org/t/p/original"
+        )
+
+    def list(self, *args, **kwargs) -> list:
+        return []
+
+
+def fake_person(self, tmdb_id: int) -> SerializedPersonFromAPI:
+    return {"tmdb_id": tmdb_id, "en_name": f"Person {tmdb_id}"}
+
+
+def no_person_lookup():
+    return patch.object(TMDBSerializeMixin, "get_or_build_person", fake_person)
+
+
+def getattr_serialize_fields(
+    crawler: BenchmarkCrawler,
+    tmdb_movie: MovieFromTMDB,
+    kmdb_movie: MovieFromKMDb,
+    filtered: Optional[bool] = None,
+) -> dict[str, Any]:
+    """
+    Former `getattr` per field dispatching of non-credits fields (baseline to compare)
+    """
+    movie_json = {}
+    for fields, sources in (
+        (
+            crawler.from_tmdb_fields,
+            ((TMDBSerializeMixin, tmdb_movie), (KMDbSerializeMixin, kmdb_movie)),
+        ),
+        (
+            crawler.from_kmdb_fields,
+            ((KMDbSerializeMixin, kmdb_movie), (TMDBSerializeMixin, tmdb_movie)),
+        ),
+    ):
+        for fname in fields:
+            for mixin, movie in sources:
+                if (serializer := getattr(mixin, f"serialize_{fname}", False)) and (
+                    serialized := serializer(crawler, movie, filtered=filtered)
+                ):
+                    movie_json[fname] = serialized
+                    break
+    return movie_json
+
+
+def plan_serialize_fields(
+    crawler: BenchmarkCrawler,
+    tmdb_movie: MovieFromTMDB,
+    kmdb_movie: MovieFromKMDb,
+    filtered: Optional[bool] = None,
+) -> dict[str, Any]:
+    """
+    Non-credits fields part of `ComplementaryDetailMixin.serialize()`
+    """
+    movie_json = {}
+    movies_fetched = (tmdb_movie, kmdb_movie)
+    for fname, serializers in crawler.complementary_plan():
+        for serializer, source in serializers:
+            if serialized := serializer(
+                crawler, movies_fetched[source], filtered=filtered
+            ):
+                movie_json[fname] = serialized
+                break
+    return movie_json
+
+
+def time_per_call(func: Callable, args_list: list[tuple], repeat: int = 3) -> float:
+    """
+    Best of `repeat` rounds of average seconds per call
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        for args in args_list:
+            func(*args)
+        best = min(best, (perf_counter() - start) / len(args_list))
+    return best
+
+
+BenchmarkResult = dict[str, tuple[float, str]]
+
+
+def in_microseconds(seconds_by_label: dict[str, float]) -> BenchmarkResult:
+    return {label: (sec * 1e6, "µs / movie") for label, sec in seconds_by_label.items()}
+
+
+def benchmark_serialize(count: int = 100, repeat: int = 3) -> BenchmarkResult:
+    crawler = BenchmarkCrawler()
+    movies = [
+        (
+            MovieFromTMDB(**fake_tmdb_movie_payload(i)),
+            MovieFromKMDb(**fake_kmdb_movie_payload(i)),
+        )
+        for i in range(1, count + 1)
+    ]
+    with no_person_lookup():
+        return in_microseconds(
+            {
+                "fields (getattr)": time_per_call(
+                    lambda t, k: getattr_serialize_fields(crawler, t, k),
+                    movies,
+                    repeat=repeat,
+                ),
+                "fields (plan)": time_per_call(
+                    lambda t, k: plan_serialize_fields(crawler, t, k),
+                    movies,
+                    repeat=repeat,
+                ),
+                "TMDB only (getattr)": time_per_call(
+                    lambda t, _: {
+                        fname: serialized
+                        for fname in TMDBSerializeMixin.fields_to_serialize
+                        if (
+                            serializer := getattr(
+                                TMDBSerializeMixin, f"serialize_{fname}", False
+                            )
+                        )
+                        and (serialized := serializer(crawler, t))
+                    },
+                    movies,
+                    repeat=repeat,
+                ),
+                "TMDB only (plan)": time_per_call(
+                    lambda t, _: crawler.serialize(t, None), movies, repeat=repeat
+                ),
+                "total": time_per_call(crawler.serialize, movies, repeat=repeat),
+            }
+        )
+
+
+def parse(tmdb_json: str, kmdb_json: str) -> tuple[MovieFromTMDB, MovieFromKMDb]:
+    return MovieFromTMDB(**json.loads(tmdb_json)), MovieFromKMDb(
+        **json.loads(kmdb_json)
+    )
+
+
+def benchmark_parse(count: int = 1000, repeat: int = 3) -> BenchmarkResult:
+    """
+    Time & memory to decode raw API responses into custom_types dataclasses
+      - eager: default decoding / lazy: `lazy_decoding` w/ serialize mixins projection
+      - memory is traced w/ tracemalloc while parsing & serializing every movie,
+        so 'retained' is what parsed movies hold after raw responses are dropped
+    """
+    responses = [
+        (
+            json.dumps(fake_tmdb_movie_payload(i)),
+            json.dumps(fake_kmdb_movie_payload(i)),
+        )
+        for i in range(1, count + 1)
+    ]
+
+    result = {}
+    for mode, lazy_decoding in (("eager", False), ("lazy", True)):
+        crawler = BenchmarkCrawler()
+        crawler.lazy_decoding = lazy_decoding
+
+        def parse_in_context(tmdb_json: str, kmdb_json: str):
+            with crawler.decoding():
+                return parse(tmdb_json, kmdb_json)
+
+        result[f"{mode} parse"] = (
+            time_per_call(parse_in_context, responses, repeat=repeat) * 1e6,
+            "µs / movie",
+        )
+        with no_person_lookup():
+            result[f"{mode} parse+serialize"] = (
+                time_per_call(
+                    lambda t, k: crawler.serialize(*parse_in_context(t, k)),
+                    responses,
+                    repeat=repeat,
+                )
+                * 1e6,
+                "µs / movie",
+            )
+
+        gc.collect()
+        tracemalloc.start()
+        parsed = [parse_in_context(*r) for r in responses]
+        with no_person_lookup():
+            for movies in parsed:
+                crawler.serialize(*movies)
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del parsed
+
+        result[f"{mode} retained"] = (retained / 2**20, f"MiB / {count} movies")
+        result[f"{mode} peak"] = (peak / 2**20, f"MiB / {count} movies")
+
+    return result
+
+
+def benchmark_validate(count: int = 100, repeat: int = 3) -> BenchmarkResult:
+    """
+    Time to validate serialized movies w/ crawler serializer (reads migrated database)
+      - fresh: fields tree built per movie / reused: built once w/ `reuse_fields`
+      - mismatches: movies validated differently by the two modes (should be 0)
+    """
+    crawler = BenchmarkCrawler()
+    with no_person_lookup():
+        movies_data = [
+            crawler.serialize(
+                MovieFromTMDB(**fake_tmdb_movie_payload(i)),
+                MovieFromKMDb(**fake_kmdb_movie_payload(i)),
+            )
+            for i in range(1, count + 1)
+        ]
+
+    def validate(movie_data: dict[str, Any], reuse_fields: bool):
+        serializer = crawler.serializer_class(
+            data=movie_data, reuse_fields=reuse_fields
+        )
+        serializer.is_valid()
+        return serializer
+
+    result = in_microseconds(
+        {
+            "fresh tree": time_per_call(
+                lambda d: validate(d, False),
+                [(d,) for d in movies_data],
+                repeat=repeat,
+            ),
+            "reused tree": time_per_call(
+                lambda d: validate(d, True),
+                [(d,) for d in movies_data],
+                repeat=repeat,
+            ),
+        }
+    )
+    result["mismatches"] = (
+        sum(
+            (fresh := validate(d, False)).errors != (reused := validate(d, True)).errors
+            or fresh.validated_data != reused.validated_data
+            or fresh.skipped_errors != reused.skipped_errors
+            for d in movies_data
+        ),
+        f"/ {count} movies",
+    )
+    return result
@@ -7,12 +7,12 @@ from dataclasses import field
 from typing import Optional
 
 from dataclass_mixins import EmptyStringToNoneMixin, NestedInitMixin
-from decorators import flexible_dataclass, lazy_load_property
+from decorators import flexible_dataclass, lazy_load_property, memoize
 
 from .validators import validate_kmdb_text
 
 
-@flexible_dataclass
+@flexible_dataclass(slots=True, interned=["iso_639_1"])
 class ImageFromTMDB:
     file_path: str
     vote_count: int
@@ -24,7 +24,7 @@ class ImageFromTMDB:
             self.vote_average = None
 
 
-@flexible_dataclass
+@flexible_dataclass(slots=True, interned=["site", "iso_639_1"])
 class VideoFromTMDB(EmptyStringToNoneMixin):
     site: str
     key: str
@@ -33,12 +33,12 @@ class VideoFromTMDB(EmptyStringToNoneMixin):
     iso_639_1: Optional[str] = None
 
 
-@flexible_dataclass
+@flexible_dataclass(slots=True, interned=["iso_3166_1"])
 class CountryFromTMDB:
     iso_3166_1: str
 
 
-@flexible_dataclass
+@flexible_dataclass(slots=True)
 class PersonFromTMDB(EmptyStringToNoneMixin):
     id: int
     name: str
@@ -47,50 +47,50 @@ class PersonFromTMDB(EmptyStringToNoneMixin):
     profile_path: Optional[str] = None
 
 
-@flexible_dataclass
+@flexible_dataclass(slots=True)
 class CastFromTMDB(EmptyStringToNoneMixin):
     id: int  # person_id
     name: str
     character: str = ""
 
 
-@flexible_dataclass
+@flexible_dataclass(slots=True, interned=["job"])
 class CrewFromTMDB(EmptyStringToNoneMixin):
     id: int  # person_id
     name: str
     job: str
 
 
-@flexible_dataclass
+@flexible_dataclass(slots=True)
 class MovieCreditsFromTMDB(NestedInitMixin):
     cast: list[CastFromTMDB]
     crew: list[CrewFromTMDB]
 
 
-@flexible_dataclass
+@flexible_dataclass(slots=True)
 class MovieImagesFromTMDB(NestedInitMixin):
     posters: list[ImageFromTMDB]
     backdrops: list[ImageFromTMDB]
 
 
-@flexible_dataclass
+@flexible_dataclass(slots=True)
 class MovieVideosFromTMDB(NestedInitMixin):
     results: list[VideoFromTMDB]
 
 
-@flexible_dataclass
+@flexible_dataclass(slots=True)
 class ReleaseDateFromTMDB:
     type: int
     release_date: str
 
 
-@flexible_dataclass
+@flexible_dataclass(slots=True, interned=["name"])
 class GenreFromTMDB:
     id: int
     name: str
 
 
-@flexible_dataclass
+@flexible_dataclass(slots=True)
 class SimpleMovieFromTMDB:
     id: int
     title: str
@@ -137,7 +137,7 @@ class MovieFromTMDB(NestedInitMixin, EmptyStringToNoneMixin):
         return kmdb_movie.__eq__(self)
 
 
-@flexible_dataclass
+@flexible_dataclass(slots=True, interned=["staffRoleGroup", "staffEtc"])
 class StaffFromKMDb(EmptyStringToNoneMixin):
     staffRoleGroup: str
     staffNm: str = ""
@@ -147,18 +147,18 @@ class StaffFromKMDb(EmptyStringToNoneMixin):
     staffId: Optional[str] = None
 
 
-@flexible_dataclass
+@flexible_dataclass(slots=True)
 class MovieStaffsFromKMDb(NestedInitMixin):
     staff: list[StaffFromKMDb] = field(default_factory=list)
 
 
-@flexible_dataclass
+@flexible_dataclass(slots=True, interned=["plotLang"])
 class PlotFromKMDb(EmptyStringToNoneMixin):
     plotLang: str
     plotText: Optional[str] = None
 
 
-@flexible_dataclass
+@flexible_dataclass(slots=True)
 class MoviePlotsFromKMDb(NestedInitMixin):
     plot: list[PlotFromKMDb] = field(default_factory=list)
 
@@ -201,6 +201,7 @@ class MovieFromKMDb(NestedInitMixin, EmptyStringToNoneMixin):
                 ):
                     raise e
 
+    @memoize(scope="class", maxsize=4096)
     def normalize_title(self, title: str) -> str:
         return re.sub(r"[^\w]|[_]", "", validate_kmdb_text(title))
 
@@ -266,7 +267,7 @@ class EnglishName(str):
     def remove_hyphens(self, name: str) -> str:
         return name.replace("-", "")
 
-    @property
+    @lazy_load_property
     def normalized(self):
         return self.remove_accents(self.remove_hyphens(self.fullname)).lower()
 
@@ -1,19 +1,166 @@
 from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
-from typing import Any, Optional, Type
+from contextlib import AbstractContextManager, ExitStack, contextmanager, nullcontext
+from math import inf
+from time import perf_counter
+from typing import Any, Iterator, Optional, Type
 
+from dataclass_mixins import Projection, projected_decoding
+from django.db import OperationalError, connection, transaction
+from instrumentation import span
 from rest_framework.serializers import ModelSerializer
 from tqdm import tqdm
 
 from ..crawlers.custom_types import MovieFromAPI, SimpleMovieFromTMDB
 from ..crawlers.serializers import MovieFromAPISerializer
 from ..models import Movie
+from .profiling import StageProfiler
 
 
 class APICrawler(metaclass=ABCMeta):
     serializer_class: Type[ModelSerializer] = MovieFromAPISerializer
     debug: bool = False
+    lazy_decoding: bool = False
+    decode_projection: Projection = {}
+    profiler: Optional[StageProfiler] = None
+    reuse_serializer_fields: bool = False
+    commit_every: Optional[int] = None
+    commit_interval: Optional[float] = None
+    network_stages: frozenset[str] = frozenset(
+        {"fetch", "list", "detail", "kmdb_match"}
+    )
+
+    _batch: Optional[ExitStack] = None
+    _batch_count: int = 0
+    _batch_started: float = 0.0
+
+    def stage(self, name: str) -> AbstractContextManager:
+        """
+        Context to record a crawling stage w/ profiler (if any)
+          - commits the open batch first for network stages
+        """
+        if name in self.network_stages:
+            self.flush_batch()
+        if self.profiler is not None:
+            return self.profiler.stage(name)
+        else:
+            return nullcontext()
+
+    def decoding(self) -> AbstractContextManager:
+        """
+        Context to decode API responses in
+          - w/ `lazy_decoding`, nested arrays are converted to dataclasses on first access
+            & only array items read by (filtered) serialize methods are kept
+        """
+        if self.lazy_decoding:
+            return projected_decoding(
+                self.decode_projection if getattr(self, "filtered", False) else {},
+                lazy=True,
+            )
+        else:
+            return nullcontext()
+
+    @contextmanager
+    def batching(self) -> Iterator[None]:
+        """
+        Context to register movies in
+          - w/ `commit_every` or `commit_interval`, movies are committed together
+            every N movies or T seconds (each movie in its own savepoint)
+            & SQLite connection is tuned for bulk writes while crawling
+          - a movie failing to save rolls back its own savepoint only, & movies
+            saved before it in the batch are committed even if crawling stops on it
+          - batch is committed before any API request (`flush_batch()`), so SQLite
+            write lock is never held across network I/O & a batch only groups
+            movies saved between requests (ex. ones found already registered)
+          - batch is also committed after `max_batch_seconds`, so other connections'
+            writes (ex. server's) wait for it less than SQLite busy timeout
+        """
+        if not (self.commit_every or self.commit_interval):
+            yield
+            return
+
+        with self.tuned_connection():
+            self._batch = ExitStack()
+            try:
+                yield
+            finally:
+                with self.stage("commit"):
+                    self._batch.close()
+                self._batch, self._batch_count = None, 0
+
+    @contextmanager
+    def tuned_connection(self) -> Iterator[None]:
+        """
+        WAL journaling & synchronous=NORMAL (fsync on checkpoints only) for SQLite
+          - both restored after crawling (journal mode is left WAL if it can't be,
+            as leaving WAL needs other connections, ex. server's, to be closed)
+          - not applicable inside a transaction, so skipped there
+        """
+        if connection.vendor != "sqlite" or connection.in_atomic_block:
+            yield
+            return
+
+        with connection.cursor() as cursor:
+            journal_mode = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+            cursor.execute("PRAGMA journal_mode=WAL")
+            synchronous = cursor.execute("PRAGMA synchronous").fetchone()[0]
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f"PRAGMA synchronous={int(synchronous)}")
+                try:  # checkpoints WAL into database file
+                    cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+                except OperationalError:
+                    pass
+
+    @property
+    def max_batch_seconds(self) -> float:
+        """
+        Longest a batch may hold the write lock: `commit_interval`, bounded
+          for SQLite by half its busy timeout (how long writers wait for the lock)
+        """
+        seconds = self.commit_interval or inf
+        if connection.vendor == "sqlite":
+            timeout = connection.settings_dict.get("OPTIONS", {}).get("timeout", 5)
+            seconds = min(seconds, timeout / 2)
+        return seconds
+
+    def flush_batch(self) -> None:
+        """
+        Commit movies registered in the open batch (if any)
+          - next movie registered opens a new batch
+        """
+        if self._batch is None or not self._batch_count:
+            return
+
+        with self.stage("commit"):
+            self._batch.close()
+        self._batch_count = 0
+
+    def registering(self) -> AbstractContextManager:
+        """
+        Context to save a movie in
+          - in `batching()`, savepoint within the current batch transaction
+            (commits the batch first once it is full or expired)
+        """
+        if self._batch is None:
+            return nullcontext()
+
+        if (
+            not self._batch_count
+            or (self.commit_every and self._batch_count >= self.commit_every)
+            or perf_counter() - self._batch_started >= self.max_batch_seconds
+        ):
+            with self.stage("commit"):
+                self._batch.close()
+                self._batch.enter_context(transaction.atomic())
+            self._batch_count, self._batch_started = 0, perf_counter()
+
+        self._batch_count += 1
+        return transaction.atomic()
 
     @abstractmethod
     def fetch(self, *args, **kwargs) -> list[MovieFromAPI]:
@@ -44,9 +191,19 @@ class APICrawler(metaclass=ABCMeta):
         ):
             return movie_filtered.get(), None
         else:
-            serializer = self.serializer_class(data=movie_data)
-            if serializer.is_valid():
-                return serializer.save(), serializer
+            if self.reuse_serializer_fields:
+                serializer = self.serializer_class(data=movie_data, reuse_fields=True)
+            else:
+                serializer = self.serializer_class(data=movie_data)
+            with self.stage("validate"), span(
+                "serializer.validate", serializer=self.serializer_class.__name__
+            ):
+                is_valid = serializer.is_valid()
+            if is_valid:
+                with self.registering(), self.stage("save"), span(
+                    "db.save", serializer=self.serializer_class.__name__
+                ):
+                    return serializer.save(), serializer
             else:
                 return None, serializer
 
@@ -56,16 +213,21 @@ class APICrawler(metaclass=ABCMeta):
         """
         Total process of fetch -> serialize -> register steps of crawling movies from API
         """
+        with self.stage("fetch"):
+            movies_fetched = self.fetch(*args, **kwargs)
         if self.debug:
             movies_fetched = tqdm(
-                self.fetch(*args, **kwargs),
+                movies_fetched,
                 desc="serialize and registering for each movie fetched...",
             )
-        else:
-            movies_fetched = self.fetch(*args, **kwargs)
-        return [
-            self.get_or_register(self.serialize(fetched)) for fetched in movies_fetched
-        ]
+
+        results = []
+        with self.batching():
+            for fetched in movies_fetched:
+                with self.stage("serialize"):
+                    movie_data = self.serialize(fetched)
+                results.append(self.get_or_register(movie_data))
+        return results
 
 
 class ListAndDetailCrawler(APICrawler):
@@ -86,17 +248,21 @@ class ListAndDetailCrawler(APICrawler):
         """
         Total process of fetch -> serialize -> register steps of crawling movies from API
         """
+        with self.stage("list"):
+            listed = self.list(*args, **kwargs)
         if self.debug:
             listed = tqdm(
-                self.list(*args, **kwargs),
+                listed,
                 desc="detail -> serialize -> register for each movie listed...",
             )
-        else:
-            listed = self.list(*args, **kwargs)
 
-        return [
-            (movie_detailed, None)
-            if isinstance(movie_detailed := self.get_or_detail(m), Movie)
-            else self.get_or_register(self.serialize(movie_detailed))
-            for m in listed
-        ]
+        results = []
+        with self.batching():
+            for m in listed:
+                if isinstance(movie_detailed := self.get_or_detail(m), Movie):
+                    results.append((movie_detailed, None))
+                else:
+                    with self.stage("serialize"):
+                        movie_data = self.serialize(movie_detailed)
+                    results.append(self.get_or_register(movie_data))
+        return results
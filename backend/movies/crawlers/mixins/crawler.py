@@ -3,7 +3,7 @@ from __future__ import annotations
 import datetime
 import re
 from collections import defaultdict
-from typing import Any, DefaultDict, Iterable, Literal, Optional, Type
+from typing import Any, Callable, DefaultDict, Iterable, Literal, Optional, Type
 from zlib import error as zlib_error
 
 from tqdm import tqdm
@@ -15,9 +15,14 @@ from ...models import Credit, Movie, Person
 from ..agents import KMDbAPIAgent, TMDBAPIAgent
 from ..custom_types import (
     EnglishName,
+    MovieCreditsFromTMDB,
     MovieFromAPI,
     MovieFromKMDb,
     MovieFromTMDB,
+    MovieImagesFromTMDB,
+    MoviePlotsFromKMDb,
+    MovieStaffsFromKMDb,
+    MovieVideosFromTMDB,
     PersonFromTMDB,
     SerializedCreditFromAPI,
     SerializedPersonFromAPI,
@@ -73,9 +78,59 @@ class SearchListMixin(ListAndDetailCrawler):
         )
 
 
+class MultiListMixin(ListAndDetailCrawler):
+    """
+    Lists movies from several list sources & merges them in listed order
+      - movies listed from more than one source are deduplicated by TMDB id
+        before any detail request
+    """
+
+    list_mixins: dict[str, Type[ListAndDetailCrawler]] = {
+        "Popular": PopularListMixin,
+        "Trending": TrendingListMixin,
+        "TopRated": TopRatedListMixin,
+        "NowPlaying": NowPlayingListMixin,
+        "Search": SearchListMixin,
+    }
+
+    tmdb_agent: TMDBAPIAgent
+
+    def list(
+        self, sources: Iterable[tuple[str, dict[str, Any]]]
+    ) -> list[SimpleMovieFromTMDB]:
+        """
+        sources: (list method name, kwargs of the list method) pairs
+        """
+        listed: dict[int, SimpleMovieFromTMDB] = {}
+        for list_method, list_kwargs in sources:
+            for movie in self.list_mixins[list_method].list(self, **list_kwargs):
+                listed.setdefault(movie.id, movie)
+        return [*listed.values()]
+
+
+SerializePlan = tuple[tuple[str, Callable[..., Any]], ...]
+
+
 class FieldLevelSerializeMixin(APICrawler):
     fields_to_serialize: Iterable[str]
 
+    _serialize_plans: dict[tuple[type, tuple[str, ...]], SerializePlan] = {}
+
+    @classmethod
+    def serialize_plan(cls, fields: Iterable[str]) -> SerializePlan:
+        """
+        (field name, `serialize_<field name>` function) pairs resolved once per class & fields
+        """
+        key = (cls, tuple(fields))
+        if (plan := FieldLevelSerializeMixin._serialize_plans.get(key)) is None:
+            plan = tuple(
+                (fname, serializer)
+                for fname in key[1]
+                if (serializer := getattr(cls, f"serialize_{fname}", False))
+            )
+            FieldLevelSerializeMixin._serialize_plans[key] = plan
+        return plan
+
     def serialize(
         self,
         movie_fetched: MovieFromAPI,
@@ -85,15 +140,10 @@ class FieldLevelSerializeMixin(APICrawler):
     ) -> dict[str, Any]:
         return {
             fname: serialized
-            for fname in fields or self.fields_to_serialize
-            if (
-                (
-                    serializer := getattr(
-                        cls or self.__class__, f"serialize_{fname}", False
-                    )
-                )
-                and (serialized := serializer(self, movie_fetched, filtered=filtered))
+            for fname, serializer in (cls or self.__class__).serialize_plan(
+                fields or self.fields_to_serialize
             )
+            if (serialized := serializer(self, movie_fetched, filtered=filtered))
         }
 
 
@@ -179,18 +229,22 @@ class TMDBSerializeMixin(FieldLevelSerializeMixin):
         return movie_fetched.overview
 
     job_choice_map = {"story": "writer", "screenplay": "writer"}
+    job_choices = frozenset(j for j, _ in Credit.job.field.choices)
 
     def serialize_credits(
         self, movie_fetched: MovieFromTMDB, filtered: Optional[bool] = None
     ) -> list[SerializedCreditFromAPI]:
+        _filtered = self.filtered if filtered is None else filtered
         crew_serialized = [
-            dict(
-                job=TMDBSerializeMixin.job_choice_map.get(
-                    staff.job.lower(), staff.job.lower()
-                ),
-                person=TMDBSerializeMixin.get_or_build_person(self, staff.id),
-            )
+            dict(job=job, person=TMDBSerializeMixin.get_or_build_person(self, staff.id))
             for staff in movie_fetched.credits.crew
+            if (
+                job := TMDBSerializeMixin.job_choice_map.get(
+                    staff_job := staff.job.lower(), staff_job
+                )
+            )
+            in TMDBSerializeMixin.job_choices
+            or not _filtered  # skip person lookups for credits filtered out anyway
         ]
         cast_serialized = [
             dict(
@@ -200,14 +254,8 @@ class TMDBSerializeMixin(FieldLevelSerializeMixin):
             )
             for actor in movie_fetched.credits.cast
         ]
-        if self.filtered if filtered is None else filtered:
-            crew_serialized = list(
-                filter(
-                    lambda c: c["person"]
-                    and c["job"] in {j for j, _ in Credit.job.field.choices},
-                    crew_serialized,
-                )
-            )
+        if _filtered:
+            crew_serialized = list(filter(lambda c: c["person"], crew_serialized))
             cast_serialized = list(filter(lambda c: c["person"], cast_serialized))
         return crew_serialized + cast_serialized
 
@@ -254,6 +302,25 @@ class TMDBSerializeMixin(FieldLevelSerializeMixin):
             or (v.site == "YouTube" and (not v.iso_639_1 or v.iso_639_1 == "ko"))
         ]
 
+    decode_projection = {
+        MovieCreditsFromTMDB: {
+            "crew": lambda _, c: TMDBSerializeMixin.job_choice_map.get(
+                job := c.get("job", "").lower(), job
+            )
+            in TMDBSerializeMixin.job_choices
+        },
+        MovieImagesFromTMDB: {
+            "posters": lambda idx, p: idx == 0
+            or not p.get("iso_639_1")
+            or p["iso_639_1"] == "ko",
+            "backdrops": lambda _, s: not s.get("iso_639_1") or s["iso_639_1"] == "ko",
+        },
+        MovieVideosFromTMDB: {
+            "results": lambda _, v: v.get("site") == "YouTube"
+            and (not v.get("iso_639_1") or v["iso_639_1"] == "ko")
+        },
+    }
+
     person_id_filter = {2763122: 1344127, 2775705: 15801}
 
     def get_or_build_person(self, tmdb_id: int) -> SerializedPersonFromAPI:
@@ -285,6 +352,7 @@ class TMDBSerializeMixin(FieldLevelSerializeMixin):
         return person_json
 
     def fetch_person(self, tmdb_id: int) -> Optional[PersonFromTMDB]:
+        self.flush_batch()  # not to hold write lock while requesting
         try:
             return self.tmdb_agent.person_detail(tmdb_id)
         except HTTPError as e:
@@ -442,6 +510,16 @@ class KMDbSerializeMixin(FieldLevelSerializeMixin):
             )
         ]
 
+    decode_projection = {
+        MovieStaffsFromKMDb: {
+            "staff": lambda _, s: s.get("staffRoleGroup")
+            in KMDbSerializeMixin.job_choice_map.keys()
+        },
+        MoviePlotsFromKMDb: {
+            "plot": lambda idx, p: idx == 0 or p.get("plotLang") == "한국어"
+        },
+    }
+
     def serialize_poster_set(
         self, movie_fetched: MovieFromKMDb, **kwargs
     ) -> Optional[list[dict[str, bool | str]]]:
@@ -467,7 +545,8 @@ class TMDBDetailMixin(ListAndDetailCrawler):
         if movie_filtered := Movie.objects.filter(tmdb_id=movie.id):
             return movie_filtered.get()
         else:
-            return self.tmdb_agent.movie_detail(movie.id)
+            with self.decoding(), self.stage("detail"):
+                return self.tmdb_agent.movie_detail(movie.id)
 
 
 class ComplementaryDetailMixin(
@@ -484,6 +563,10 @@ class ComplementaryDetailMixin(
         "still_set",
         "video_set",
     ]
+    decode_projection = (
+        TMDBSerializeMixin.decode_projection | KMDbSerializeMixin.decode_projection
+    )
+
     from_kmdb_fields = [
         "kmdb_id",
         "title",
@@ -497,59 +580,101 @@ class ComplementaryDetailMixin(
     tmdb_agent: TMDBAPIAgent
     kmdb_agent: KMDbAPIAgent
 
+    @classmethod
+    def complementary_plan(
+        cls,
+    ) -> tuple[tuple[str, tuple[tuple[Callable[..., Any], int], ...]], ...]:
+        """
+        (field name, ((serializer, source index), ...)) pairs resolved once per class
+          - source index 0: TMDB movie, 1: KMDb movie
+          - serializers are tried in order until one returns non-empty value
+        """
+        if (plan := cls.__dict__.get("_complementary_plan")) is None:
+            sources = (TMDBSerializeMixin, KMDbSerializeMixin)
+            plan = tuple(
+                (
+                    fname,
+                    tuple(
+                        (serializer, idx)
+                        for idx in order
+                        if (
+                            serializer := getattr(
+                                sources[idx], f"serialize_{fname}", False
+                            )
+                        )
+                    ),
+                )
+                for fields, order in (
+                    (cls.from_tmdb_fields, (0, 1)),
+                    (cls.from_kmdb_fields, (1, 0)),
+                )
+                for fname in fields
+            )
+            cls._complementary_plan = plan
+        return plan
+
     def get_or_detail(
         self, movie: SimpleMovieFromTMDB
     ) -> tuple[MovieFromTMDB, Optional[MovieFromKMDb]] | Movie:
         if movie_filtered := Movie.objects.filter(tmdb_id=movie.id):
             return movie_filtered.get()
         else:
-            # 1. movie detail w/ TMDB API
+            with self.decoding():
+                return self.detail(movie)
+
+    def detail(
+        self, movie: SimpleMovieFromTMDB
+    ) -> tuple[MovieFromTMDB, Optional[MovieFromKMDb]]:
+        # 1. movie detail w/ TMDB API
+        with self.stage("detail"):
             tmdb_movie = self.tmdb_agent.movie_detail(movie.id)
 
-            # 2. movie detail w/ KMDb API
-            for tmdb_title in map(
-                lambda t: t.replace(" !", "!"),
-                filter(
-                    lambda t: bool(t), [tmdb_movie.original_title, tmdb_movie.title]
-                ),
-            ):
-                if tmdb_movie.director_en_names:
-                    for kmdb_movie in self.kmdb_agent.search_movies(
-                        title=tmdb_title,
-                        director=" ".join(
-                            [
-                                n.remove_accents(n.fullname)
-                                for n in tmdb_movie.director_en_names
-                            ]
-                        ),
-                        listCount=5,
-                        max_count=10,
-                    ):
-                        if kmdb_movie == tmdb_movie:
-                            return tmdb_movie, kmdb_movie
-
-                for d in tmdb_movie.release_dates:
-                    for kmdb_movie in self.kmdb_agent.search_movies(
-                        title=tmdb_title,
-                        releaseDts=datetime.date.strftime(
-                            d - datetime.timedelta(days=7), "%Y%m%d"
-                        ),
-                        releaseDte=datetime.date.strftime(
-                            d + datetime.timedelta(days=7), "%Y%m%d"
-                        ),
-                        listCount=5,
-                        max_count=10,
-                    ):
-                        if kmdb_movie == tmdb_movie:
-                            return tmdb_movie, kmdb_movie
+        # 2. movie detail w/ KMDb API
+        with self.stage("kmdb_match"):
+            return tmdb_movie, self.match_kmdb(tmdb_movie)
+
+    def match_kmdb(self, tmdb_movie: MovieFromTMDB) -> Optional[MovieFromKMDb]:
+        for tmdb_title in map(
+            lambda t: t.replace(" !", "!"),
+            filter(lambda t: bool(t), [tmdb_movie.original_title, tmdb_movie.title]),
+        ):
+            if tmdb_movie.director_en_names:
+                for kmdb_movie in self.kmdb_agent.search_movies(
+                    title=tmdb_title,
+                    director=" ".join(
+                        [
+                            n.remove_accents(n.fullname)
+                            for n in tmdb_movie.director_en_names
+                        ]
+                    ),
+                    listCount=5,
+                    max_count=10,
+                ):
+                    if kmdb_movie == tmdb_movie:
+                        return kmdb_movie
 
+            for d in tmdb_movie.release_dates:
                 for kmdb_movie in self.kmdb_agent.search_movies(
-                    title=tmdb_title, listCount=25, max_count=50
+                    title=tmdb_title,
+                    releaseDts=datetime.date.strftime(
+                        d - datetime.timedelta(days=7), "%Y%m%d"
+                    ),
+                    releaseDte=datetime.date.strftime(
+                        d + datetime.timedelta(days=7), "%Y%m%d"
+                    ),
+                    listCount=5,
+                    max_count=10,
                 ):
                     if kmdb_movie == tmdb_movie:
-                        return tmdb_movie, kmdb_movie
+                        return kmdb_movie
 
-            return tmdb_movie, None
+            for kmdb_movie in self.kmdb_agent.search_movies(
+                title=tmdb_title, listCount=25, max_count=50
+            ):
+                if kmdb_movie == tmdb_movie:
+                    return kmdb_movie
+
+        return None
 
     def serialize(
         self,
@@ -568,49 +693,14 @@ class ComplementaryDetailMixin(
         else:
             movie_json = {}
 
-            for fname in self.from_tmdb_fields:
-                if (
-                    tmdb_serializer := getattr(
-                        TMDBSerializeMixin, f"serialize_{fname}", False
-                    )
-                ) and (
-                    tmdb_serialized := tmdb_serializer(
-                        self, tmdb_movie_fetched, filtered=filtered
-                    )
-                ):
-                    movie_json[fname] = tmdb_serialized
-                elif (
-                    kmdb_serializer := getattr(
-                        KMDbSerializeMixin, f"serialize_{fname}", False
-                    )
-                ) and (
-                    kmdb_serialized := kmdb_serializer(
-                        self, kmdb_movie_fetched, filtered=filtered
-                    )
-                ):
-                    movie_json[fname] = kmdb_serialized
-
-            for fname in self.from_kmdb_fields:
-                if (
-                    kmdb_serializer := getattr(
-                        KMDbSerializeMixin, f"serialize_{fname}", False
-                    )
-                ) and (
-                    kmdb_serialized := kmdb_serializer(
-                        self, kmdb_movie_fetched, filtered=filtered
-                    )
-                ):
-                    movie_json[fname] = kmdb_serialized
-                elif (
-                    tmdb_serializer := getattr(
-                        TMDBSerializeMixin, f"serialize_{fname}", False
-                    )
-                ) and (
-                    tmdb_serialized := tmdb_serializer(
-                        self, tmdb_movie_fetched, filtered=filtered
-                    )
-                ):
-                    movie_json[fname] = tmdb_serialized
+            movies_fetched = (tmdb_movie_fetched, kmdb_movie_fetched)
+            for fname, serializers in self.complementary_plan():
+                for serializer, source in serializers:
+                    if serialized := serializer(
+                        self, movies_fetched[source], filtered=filtered
+                    ):
+                        movie_json[fname] = serialized
+                        break
 
             # merge credits
             merged_credits = self.merge_credits(
@@ -760,22 +850,24 @@ class ComplementaryDetailMixin(
     def run(
         self, filtered: Optional[bool] = None, *args, **kwargs
     ) -> list[tuple[Optional[Movie], Optional[MovieFromAPISerializer]]]:
+        with self.stage("list"):
+            listed = self.list(*args, **kwargs)
         if self.debug:
             listed = tqdm(
-                self.list(*args, **kwargs),
+                listed,
                 desc="detail -> serialize -> register for each movie listed...",
             )
-        else:
-            listed = self.list(*args, **kwargs)
 
-        return [
-            (movie_detailed, None)
-            if isinstance(movie_detailed := self.get_or_detail(m), Movie)
-            else self.get_or_register(
-                self.serialize(*movie_detailed, filtered=filtered)
-            )
-            for m in listed
-        ]
+        results = []
+        with self.batching():
+            for m in listed:
+                if isinstance(movie_detailed := self.get_or_detail(m), Movie):
+                    results.append((movie_detailed, None))
+                else:
+                    with self.stage("serialize"):
+                        movie_data = self.serialize(*movie_detailed, filtered=filtered)
+                    results.append(self.get_or_register(movie_data))
+        return results
 
 
 class TMDBAgentInitMixin:
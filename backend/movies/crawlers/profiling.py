@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import cProfile
+import os
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Iterator
+
+from decorators import count_memo_stats, memo_report
+
+
+class StageProfiler:
+    """
+    Records wall time spent in each named crawling stage
+      (list, detail, kmdb_match, serialize, validate, save, commit)
+      & hits of memoized callables (counted from then on)
+    """
+
+    def __init__(self):
+        count_memo_stats()
+        self.seconds: defaultdict[str, float] = defaultdict(float)
+        self.counts: defaultdict[str, int] = defaultdict(int)
+        self._stack: list[str] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self._stack.append(name)
+        self.enter(name)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += perf_counter() - start
+            self.counts[name] += 1
+            self._stack.pop()
+            self.exit(name)
+
+    def enter(self, name: str):
+        """
+        hook called on entering a stage (stage name already pushed on `_stack`)
+        """
+        pass
+
+    def exit(self, name: str):
+        """
+        hook called on exiting a stage (stage name already popped from `_stack`)
+        """
+        pass
+
+    def report(self) -> list[str]:
+        lines = [f"{'stage':<12}{'calls':>8}{'total (s)':>12}{'per call (ms)':>16}"]
+        for name, seconds in self.seconds.items():
+            lines.append(
+                f"{name:<12}{self.counts[name]:>8}{seconds:>12.2f}"
+                f"{seconds / self.counts[name] * 1000:>16.2f}"
+            )
+        if memo_lines := memo_report():
+            lines.extend(["", *memo_lines])
+        return lines
+
+
+class CProfileStageProfiler(StageProfiler):
+    """
+    Runs a cProfile profiler per stage & dumps each into `<output_dir>/<stage>.prof`
+    """
+
+    def __init__(self, output_dir: str = "profiles"):
+        super().__init__()
+        self.output_dir = output_dir
+        self.profiles: dict[str, cProfile.Profile] = {}
+
+    def enter(self, name: str):
+        if len(self._stack) > 1:  # only one profiler can be active at a time
+            self.profiles[self._stack[-2]].disable()
+        self.profiles.setdefault(name, cProfile.Profile()).enable()
+
+    def exit(self, name: str):
+        self.profiles[name].disable()
+        if self._stack:
+            self.profiles[self._stack[-1]].enable()
+
+    def report(self) -> list[str]:
+        lines = super().report()
+        os.makedirs(self.output_dir, exist_ok=True)
+        for name, profile in self.profiles.items():
+            profile.dump_stats(path := os.path.join(self.output_dir, f"{name}.prof"))
+            lines.append(f"cProfile stats of '{name}' stage dumped: {path}")
+        return lines
+
+
+class MemoryStageProfiler(StageProfiler):
+    """
+    Traces peak memory & top allocation sites (net growth by source line) per stage
+      w/ tracemalloc
+    """
+
+    ignored_traces = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    )
+
+    def __init__(self, top: int = 5):
+        super().__init__()
+        self.top = top
+        self.peaks: defaultdict[str, int] = defaultdict(int)
+        self.allocated: defaultdict[str, Counter] = defaultdict(Counter)
+        self._starts: list[tuple[tracemalloc.Snapshot, int]] = []
+
+    def enter(self, name: str):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._starts.append(
+            (tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()[0])
+        )
+        tracemalloc.reset_peak()
+
+    def exit(self, name: str):
+        snapshot_before, memory_before = self._starts.pop()
+        peak = tracemalloc.get_traced_memory()[1]
+        self.peaks[name] = max(self.peaks[name], peak - memory_before)
+        for stat in (
+            tracemalloc.take_snapshot()
+            .filter_traces(self.ignored_traces)
+            .compare_to(snapshot_before.filter_traces(self.ignored_traces), "lineno")
+        ):
+            if stat.size_diff > 0:
+                self.allocated[name][str(stat.traceback[0])] += stat.size_diff
+
+    def report(self) -> list[str]:
+        lines = super().report()
+        for name in self.seconds.keys():
+            lines.append("")
+            lines.append(f"[{name}] peak: {self.peaks[name] / 2**20:.2f} MiB")
+            for site, size in self.allocated[name].most_common(self.top):
+                lines.append(f"  {size / 2**10:>10.1f} KiB  {site}")
+        return lines
@@ -31,6 +31,7 @@ from serializers import (
     CreateOrMergeWithDataMixin,
     NestedCreateMixin,
     RequiredTogetherMixin,
+    ReusableFieldsMixin,
     SkipChildsListSerializer,
     SkipFieldsMixin,
 )
@@ -250,6 +251,7 @@ class MovieRegisterSerializer(SkipFieldsMixin, NestedCreateMixin, ModelSerialize
         fields = "__all__"
         can_skip_fields = {"release_date"}
         remove_redundancy = True
+        bulk_create_children = True
         custom_validators = {
             "title": {
                 "ko_and_more": RegexValidator(
@@ -397,7 +399,9 @@ class MovieRegisterSerializer(SkipFieldsMixin, NestedCreateMixin, ModelSerialize
 
 
 @validate_fields(fields=["title", "synopsys"], validator=validate_kmdb_text)
-class MovieFromAPISerializer(RequiredTogetherMixin, MovieRegisterSerializer):
+class MovieFromAPISerializer(
+    ReusableFieldsMixin, RequiredTogetherMixin, MovieRegisterSerializer
+):
     class Meta(MovieRegisterSerializer.Meta):
         required_together_fields = ["tmdb_id", "kmdb_id"]
         title_max_length = 50
@@ -1,38 +1,56 @@
-import requests
+import threading
+from importlib import import_module
+
 from bs4 import BeautifulSoup
 
 
 class ISO_3166_1:
     url = "https://ko.wikipedia.org/wiki/ISO_3166-1"
+    data_module = "movies.crawlers.iso_3166_1"
 
     _book: dict[str, dict[str, dict[str, str]]]
+    _lock = threading.Lock()
     name_key = "name"
     numeric_key = "numeric"
     alpha_2_key = "alpha_2"
     alpha_3_key = "alpha_3"
 
-    @classmethod
-    def _setup(cls):
-        response = requests.get(cls.url)
-        response.raise_for_status()
+    # column order of ISO 3166-1 table rows
+    keys = (name_key, numeric_key, alpha_3_key, alpha_2_key)
 
-        soup = BeautifulSoup(response.text, "html.parser")
+    @classmethod
+    def parse_html(cls, html: str) -> list[tuple[str, str, str, str]]:
+        """
+        ISO 3166-1 table rows from the Wikipedia page at `url`
+        """
+        soup = BeautifulSoup(html, "html.parser")
         rows = soup.table.findChildren("tr")
 
-        keys = [cls.name_key, cls.numeric_key, cls.alpha_3_key, cls.alpha_2_key]
+        return [
+            tuple(cell.text.strip().upper() for cell in row.findChildren("td"))
+            for row in rows[1:]
+        ]
+
+    @classmethod
+    def _setup(cls):
+        """
+        Index precompiled table by each key on first lookup (once per process)
+        """
+        with cls._lock:
+            if getattr(cls, "_book", False):
+                return
 
-        cls._book = {k: {} for k in keys}
-        for row in rows[1:]:
-            country = {}
-            for idx, cell in enumerate(row.findChildren("td")):
-                country[keys[idx]] = cell.text.strip().upper()
-            for k, v in country.items():
-                cls._book[k][v] = country
+            book = {k: {} for k in cls.keys}
+            for row in import_module(cls.data_module).COUNTRIES:
+                country = dict(zip(cls.keys, row))
+                for k, v in country.items():
+                    book[k][v] = country
 
-        cls._setup_exceptions()
+            cls._setup_exceptions(book)
+            cls._book = book
 
     @classmethod
-    def _setup_exceptions(cls):
+    def _setup_exceptions(cls, book: dict[str, dict[str, dict[str, str]]]):
         # 유고슬라비아
         yugoslavia = {
             cls.name_key: "유고슬라비아",
@@ -41,7 +59,7 @@ class ISO_3166_1:
             cls.alpha_3_key: "YUG",
         }
         for k, v in yugoslavia.items():
-            cls._book[k][v] = yugoslavia
+            book[k][v] = yugoslavia
 
     @classmethod
     def get_country(cls, **kwargs) -> dict[str, str]:
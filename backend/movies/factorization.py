@@ -0,0 +1,282 @@
+"""
+Matrix factorization of ratings for per-(user, movie) predicted scores
+  - trained offline by ALS w/ biases: score ~ mean + user bias + movie bias + p_u . q_i
+  - stored as memory-mapped `.npy` arrays, augmented so that a prediction is
+    one dot product: [p_u, mean + user bias, 1] . [q_i, 1, movie bias]
+  - NumPy is an optional dependency, w/o which nothing is predicted
+"""
+import json
+import os
+import shutil
+import threading
+from dataclasses import dataclass
+from time import time
+from typing import Any, Optional
+
+from django.conf import settings
+
+from .models import Rating
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = sparse = None
+
+MIN_SCORE, MAX_SCORE = 0.5, 5.0
+
+
+@dataclass
+class FactorModel:
+    user_ids: "np.ndarray"  # sorted pks, row index of factors
+    movie_ids: "np.ndarray"
+    user_factors: "np.ndarray"  # augmented [p_u, mean + b_u, 1]
+    movie_factors: "np.ndarray"  # augmented [q_i, 1, b_i]
+    meta: dict[str, Any]
+
+    files = ("user_ids", "movie_ids", "user_factors", "movie_factors")
+    kept_versions = 2  # current & former one (still mapped by not yet reloaded readers)
+
+    def predict(self, user_id: int, movie_id: int) -> Optional[float]:
+        u = np.searchsorted(self.user_ids, user_id)
+        i = np.searchsorted(self.movie_ids, movie_id)
+        if (
+            u == len(self.user_ids)
+            or self.user_ids[u] != user_id
+            or i == len(self.movie_ids)
+            or self.movie_ids[i] != movie_id
+        ):
+            return None  # not rated by user or of movie while training
+        score = float(self.user_factors[u] @ self.movie_factors[i])
+        return min(max(score, MIN_SCORE), MAX_SCORE)
+
+    def save(self, directory: str) -> str:
+        """
+        Write arrays into a new version directory & point `current` to it
+          (readers keep their memory maps of former version until reloading)
+        """
+        version = f"{time():.6f}"
+        path = os.path.join(directory, version)
+        os.makedirs(path)
+        for name in self.files:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+
+        pointer = os.path.join(directory, "current")
+        with open(f"{pointer}.tmp", "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(f"{pointer}.tmp", pointer)
+
+        versions = sorted(
+            v
+            for v in os.listdir(directory)
+            if os.path.isdir(os.path.join(directory, v))
+        )
+        for former in versions[: -self.kept_versions]:
+            shutil.rmtree(os.path.join(directory, former), ignore_errors=True)
+        return path
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["FactorModel"]:
+        try:
+            with open(os.path.join(directory, "current"), encoding="utf-8") as f:
+                path = os.path.join(directory, f.read().strip())
+            with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            arrays = {
+                name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+                for name in cls.files
+            }
+        except FileNotFoundError:
+            return None
+        return cls(**arrays, meta=meta)
+
+
+class FactorStore:
+    """
+    Factor model of current version in `FACTORIZATION_DIR`, reloaded once retrained
+    """
+
+    def __init__(self):
+        self._model: Optional[FactorModel] = None
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        return str(settings.FACTORIZATION_DIR)
+
+    def current_version(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.directory, "current"), encoding="utf-8") as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+
+    @property
+    def model(self) -> Optional[FactorModel]:
+        if np is None:
+            return None
+        if (version := self.current_version()) != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._model = FactorModel.load(self.directory)
+                    self._version = version
+        return self._model
+
+    def predict(self, user_id: int, movie_id: int) -> Optional[float]:
+        if (model := self.model) is None:
+            return None
+        return model.predict(user_id, movie_id)
+
+
+factor_store = FactorStore()
+
+
+def load_ratings() -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    rows = Rating.objects.values_list("user_id", "movie_id", "score")
+    ratings = np.fromiter(
+        rows.iterator(chunk_size=10000),
+        dtype=[("user_id", np.int64), ("movie_id", np.int64), ("score", np.float64)],
+    )
+    return ratings["user_id"], ratings["movie_id"], ratings["score"]
+
+
+def solve_rows(
+    ratings: "sparse.csr_matrix",
+    features: "np.ndarray",
+    offsets: "np.ndarray",
+    regularization: float,
+    chunk_size: int = 16384,
+) -> "np.ndarray":
+    """
+    Ridge regression of each row's ratings (minus offsets of rated columns)
+      on `features` of rated columns, solved in stacked chunks of rows
+      (regularization weighted by number of ratings of each row)
+    """
+    n_rows, n_features = ratings.shape[0], features.shape[1]
+    indptr, indices, data = ratings.indptr, ratings.indices, ratings.data
+    counts = np.diff(indptr)
+    identity = np.eye(n_features)
+    solved = np.zeros((n_rows, n_features))
+
+    start = 0
+    while start < n_rows:
+        # rows [start, stop) w/ about `chunk_size` ratings in total (at least 1 row)
+        stop = max(
+            start + 1,
+            np.searchsorted(indptr, indptr[start] + chunk_size, side="right") - 1,
+        )
+        lo, hi = indptr[start], indptr[stop]
+        if hi > lo:
+            rated = counts[start:stop] > 0
+            x = features[indices[lo:hi]]
+            y = data[lo:hi] - offsets[indices[lo:hi]]
+            segments = indptr[start:stop][rated] - lo
+            a = np.add.reduceat(np.einsum("nk,nl->nkl", x, x), segments, axis=0)
+            a += regularization * counts[start:stop][rated, None, None] * identity
+            b = np.add.reduceat(x * y[:, None], segments, axis=0)
+            solved[start:stop][rated] = np.linalg.solve(a, b[..., None])[..., 0]
+        start = stop
+    return solved
+
+
+def train_als(
+    users: "np.ndarray",
+    movies: "np.ndarray",
+    scores: "np.ndarray",
+    factors: int = 16,
+    regularization: float = 0.05,
+    iterations: int = 10,
+    seed: int = 0,
+) -> FactorModel:
+    user_ids, user_index = np.unique(users, return_inverse=True)
+    movie_ids, movie_index = np.unique(movies, return_inverse=True)
+    mean = float(scores.mean())
+    shape = (len(user_ids), len(movie_ids))
+    by_user = sparse.csr_matrix((scores, (user_index, movie_index)), shape=shape)
+    by_movie = by_user.T.tocsr()
+
+    rng = np.random.default_rng(seed)
+    p = rng.normal(0, 0.1, (len(user_ids), factors))
+    q = rng.normal(0, 0.1, (len(movie_ids), factors))
+    user_bias, movie_bias = np.zeros(len(user_ids)), np.zeros(len(movie_ids))
+    ones = np.ones((max(shape), 1))
+    for _ in range(iterations):
+        solved = solve_rows(
+            by_user,
+            np.hstack([q, ones[: len(movie_ids)]]),
+            mean + movie_bias,
+            regularization,
+        )
+        p, user_bias = solved[:, :-1], solved[:, -1]
+        solved = solve_rows(
+            by_movie,
+            np.hstack([p, ones[: len(user_ids)]]),
+            mean + user_bias,
+            regularization,
+        )
+        q, movie_bias = solved[:, :-1], solved[:, -1]
+
+    return FactorModel(
+        user_ids=user_ids,
+        movie_ids=movie_ids,
+        user_factors=np.hstack(
+            [p, (mean + user_bias)[:, None], ones[: len(user_ids)]]
+        ).astype(np.float32),
+        movie_factors=np.hstack(
+            [q, ones[: len(movie_ids)], movie_bias[:, None]]
+        ).astype(np.float32),
+        meta={
+            "factors": factors,
+            "regularization": regularization,
+            "iterations": iterations,
+            "mean": mean,
+            "n_ratings": len(scores),
+        },
+    )
+
+
+def rmse(
+    model: FactorModel, users: "np.ndarray", movies: "np.ndarray", scores: "np.ndarray"
+) -> float:
+    """
+    Root mean squared error of (clipped) predictions of given ratings
+      (ratings of users or movies unknown to model predicted as training mean)
+    """
+    u = np.searchsorted(model.user_ids, users).clip(0, len(model.user_ids) - 1)
+    i = np.searchsorted(model.movie_ids, movies).clip(0, len(model.movie_ids) - 1)
+    known = (model.user_ids[u] == users) & (model.movie_ids[i] == movies)
+    predicted = np.full(len(scores), model.meta["mean"])
+    predicted[known] = np.einsum(
+        "nk,nk->n", model.user_factors[u[known]], model.movie_factors[i[known]]
+    )
+    return float(np.sqrt(np.mean((predicted.clip(MIN_SCORE, MAX_SCORE) - scores) ** 2)))
+
+
+def synthetic_ratings(
+    n_ratings: int, n_users: int, n_movies: int, rank: int = 8, seed: int = 0
+) -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """
+    Ratings sampled from a planted low rank model w/ biases & noise
+      (rounded to half stars as users rate)
+    """
+    rng = np.random.default_rng(seed)
+    pairs = np.unique(
+        rng.integers(0, n_users * n_movies, int(n_ratings * 1.05), dtype=np.int64)
+    )[:n_ratings]
+    rng.shuffle(pairs)
+    users, movies = pairs // n_movies + 1, pairs % n_movies + 1
+    p = rng.normal(0, 0.4, (n_users + 1, rank))
+    q = rng.normal(0, 0.4, (n_movies + 1, rank))
+    user_bias = rng.normal(0, 0.3, n_users + 1)
+    movie_bias = rng.normal(0, 0.5, n_movies + 1)
+    scores = (
+        3.5
+        + user_bias[users]
+        + movie_bias[movies]
+        + np.einsum("nk,nk->n", p[users], q[movies])
+        + rng.normal(0, 0.5, len(pairs))
+    )
+    return users, movies, (np.round(scores * 2) / 2).clip(MIN_SCORE, MAX_SCORE)
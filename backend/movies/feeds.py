@@ -0,0 +1,176 @@
+"""
+Feeds of ratings, reviews & wishlists of followed users
+  - fan-out on write: an activity is pushed as an entry into each follower's feed
+    once the writing transaction commits
+  - fan-out on read: activities of users w/ more than `fanout_limit` followers are
+    not pushed, but pulled into a follower's feed when one reads its first page
+  - either way, a feed page is read by one keyset seek over owner's entries
+"""
+import heapq
+from collections import defaultdict
+from typing import Any, Iterable, Optional, Type
+
+from accounts.models import Follow
+from django.conf import settings
+from django.db import models
+from django.db.models import Max
+
+from .models import FeedEntry, FeedPullActor, Rating, Review, Wishlist
+
+
+class Feed:
+    pull_limit = 100  # latest activities pulled (or backfilled) per followed user
+
+    # kind: (activity model, its timestamp field)
+    activities: dict[str, tuple[Type[models.Model], str]] = {
+        FeedEntry.RATING[0]: (Rating, "created_at"),
+        FeedEntry.REVIEW[0]: (Review, "created_at"),
+        FeedEntry.WISHLIST[0]: (Wishlist, "timestamp"),
+    }
+
+    @property
+    def fanout_limit(self) -> int:
+        return getattr(settings, "FEED_FANOUT_LIMIT", 1000)
+
+    def kind_of(self, model: Type[models.Model]) -> Optional[str]:
+        for kind, (activity_model, _) in self.activities.items():
+            if model is activity_model:
+                return kind
+
+    def entry(self, owner_id: int, kind: str, activity: models.Model) -> FeedEntry:
+        return FeedEntry(
+            owner_id=owner_id,
+            actor_id=activity.user_id,
+            kind=kind,
+            object_id=activity.pk,
+            movie_id=activity.movie_id,
+            created_at=getattr(activity, self.activities[kind][1]),
+        )
+
+    def push(self, kind: str, activity: models.Model) -> int:
+        """
+        Push activity into followers' feeds (returns number of feeds pushed to)
+          unless actor has too many followers, marked to be pulled from instead
+          - actor back under the limit is unmarked, & followers' feeds are backfilled
+            w/ activities written while pulled from
+        """
+        rows = list(
+            Follow.objects.filter(following_id=activity.user_id).values_list(
+                "follower_id", "following__feed_pull"
+            )[: self.fanout_limit + 1]
+        )
+        followers = [follower for follower, _ in rows]
+        pulled = bool(rows) and rows[0][1] is not None
+        if len(followers) > self.fanout_limit:
+            if not pulled:
+                FeedPullActor.objects.get_or_create(actor_id=activity.user_id)
+            return 0
+        if pulled:
+            FeedPullActor.objects.filter(actor_id=activity.user_id).delete()
+            self.follow(followers, [activity.user_id])
+        FeedEntry.objects.bulk_create(
+            [self.entry(follower, kind, activity) for follower in followers],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+        return len(followers)
+
+    def retract(self, kind: str, object_id: Any):
+        FeedEntry.objects.filter(kind=kind, object_id=object_id).delete()
+
+    def latest_activities(
+        self, actor_id: int, since: Optional[Any] = None
+    ) -> list[tuple[str, models.Model]]:
+        """
+        (kind, activity) of latest `pull_limit` activities of actor (since `since`)
+        """
+        activities = []
+        for kind, (model, timestamp) in self.activities.items():
+            queryset = model.objects.filter(user_id=actor_id)
+            if since is not None:
+                queryset = queryset.filter(**{f"{timestamp}__gte": since})
+            activities.extend(
+                (kind, activity)
+                for activity in queryset.only(
+                    "user_id", "movie_id", timestamp
+                ).order_by(f"-{timestamp}")[: self.pull_limit]
+            )
+        return heapq.nlargest(
+            self.pull_limit,
+            activities,
+            key=lambda item: getattr(item[1], self.activities[item[0]][1]),
+        )
+
+    def pull(self, owner_id: int, actor_ids: Iterable[int]) -> int:
+        """
+        Insert latest activities of actors into owner's feed
+          (since owner's latest entry of each actor, if any)
+        """
+        actor_ids = list(actor_ids)
+        latest = dict(
+            FeedEntry.objects.filter(owner_id=owner_id, actor_id__in=actor_ids)
+            .order_by()
+            .values("actor_id")
+            .annotate(latest=Max("created_at"))
+            .values_list("actor_id", "latest")
+        )
+        entries = [
+            self.entry(owner_id, kind, activity)
+            for actor_id in actor_ids
+            for kind, activity in self.latest_activities(actor_id, latest.get(actor_id))
+        ]
+        FeedEntry.objects.bulk_create(entries, batch_size=500, ignore_conflicts=True)
+        return len(entries)
+
+    def refresh(self, owner_id: int) -> int:
+        """
+        Pull activities of followed users not pushing theirs into owner's feed
+        """
+        actor_ids = Follow.objects.filter(
+            follower_id=owner_id, following__feed_pull__isnull=False
+        ).values_list("following_id", flat=True)
+        if actor_ids := list(actor_ids):
+            return self.pull(owner_id, actor_ids)
+        return 0
+
+    def follow(self, follower_ids: Iterable[int], following_ids: Iterable[int]):
+        """
+        Backfill feeds of new followers w/ latest activities of followed users
+        """
+        following_ids = list(following_ids)
+        for follower_id in follower_ids:
+            self.pull(follower_id, following_ids)
+
+    def unfollow(self, follower_ids: Iterable[int], following_ids: Iterable[int]):
+        FeedEntry.objects.filter(
+            owner_id__in=list(follower_ids), actor_id__in=list(following_ids)
+        ).delete()
+
+    def hydrate(self, entries: list[FeedEntry]) -> list[FeedEntry]:
+        """
+        Set `activity` of entries to details of rating or review they refer to
+          (one query per kind of activity in entries)
+        """
+        object_ids = defaultdict(list)
+        for entry in entries:
+            object_ids[entry.kind].append(entry.object_id)
+        details: dict[tuple[str, int], dict[str, Any]] = {}
+        if pks := object_ids[FeedEntry.RATING[0]]:
+            for pk, score in Rating.objects.filter(pk__in=pks).values_list(
+                "pk", "score"
+            ):
+                details[FeedEntry.RATING[0], pk] = {"score": score}
+        if pks := object_ids[FeedEntry.REVIEW[0]]:
+            for pk, comment, has_spoiler in Review.objects.filter(
+                pk__in=pks
+            ).values_list("pk", "comment", "has_spoiler"):
+                details[FeedEntry.REVIEW[0], pk] = {
+                    "comment": comment,
+                    "has_spoiler": has_spoiler,
+                }
+        for entry in entries:
+            entry.activity = details.get((entry.kind, entry.object_id), {})
+        return entries
+
+
+feed = Feed()
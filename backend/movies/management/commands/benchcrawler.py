@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from ...crawlers import benchmarks
+
+
+class Command(BaseCommand):
+    help = "Benchmark crawler steps w/ synthetic API responses (no network access)."
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "target",
+            choices=["serialize", "parse", "validate"],
+            help="choose crawler step to benchmark",
+        )
+        parser.add_argument(
+            "-c",
+            "--count",
+            type=int,
+            help="number of synthetic movies to run through the step",
+        )
+        parser.add_argument(
+            "-r",
+            "--repeat",
+            type=int,
+            default=3,
+            help="number of rounds to repeat (best round is reported)",
+        )
+
+    def handle(self, *args, **options):
+        bench_kwargs = {"repeat": options["repeat"]}
+        if options["count"]:
+            bench_kwargs["count"] = options["count"]
+
+        results = getattr(benchmarks, f"benchmark_{options['target']}")(**bench_kwargs)
+        for label, (value, unit) in results.items():
+            self.stdout.write(f"{label:<20}{value:>12.1f} {unit}")
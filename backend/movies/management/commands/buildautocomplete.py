@@ -0,0 +1,45 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...autocomplete import autocompleter
+
+
+class Command(BaseCommand):
+    help = "Build autocomplete prefix indexes of movies & persons into a snapshot file."
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "-o",
+            "--output",
+            help="path to write snapshot into "
+            "(defaults to the one set by 'AUTOCOMPLETE_SNAPSHOT' env var)",
+        )
+        parser.add_argument(
+            "--install",
+            action="store_true",
+            help="(re)create missing change log triggers first "
+            "(ex. after a migration remaking movies, persons, ratings or credits table)",
+        )
+
+    def handle(self, *args, **options):
+        if not (output := options["output"] or autocompleter.snapshot_path):
+            raise CommandError(
+                "You should either pass snapshot path from CLI with '--output' kwarg "
+                "or set 'AUTOCOMPLETE_SNAPSHOT' environment variable."
+            )
+
+        started = perf_counter()
+        if options["install"]:
+            autocompleter.install()
+        autocompleter.build()
+        autocompleter.save(output)
+        counts = {
+            name: len(index.state.docs) for name, index in autocompleter.indexes.items()
+        }
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Autocomplete snapshot of {counts} written in "
+                f"{perf_counter() - started:.2f}s: {output}"
+            )
+        )
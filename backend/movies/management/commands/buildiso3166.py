@@ -0,0 +1,54 @@
+import json
+from importlib import import_module
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...crawlers.utils import ISO_3166_1
+
+
+class Command(BaseCommand):
+    help = "Regenerate precompiled ISO 3166-1 countries table from a saved copy of its Wikipedia page."
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "html",
+            help=f"path to HTML file saved from {ISO_3166_1.url}",
+        )
+        parser.add_argument(
+            "-o",
+            "--output",
+            help="path to write table module into (defaults to the module read by ISO_3166_1)",
+        )
+
+    def handle(self, *args, **options):
+        with open(options["html"], encoding="utf-8") as f:
+            rows = ISO_3166_1.parse_html(f.read())
+
+        if invalid := [r for r in rows if len(r) != len(ISO_3166_1.keys)]:
+            raise CommandError(
+                f"Rows w/ other than {ISO_3166_1.keys} columns encountered: {invalid[:3]}"
+            )
+
+        output = options["output"] or import_module(ISO_3166_1.data_module).__file__
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(self.render(rows))
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(rows)} countries written: {output}")
+        )
+
+    def render(self, rows: list[tuple[str, str, str, str]]) -> str:
+        lines = [
+            '"""',
+            "ISO 3166-1 countries table (regenerate w/ `python manage.py buildiso3166`)",
+            '"""',
+            "",
+            f"# ({', '.join(ISO_3166_1.keys)})",
+            "COUNTRIES: tuple[tuple[str, str, str, str], ...] = (",
+        ]
+        for row in sorted(rows):
+            lines.append(
+                f"    ({', '.join(json.dumps(v, ensure_ascii=False) for v in row)}),"
+            )
+        lines.append(")")
+        return "\n".join(lines) + "\n"
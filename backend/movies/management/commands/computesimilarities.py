@@ -0,0 +1,56 @@
+from argparse import BooleanOptionalAction
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ... import recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute item-item similarities of movies from ratings & store top neighbours."
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "-k",
+            "--neighbors",
+            type=int,
+            default=50,
+            help="number of most similar movies to store per movie",
+        )
+        parser.add_argument(
+            "--min-support",
+            type=int,
+            default=2,
+            help="least number of users who rated both movies to count their similarity",
+        )
+        parser.add_argument(
+            "--vectorized",
+            action=BooleanOptionalAction,
+            default=None,
+            help="choose whether to compute w/ NumPy & SciPy "
+            "(defaults to whether they are installed)",
+        )
+
+    def handle(self, *args, **options):
+        if options["vectorized"] and recommendations.np is None:
+            raise CommandError(
+                "You should install NumPy & SciPy to compute similarities vectorized."
+            )
+        if options["neighbors"] < 1 or options["min_support"] < 1:
+            raise CommandError(
+                "Both '--neighbors' & '--min-support' should be positive."
+            )
+
+        started = perf_counter()
+        n_stored = recommendations.compute_similarities(
+            k=options["neighbors"],
+            min_support=options["min_support"],
+            vectorized=options["vectorized"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{n_stored} movie similarities stored in {perf_counter() - started:.2f}s"
+            )
+        )
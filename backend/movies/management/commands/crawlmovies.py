@@ -1,10 +1,14 @@
 import os
 from argparse import BooleanOptionalAction
 from itertools import chain
+from typing import Any
 
 from django.core.management.base import BaseCommand, CommandError, CommandParser
 from django.forms.models import model_to_dict
 
+from ...autocomplete import autocompleter
+from ...caches import movie_detail_cache
+from ...crawlers import profiling
 from ...crawlers.mixins import crawler as crawler_mixins
 from ...models import Movie
 
@@ -17,9 +21,11 @@ class Command(BaseCommand):
         parser.add_argument(
             "-lm",
             "--list-method",
+            nargs="+",
             choices=["TopRated", "Popular", "Trending", "NowPlaying", "Search"],
-            required=True,
-            help="choose method for first fetching movie lists",
+            default=[],
+            help="choose one or more methods for first fetching movie lists "
+            "(movies listed from several methods are detailed only once)",
         )
         parser.add_argument(
             "-dm",
@@ -51,10 +57,78 @@ class Command(BaseCommand):
             help="set time window when using Trending list method",
         )
         parser.add_argument("-q", "--query", help="query for Search list method")
+        parser.add_argument(
+            "--query-file",
+            help="file of queries for Search list method, one per line "
+            "(implies Search list method, blank lines & lines starting w/ '#' are ignored)",
+        )
         parser.add_argument(
             "-y", "--year", type=int, help="year to query when using Search list method"
         )
 
+        # decoding option
+        parser.add_argument(
+            "--lazy-decoding",
+            action=BooleanOptionalAction,
+            default=False,
+            help="choose whether to decode only API response data to be registered, on first access",
+        )
+
+        # registration options
+        parser.add_argument(
+            "--reuse-serializer-fields",
+            action=BooleanOptionalAction,
+            default=False,
+            help="choose whether to build serializer fields once & reuse them to validate every movie",
+        )
+        parser.add_argument(
+            "--commit-every",
+            type=int,
+            help="commit registered movies together every N movies "
+            "(each movie is rolled back alone on failure); batches are also committed "
+            "before each API request & within half of SQLite busy timeout, "
+            "so only movies saved between requests are batched but server's writes never wait long",
+        )
+        parser.add_argument(
+            "--commit-interval",
+            type=float,
+            help="commit registered movies together every T seconds "
+            "(each movie is rolled back alone on failure); batches are also committed "
+            "before each API request & within half of SQLite busy timeout, "
+            "so only movies saved between requests are batched but server's writes never wait long",
+        )
+
+        # post-crawl option
+        parser.add_argument(
+            "--warm-cache",
+            action=BooleanOptionalAction,
+            default=False,
+            help="choose whether to cache detail responses of newly registered movies "
+            "(needs a cache backend shared w/ server, set by 'CACHE_BACKEND' env var)",
+        )
+        parser.add_argument(
+            "--refresh-autocomplete",
+            action=BooleanOptionalAction,
+            default=False,
+            help="choose whether to refresh autocomplete snapshot "
+            "w/ crawled movies & persons (set by 'AUTOCOMPLETE_SNAPSHOT' env var)",
+        )
+
+        # profiling options
+        parser.add_argument(
+            "--profile",
+            choices=["stages", "cprofile", "memory"],
+            help="choose how to profile each crawling stage "
+            "(list, detail, kmdb_match, serialize, validate, save, commit): "
+            "'stages' for time, 'cprofile' for time & cProfile stats dumped per stage, "
+            "'memory' for time & tracemalloc peak memory and top allocation sites",
+        )
+        parser.add_argument(
+            "--profile-dir",
+            default="profiles",
+            help="directory to dump .prof files into when using 'cprofile' profile",
+        )
+
         # debug option
         parser.add_argument(
             "--debug",
@@ -72,6 +146,14 @@ class Command(BaseCommand):
                 "or set 'TMDB_API_TOKEN' environment variable."
             )
 
+        if options["refresh_autocomplete"] and not autocompleter.snapshot_path:
+            raise CommandError(
+                "You should set 'AUTOCOMPLETE_SNAPSHOT' environment variable "
+                "to refresh autocomplete snapshot."
+            )
+
+        sources = self.list_sources(options)
+
         if options["detail_method"] == "Complementary":
             if kmdb_api_key := options["kmdb_key"] or os.getenv("KMDB_API_KEY"):
                 init_kwargs["kmdb_api_key"] = kmdb_api_key
@@ -86,40 +168,38 @@ class Command(BaseCommand):
                 crawler_mixins.TMDBAgentInitMixin,
                 crawler_mixins.KMDbAgentInitMixin,
                 getattr(crawler_mixins, f"{options['detail_method']}DetailMixin"),
-                getattr(crawler_mixins, f"{options['list_method']}ListMixin"),
+                crawler_mixins.MultiListMixin,
             ]
         elif options["detail_method"] == "TMDB":
             mixins = [
                 crawler_mixins.TMDBAgentInitMixin,
                 crawler_mixins.TMDBSerializeMixin,
                 getattr(crawler_mixins, f"{options['detail_method']}DetailMixin"),
-                getattr(crawler_mixins, f"{options['list_method']}ListMixin"),
+                crawler_mixins.MultiListMixin,
             ]
 
-        run_kwargs = {}
-        if options["max_count"]:
-            run_kwargs["max_count"] = options["max_count"]
-
-        if options["list_method"] == "Search":
-            if options["query"]:
-                run_kwargs["query"] = options["query"]
-            else:
-                raise CommandError(
-                    "You should pass query to search when using 'Search' list method."
-                )
-            if options["year"]:
-                run_kwargs["year"] = options["year"]
-        elif options["list_method"] == "Trending":
-            run_kwargs["time_window"] = options["time_window"]
+        if options["profile"] == "stages":
+            profiler = profiling.StageProfiler()
+        elif options["profile"] == "cprofile":
+            profiler = profiling.CProfileStageProfiler(
+                output_dir=options["profile_dir"]
+            )
+        elif options["profile"] == "memory":
+            profiler = profiling.MemoryStageProfiler()
         else:
-            run_kwargs = {"max_count": options["max_count"]}
+            profiler = None
 
         class Crawler(*mixins):
             debug = options["debug"]
+            lazy_decoding = options["lazy_decoding"]
+            reuse_serializer_fields = options["reuse_serializer_fields"]
+            commit_every = options["commit_every"]
+            commit_interval = options["commit_interval"]
 
         crawler = Crawler(**init_kwargs)
+        crawler.profiler = profiler
 
-        result = crawler.run(**run_kwargs)
+        result = crawler.run(sources=sources)
         success = [
             (m, s)
             for m, s in result
@@ -134,6 +214,39 @@ class Command(BaseCommand):
         )
         self.stdout.write(f"Pre-existed: {(n_existed:=len(existed))}")
 
+        if options["warm_cache"]:
+            if movie_detail_cache.enabled:
+                n_warmed = movie_detail_cache.warm(m.pk for m, _ in success)
+                self.stdout.write(f"Detail responses cached: {n_warmed}")
+            else:
+                self.stdout.write(
+                    self.style.WARNING(
+                        "Detail responses not cached w/ a process-local cache backend"
+                    )
+                )
+
+        if options["refresh_autocomplete"]:
+            if autocompleter.load():
+                refreshed = autocompleter.refresh()
+            else:
+                autocompleter.build()
+                refreshed = {
+                    name: len(index.state.docs)
+                    for name, index in autocompleter.indexes.items()
+                }
+            autocompleter.save()
+            self.stdout.write(f"Autocomplete snapshot refreshed: {refreshed}")
+
+        if profiler is not None:
+            self.stdout.write("\n")
+            self.stdout.write(
+                self.style.MIGRATE_HEADING(
+                    f"==================== PROFILE: {options['profile']} ===================="
+                )
+            )
+            for line in profiler.report():
+                self.stdout.write(line)
+
         if options["debug"]:
             # SUCESS
             self.stdout.write("\n")
@@ -201,3 +314,50 @@ class Command(BaseCommand):
                             ),
                             ending="\n\n",
                         )
+
+    def list_sources(self, options: dict[str, Any]) -> list[tuple[str, dict[str, Any]]]:
+        """
+        (list method name, list method kwargs) pairs to list movies from
+          - 'Search' list method yields a source per query (from both CLI & query file)
+        """
+        list_methods = list(dict.fromkeys(options["list_method"]))
+        queries = [options["query"]] if options["query"] else []
+        if options["query_file"]:
+            with open(options["query_file"], encoding="utf-8") as f:
+                queries.extend(
+                    q for line in f if (q := line.strip()) and not q.startswith("#")
+                )
+            if "Search" not in list_methods:
+                list_methods.append("Search")
+
+        if not list_methods:
+            raise CommandError(
+                "You should pass at least one list method with '-lm' kwarg "
+                "or queries to search with '--query-file' kwarg."
+            )
+
+        sources = []
+        for list_method in list_methods:
+            if list_method == "Search":
+                if not queries:
+                    raise CommandError(
+                        "You should pass query to search when using 'Search' list method."
+                    )
+                for query in dict.fromkeys(queries):
+                    list_kwargs = {"query": query, "max_count": options["max_count"]}
+                    if options["year"]:
+                        list_kwargs["year"] = options["year"]
+                    sources.append((list_method, list_kwargs))
+            elif list_method == "Trending":
+                sources.append(
+                    (
+                        list_method,
+                        {
+                            "time_window": options["time_window"],
+                            "max_count": options["max_count"],
+                        },
+                    )
+                )
+            else:
+                sources.append((list_method, {"max_count": options["max_count"]}))
+        return sources
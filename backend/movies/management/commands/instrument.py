@@ -0,0 +1,62 @@
+import argparse
+import json
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from instrumentation import Registry, registry
+
+
+class Command(BaseCommand):
+    help = (
+        "Run another management command w/ instrumentation enabled & export its spans."
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "-f",
+            "--format",
+            choices=["json", "prometheus"],
+            default="json",
+            help="choose format to export span histograms in",
+        )
+        parser.add_argument(
+            "-o",
+            "--output",
+            help="path to write exported metrics into (defaults to stdout)",
+        )
+        parser.add_argument(
+            "command_args",
+            nargs=argparse.REMAINDER,
+            metavar="command ...",
+            help="management command to run & its arguments "
+            "(ex. crawlmovies -lm Popular -dm TMDB -c 20)",
+        )
+
+    def handle(self, *args, **options):
+        if not options["command_args"]:
+            raise CommandError("You should pass a management command to instrument.")
+
+        command, *command_args = options["command_args"]
+        registry.reset()
+        registry.enable()
+        try:
+            call_command(command, *command_args)
+        finally:
+            registry.disable()
+
+        snapshot = registry.snapshot()
+        if options["format"] == "prometheus":
+            exported = Registry.to_prometheus(snapshot)
+        else:
+            exported = json.dumps(snapshot, indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                f.write(exported)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{len(snapshot)} span histograms written: {options['output']}"
+                )
+            )
+        else:
+            self.stdout.write(exported)
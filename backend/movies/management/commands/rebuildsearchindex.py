@@ -0,0 +1,33 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+
+from ...search import search_indexes
+
+
+class Command(BaseCommand):
+    help = "Rebuild full-text search indexes of movies & persons in bulk."
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "--install",
+            action="store_true",
+            help="(re)create missing index tables & sync triggers first "
+            "(ex. after a migration remaking movies or persons table)",
+        )
+
+    def handle(self, *args, **options):
+        for index in search_indexes:
+            started = perf_counter()
+            with transaction.atomic():
+                if options["install"]:
+                    index.install()
+                index.rebuild()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{index.table} rebuilt from "
+                    f"{index.model._default_manager.count()} rows "
+                    f"in {perf_counter() - started:.2f}s"
+                )
+            )
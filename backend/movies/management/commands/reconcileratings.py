@@ -0,0 +1,43 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...aggregates import reconcile_rating_aggregates
+
+
+class Command(BaseCommand):
+    help = "Check rating aggregates of movies against ratings & rebuild drifted ones."
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="only report movies w/ drifted aggregates (failing if any)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="number of movies rebuilt per UPDATE",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("'--batch-size' should be positive.")
+
+        started = perf_counter()
+        drifted = reconcile_rating_aggregates(
+            fix=not options["check"], batch_size=options["batch_size"]
+        )
+        elapsed = perf_counter() - started
+        if drifted and options["check"]:
+            raise CommandError(
+                f"{len(drifted)} movies w/ drifted rating aggregates "
+                f"(ex. {', '.join(map(str, drifted[:10]))})"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(drifted)} movies w/ drifted rating aggregates "
+                f"{'found' if options['check'] else 'rebuilt'} in {elapsed:.2f}s"
+            )
+        )
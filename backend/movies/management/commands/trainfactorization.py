@@ -0,0 +1,107 @@
+import os
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ... import factorization
+
+
+class Command(BaseCommand):
+    help = (
+        "Train user & movie factors of ratings by ALS & store them for predictions "
+        "(or benchmark training on synthetic ratings w/ '--synthetic')."
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "-f", "--factors", type=int, default=16, help="number of latent factors"
+        )
+        parser.add_argument(
+            "--regularization",
+            type=float,
+            default=0.05,
+            help="L2 penalty per rating of each user & movie",
+        )
+        parser.add_argument(
+            "-i", "--iterations", type=int, default=10, help="number of ALS sweeps"
+        )
+        parser.add_argument(
+            "--holdout",
+            type=float,
+            default=0.0,
+            help="fraction of ratings held out of training to report RMSE of",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--synthetic",
+            type=int,
+            metavar="N_RATINGS",
+            help="train on N synthetic ratings (of N/50 users & N/200 movies) "
+            "instead of rating table, w/o storing factors",
+        )
+
+    def handle(self, *args, **options):
+        if factorization.np is None:
+            raise CommandError(
+                "You should install NumPy & SciPy to train matrix factorization."
+            )
+        if options["factors"] < 1 or options["iterations"] < 1:
+            raise CommandError("Both '--factors' & '--iterations' should be positive.")
+        if not 0 <= options["holdout"] < 1:
+            raise CommandError("'--holdout' should be in [0, 1).")
+        np = factorization.np
+
+        if n_ratings := options["synthetic"]:
+            users, movies, scores = factorization.synthetic_ratings(
+                n_ratings,
+                n_users=max(n_ratings // 50, 1),
+                n_movies=max(n_ratings // 200, 1),
+                seed=options["seed"],
+            )
+        else:
+            users, movies, scores = factorization.load_ratings()
+        if not len(scores):
+            raise CommandError("No ratings to train on.")
+
+        held_out = (
+            np.random.default_rng(options["seed"]).random(len(scores))
+            < options["holdout"]
+        )
+        train = ~held_out
+        started = perf_counter()
+        model = factorization.train_als(
+            users[train],
+            movies[train],
+            scores[train],
+            factors=options["factors"],
+            regularization=options["regularization"],
+            iterations=options["iterations"],
+            seed=options["seed"],
+        )
+        elapsed = perf_counter() - started
+        model.meta["train_rmse"] = factorization.rmse(
+            model, users[train], movies[train], scores[train]
+        )
+        self.stdout.write(
+            f"Trained on {train.sum()} ratings of {len(model.user_ids)} users & "
+            f"{len(model.movie_ids)} movies in {elapsed:.2f}s "
+            f"(train RMSE {model.meta['train_rmse']:.4f})"
+        )
+        if held_out.any():
+            model.meta["holdout_rmse"] = factorization.rmse(
+                model, users[held_out], movies[held_out], scores[held_out]
+            )
+            baseline = float(
+                np.sqrt(np.mean((scores[held_out] - model.meta["mean"]) ** 2))
+            )
+            self.stdout.write(
+                f"Holdout RMSE {model.meta['holdout_rmse']:.4f} on {held_out.sum()} "
+                f"ratings (global mean baseline {baseline:.4f})"
+            )
+
+        if options["synthetic"]:
+            return
+        os.makedirs(settings.FACTORIZATION_DIR, exist_ok=True)
+        path = model.save(settings.FACTORIZATION_DIR)
+        self.stdout.write(self.style.SUCCESS(f"Factors stored in {path}"))
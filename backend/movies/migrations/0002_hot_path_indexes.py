@@ -0,0 +1,76 @@
+# Generated by Django 4.0.6 on 2026-10-19 01:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movies", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="credit",
+            index=models.Index(fields=["movie", "job"], name="credit_movie_job_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="credit",
+            index=models.Index(fields=["person", "job"], name="credit_person_job_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="rating",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="rating_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rating",
+            index=models.Index(
+                fields=["movie", "-created_at", "-id"], name="rating_movie_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rating",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"], name="rating_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rating",
+            index=models.Index(
+                fields=["movie", "score"], name="rating_movie_score_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rating",
+            index=models.Index(
+                fields=["score", "-created_at", "-id"], name="rating_score_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="review_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["movie", "-created_at", "-id"], name="review_movie_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"], name="review_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["has_spoiler", "-created_at", "-id"],
+                name="review_spoiler_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.0.6 on 2026-10-19 01:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movies", "0002_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="movie",
+            index=models.Index(
+                fields=["-release_date", "-id"], name="movie_release_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="movie",
+            index=models.Index(
+                fields=["production_year", "-release_date", "-id"],
+                name="movie_year_release_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="movie",
+            index=models.Index(
+                fields=["film_rating", "-release_date", "-id"],
+                name="movie_rating_release_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,90 @@
+from django.db import migrations, models
+
+MOVIE_COLUMNS = "title, original_title, synopsys"
+MOVIE_NEW = "new.id, new.title, new.original_title, new.synopsys"
+MOVIE_OLD = "old.id, old.title, old.original_title, old.synopsys"
+PERSON_COLUMNS = "name, en_name"
+PERSON_NEW = "new.id, new.name, new.en_name"
+PERSON_OLD = "old.id, old.name, old.en_name"
+
+
+def fts_sql(table: str, content_table: str, columns: str, new: str, old: str):
+    insert_new = f"INSERT INTO {table}(rowid, {columns}) VALUES ({new});"
+    delete_old = (
+        f"INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', {old});"
+    )
+    return [
+        f"CREATE VIRTUAL TABLE {table} USING fts5({columns}, "
+        f"content='{content_table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER {table}_ai AFTER INSERT ON {content_table} "
+        f"BEGIN {insert_new} END",
+        f"CREATE TRIGGER {table}_ad AFTER DELETE ON {content_table} "
+        f"BEGIN {delete_old} END",
+        f"CREATE TRIGGER {table}_au AFTER UPDATE OF {columns} ON {content_table} "
+        f"BEGIN {delete_old} {insert_new} END",
+        f"INSERT INTO {table}({table}) VALUES ('rebuild')",
+    ]
+
+
+def fts_reverse_sql(table: str):
+    return [
+        f"DROP TRIGGER {table}_ai",
+        f"DROP TRIGGER {table}_ad",
+        f"DROP TRIGGER {table}_au",
+        f"DROP TABLE {table}",
+    ]
+
+
+def on_sqlite(statements: list[str]):
+    """
+    RunPython code executing statements on SQLite only (FTS5 tables & trigger syntax are SQLite's)
+    """
+
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "sqlite":
+            for statement in statements:
+                schema_editor.execute(statement, params=None)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movies", "0003_movie_browse_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            on_sqlite(
+                fts_sql(
+                    "movies_movie_fts",
+                    "movies_movie",
+                    MOVIE_COLUMNS,
+                    MOVIE_NEW,
+                    MOVIE_OLD,
+                )
+            ),
+            on_sqlite(fts_reverse_sql("movies_movie_fts")),
+        ),
+        migrations.RunPython(
+            on_sqlite(
+                fts_sql(
+                    "movies_person_fts",
+                    "movies_person",
+                    PERSON_COLUMNS,
+                    PERSON_NEW,
+                    PERSON_OLD,
+                )
+            ),
+            on_sqlite(fts_reverse_sql("movies_person_fts")),
+        ),
+        migrations.AddIndex(
+            model_name="movie",
+            index=models.Index(fields=["title"], name="movie_title_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="person",
+            index=models.Index(fields=["name"], name="person_name_idx"),
+        ),
+    ]
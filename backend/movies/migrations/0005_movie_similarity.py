@@ -0,0 +1,58 @@
+# Generated by Django 4.0.6 on 2026-10-19 02:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movies", "0004_search_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MovieSimilarity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                (
+                    "movie",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similarities",
+                        to="movies.movie",
+                    ),
+                ),
+                (
+                    "neighbor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="movies.movie",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="moviesimilarity",
+            index=models.Index(
+                fields=["movie", "-score", "neighbor"],
+                name="similarity_movie_score_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="moviesimilarity",
+            constraint=models.UniqueConstraint(
+                fields=("movie", "neighbor"), name="one_similarity_per_movie_pair"
+            ),
+        ),
+    ]
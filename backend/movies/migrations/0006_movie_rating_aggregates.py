@@ -0,0 +1,141 @@
+# Generated by Django 4.0.6 on 2026-10-19 02:23
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+SCORES = [0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0]
+
+FTS_COLUMNS = "title, original_title, synopsys"
+FTS_NEW = "new.id, new.title, new.original_title, new.synopsys"
+FTS_OLD = "old.id, old.title, old.original_title, old.synopsys"
+FTS_INSERT_NEW = (
+    f"INSERT INTO movies_movie_fts(rowid, {FTS_COLUMNS}) VALUES ({FTS_NEW});"
+)
+FTS_DELETE_OLD = (
+    f"INSERT INTO movies_movie_fts(movies_movie_fts, rowid, {FTS_COLUMNS}) "
+    f"VALUES ('delete', {FTS_OLD});"
+)
+
+
+def on_sqlite(statements: list[str]):
+    """
+    RunPython code executing statements on SQLite only (triggers syncing FTS5 table are SQLite's)
+    """
+
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "sqlite":
+            for statement in statements:
+                schema_editor.execute(statement, params=None)
+
+    return run
+
+
+def backfill_rating_aggregates(apps, schema_editor):
+    Movie = apps.get_model("movies", "Movie")
+    Rating = apps.get_model("movies", "Rating")
+    ratings = Rating.objects.filter(movie=OuterRef("pk")).order_by().values("movie")
+    aggregates = {
+        "rating_count": Count("id"),
+        "rating_sum": Sum("score"),
+        **{
+            "rating_count_{:.1f}".format(score).replace(".", "_"): Count(
+                "id", filter=Q(score=score)
+            )
+            for score in SCORES
+        },
+    }
+    Movie.objects.filter(ratings__isnull=False).distinct().update(
+        **{
+            field: Coalesce(
+                Subquery(ratings.annotate(value=aggregate).values("value")),
+                Value(0, output_field=Movie._meta.get_field(field)),
+            )
+            for field, aggregate in aggregates.items()
+        }
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movies", "0005_movie_similarity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="movie",
+            name="rating_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="rating_sum",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="rating_count_0_5",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="rating_count_1_0",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="rating_count_1_5",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="rating_count_2_0",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="rating_count_2_5",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="rating_count_3_0",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="rating_count_3_5",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="rating_count_4_0",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="rating_count_4_5",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="rating_count_5_0",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_aggregates, migrations.RunPython.noop),
+        # SQLite remakes movie table to add fields, dropping its full-text index triggers
+        migrations.RunPython(
+            on_sqlite(
+                [
+                    "CREATE TRIGGER IF NOT EXISTS movies_movie_fts_ai AFTER INSERT "
+                    f"ON movies_movie BEGIN {FTS_INSERT_NEW} END",
+                    "CREATE TRIGGER IF NOT EXISTS movies_movie_fts_ad AFTER DELETE "
+                    f"ON movies_movie BEGIN {FTS_DELETE_OLD} END",
+                    "CREATE TRIGGER IF NOT EXISTS movies_movie_fts_au AFTER UPDATE "
+                    f"OF {FTS_COLUMNS} ON movies_movie BEGIN {FTS_DELETE_OLD} {FTS_INSERT_NEW} END",
+                ]
+            ),
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 4.0.6 on 2026-10-19 02:42
+
+from django.db import migrations, models
+
+
+def log_sql(table: str, pk: str) -> str:
+    return (
+        "INSERT INTO movies_autocompletechange(table_name, object_id, changed_at) "
+        f"VALUES ('{table}', {pk}, strftime('%Y-%m-%d %H:%M:%f', 'now'));"
+    )
+
+
+def change_log_sql(table: str, columns: str, related_table: str, fk: str):
+    trigger = f"{table}_autocomplete"
+    related_trigger = f"{related_table}_autocomplete"
+    return [
+        f"CREATE TRIGGER {trigger}_ai AFTER INSERT ON {table} "
+        f"BEGIN {log_sql(table, 'new.id')} END",
+        f"CREATE TRIGGER {trigger}_ad AFTER DELETE ON {table} "
+        f"BEGIN {log_sql(table, 'old.id')} END",
+        f"CREATE TRIGGER {trigger}_au AFTER UPDATE OF {columns} ON {table} "
+        f"BEGIN {log_sql(table, 'new.id')} END",
+        f"CREATE TRIGGER {related_trigger}_ai AFTER INSERT ON {related_table} "
+        f"BEGIN {log_sql(table, f'new.{fk}')} END",
+        f"CREATE TRIGGER {related_trigger}_ad AFTER DELETE ON {related_table} "
+        f"BEGIN {log_sql(table, f'old.{fk}')} END",
+    ]
+
+
+def change_log_reverse_sql(table: str, related_table: str):
+    return [
+        f"DROP TRIGGER {table}_autocomplete_ai",
+        f"DROP TRIGGER {table}_autocomplete_ad",
+        f"DROP TRIGGER {table}_autocomplete_au",
+        f"DROP TRIGGER {related_table}_autocomplete_ai",
+        f"DROP TRIGGER {related_table}_autocomplete_ad",
+    ]
+
+
+def on_sqlite(statements: list[str]):
+    """
+    RunPython code executing statements on SQLite only (trigger syntax & strftime() are SQLite's)
+    """
+
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "sqlite":
+            for statement in statements:
+                schema_editor.execute(statement, params=None)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movies", "0007_feeds"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AutocompleteChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("table_name", models.CharField(max_length=64)),
+                ("object_id", models.BigIntegerField()),
+                ("changed_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.RunPython(
+            on_sqlite(
+                change_log_sql(
+                    "movies_movie",
+                    "title, production_year",
+                    "movies_rating",
+                    "movie_id",
+                )
+            ),
+            on_sqlite(change_log_reverse_sql("movies_movie", "movies_rating")),
+        ),
+        migrations.RunPython(
+            on_sqlite(
+                change_log_sql(
+                    "movies_person", "name, en_name", "movies_credit", "person_id"
+                )
+            ),
+            on_sqlite(change_log_reverse_sql("movies_person", "movies_credit")),
+        ),
+    ]
@@ -1,6 +1,30 @@
+from collections import defaultdict
+from typing import Any, Optional
+
 from abstract_models import CreateAndUpdateModel, TimestampModel
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import F
+
+SCORE_CHOICES = [
+    (0.5, "최악이에요"),
+    (1.0, "싫어요"),
+    (1.5, "재미없어요"),
+    (2.0, "별로예요"),
+    (2.5, "부족해요"),
+    (3.0, "보통이에요"),
+    (3.5, "볼만해요"),
+    (4.0, "재미있어요"),
+    (4.5, "훌륭해요!"),
+    (5.0, "최고예요!"),
+]
+
+
+def histogram_field(score: float) -> str:
+    """
+    Name of movie field counting ratings of score (ex. 3.5 -> rating_count_3_5)
+    """
+    return "rating_count_{:.1f}".format(score).replace(".", "_")
 
 
 class Movie(models.Model):
@@ -26,6 +50,68 @@ class Movie(models.Model):
         max_length=3, choices=FILM_RATING_CHOICES, blank=True
     )
 
+    # rating aggregates, updated along w/ ratings by rating API
+    # (reconciled w/ rating table by `reconcileratings` command)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.FloatField(default=0)
+    rating_count_0_5 = models.PositiveIntegerField(default=0)
+    rating_count_1_0 = models.PositiveIntegerField(default=0)
+    rating_count_1_5 = models.PositiveIntegerField(default=0)
+    rating_count_2_0 = models.PositiveIntegerField(default=0)
+    rating_count_2_5 = models.PositiveIntegerField(default=0)
+    rating_count_3_0 = models.PositiveIntegerField(default=0)
+    rating_count_3_5 = models.PositiveIntegerField(default=0)
+    rating_count_4_0 = models.PositiveIntegerField(default=0)
+    rating_count_4_5 = models.PositiveIntegerField(default=0)
+    rating_count_5_0 = models.PositiveIntegerField(default=0)
+
+    histogram_fields = tuple(histogram_field(score) for score, _ in SCORE_CHOICES)
+    rating_aggregate_fields = ("rating_count", "rating_sum", *histogram_fields)
+
+    @property
+    def rating_average(self) -> Optional[float]:
+        if self.rating_count:
+            return round(self.rating_sum / self.rating_count, 2)
+
+    @property
+    def rating_histogram(self) -> dict[str, int]:
+        return {
+            str(score): getattr(self, field)
+            for (score, _), field in zip(SCORE_CHOICES, self.histogram_fields)
+        }
+
+    @staticmethod
+    def rating_changes(
+        added: Optional[float] = None, removed: Optional[float] = None
+    ) -> dict[str, Any]:
+        """
+        Update expressions of rating aggregates w/ a score added and/or removed
+          (relative to stored values, so that concurrent updates add up)
+        """
+        deltas = defaultdict(int)
+        for score, sign in ((added, 1), (removed, -1)):
+            if score is not None:
+                deltas["rating_count"] += sign
+                deltas["rating_sum"] += sign * score
+                deltas[histogram_field(score)] += sign
+        return {field: F(field) + delta for field, delta in deltas.items() if delta}
+
+    class Meta:
+        # keyset pagination & filters of browse API
+        indexes = [
+            models.Index(fields=["-release_date", "-id"], name="movie_release_idx"),
+            models.Index(
+                fields=["production_year", "-release_date", "-id"],
+                name="movie_year_release_idx",
+            ),
+            models.Index(
+                fields=["film_rating", "-release_date", "-id"],
+                name="movie_rating_release_idx",
+            ),
+            # covers search by terms too short for full-text index
+            models.Index(fields=["title"], name="movie_title_idx"),
+        ]
+
 
 class Person(models.Model):
     tmdb_id = models.IntegerField(unique=True, null=True, blank=True)
@@ -38,6 +124,29 @@ class Person(models.Model):
 
     filmography = models.ManyToManyField(Movie, through="Credit", related_name="crews")
 
+    class Meta:
+        indexes = [
+            # covers search by terms too short for full-text index
+            models.Index(fields=["name"], name="person_name_idx"),
+        ]
+
+    # shown in movie detail (cached until any of them changes)
+    detail_fields = ("name", "avatar_url", "biography")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    @property
+    def detail_changed(self) -> bool:
+        loaded = getattr(self, "_loaded_values", {})
+        return any(
+            loaded.get(f, None) != getattr(self, f) or f not in loaded
+            for f in self.detail_fields
+        )
+
 
 class Credit(models.Model):
     DIRECTOR = ("director", "감독")
@@ -57,6 +166,12 @@ class Credit(models.Model):
     cameo_type = models.CharField(max_length=7, choices=CAMEO_CHOICES, blank=True)
     role_name = models.CharField(max_length=200, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["movie", "job"], name="credit_movie_job_idx"),
+            models.Index(fields=["person", "job"], name="credit_person_job_idx"),
+        ]
+
 
 class Country(models.Model):
     # follows ISO 3166-1
@@ -124,20 +239,7 @@ User = get_user_model()
 class Rating(CreateAndUpdateModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="ratings")
     movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name="ratings")
-    score = models.FloatField(
-        choices=[
-            (0.5, "최악이에요"),
-            (1.0, "싫어요"),
-            (1.5, "재미없어요"),
-            (2.0, "별로예요"),
-            (2.5, "부족해요"),
-            (3.0, "보통이에요"),
-            (3.5, "볼만해요"),
-            (4.0, "재미있어요"),
-            (4.5, "훌륭해요!"),
-            (5.0, "최고예요!"),
-        ]
-    )
+    score = models.FloatField(choices=SCORE_CHOICES)
 
     class Meta:
         constraints = [
@@ -145,6 +247,20 @@ class Rating(CreateAndUpdateModel):
                 fields=["user", "movie"], name="one_rating_per_user_movie"
             )
         ]
+        # keyset pagination (w/ index_key grouping) & filters of list API
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="rating_created_idx"),
+            models.Index(
+                fields=["movie", "-created_at", "-id"], name="rating_movie_created_idx"
+            ),
+            models.Index(
+                fields=["user", "-created_at", "-id"], name="rating_user_created_idx"
+            ),
+            models.Index(fields=["movie", "score"], name="rating_movie_score_idx"),
+            models.Index(
+                fields=["score", "-created_at", "-id"], name="rating_score_created_idx"
+            ),
+        ]
 
 
 class Review(CreateAndUpdateModel):
@@ -159,6 +275,20 @@ class Review(CreateAndUpdateModel):
                 fields=["user", "movie"], name="one_review_per_user_movie"
             )
         ]
+        # keyset pagination (w/ index_key grouping) & filters of list API
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="review_created_idx"),
+            models.Index(
+                fields=["movie", "-created_at", "-id"], name="review_movie_created_idx"
+            ),
+            models.Index(
+                fields=["user", "-created_at", "-id"], name="review_user_created_idx"
+            ),
+            models.Index(
+                fields=["has_spoiler", "-created_at", "-id"],
+                name="review_spoiler_created_idx",
+            ),
+        ]
 
 
 class Wishlist(TimestampModel):
@@ -173,6 +303,10 @@ class Wishlist(TimestampModel):
                 fields=["user", "movie"], name="one_wishlist_per_user_movie"
             )
         ]
+        # latest wishlists of a user pulled into followers' feeds
+        indexes = [
+            models.Index(fields=["user", "-timestamp"], name="wishlist_user_time_idx"),
+        ]
 
 
 class Blocklist(TimestampModel):
@@ -215,3 +349,86 @@ class PersonLike(TimestampModel):
                 fields=["user", "person"], name="one_like_per_user_person"
             )
         ]
+
+
+class MovieSimilarity(models.Model):
+    # top-k neighbours of each movie by item-item CF (see movies.recommendations)
+    movie = models.ForeignKey(
+        Movie, on_delete=models.CASCADE, related_name="similarities"
+    )
+    neighbor = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["movie", "neighbor"], name="one_similarity_per_movie_pair"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["movie", "-score", "neighbor"],
+                name="similarity_movie_score_idx",
+            ),
+        ]
+
+
+class FeedEntry(models.Model):
+    """
+    Activity (rating, review or wishlist) of a followed user in owner's feed
+      (compact: activity is referred by kind & pk, rendered when feed is read)
+    """
+
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="feed_entries"
+    )
+    actor = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    RATING = ("rating", "평가")
+    REVIEW = ("review", "코멘트")
+    WISHLIST = ("wishlist", "보고싶어요")
+    KIND_CHOICES = [RATING, REVIEW, WISHLIST]
+    kind = models.CharField(max_length=8, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name="+")
+    created_at = models.DateTimeField()  # of activity
+
+    class Meta:
+        constraints = [
+            # also looks up entries of an activity to retract
+            models.UniqueConstraint(
+                fields=["kind", "object_id", "owner"], name="one_entry_per_activity"
+            )
+        ]
+        indexes = [
+            # keyset pagination of feed
+            models.Index(
+                fields=["owner", "-created_at", "-id"], name="feed_owner_created_idx"
+            ),
+            # latest pulled entry & unfollow cleanup
+            models.Index(
+                fields=["owner", "actor", "-created_at"], name="feed_owner_actor_idx"
+            ),
+        ]
+
+
+class FeedPullActor(models.Model):
+    """
+    User w/ too many followers to push activities to, whose feed entries are
+      pulled by followers when reading their feeds instead
+    """
+
+    actor = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="feed_pull"
+    )
+
+
+class AutocompleteChange(models.Model):
+    """
+    Row of a table indexed by autocomplete inserted, renamed, deleted or w/ its
+      popularity changed, logged by triggers for indexes to refresh it from
+      (see `movies.autocomplete.PrefixIndex.ddl`)
+    """
+
+    table_name = models.CharField(max_length=64)
+    object_id = models.BigIntegerField()
+    changed_at = models.DateTimeField(auto_now_add=True, db_index=True)
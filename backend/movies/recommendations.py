@@ -0,0 +1,188 @@
+"""
+Item-item collaborative filtering over ratings
+  - similarity of 2 movies: cosine of their rating vectors centered by each user's
+    mean rating (adjusted cosine), kept only if rated together by `min_support` users
+  - vectorized w/ NumPy & SciPy sparse matrices if installed (optional dependencies),
+    else computed in pure Python (fine for small catalogs)
+"""
+import heapq
+from collections import defaultdict
+from itertools import combinations
+from typing import Any, Iterable, Iterator, Optional
+
+from django.db import transaction
+
+from .models import Blocklist, MovieSimilarity, Rating
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = sparse = None
+
+# "보통이에요", ratings above it count for & below it against similar movies
+NEUTRAL_SCORE = 3.0
+
+
+def load_ratings() -> tuple[list[int], list[int], list[float]]:
+    users, movies, scores = [], [], []
+    for user_id, movie_id, score in Rating.objects.values_list(
+        "user_id", "movie_id", "score"
+    ).iterator(chunk_size=10000):
+        users.append(user_id)
+        movies.append(movie_id)
+        scores.append(score)
+    return users, movies, scores
+
+
+def top_neighbors_numpy(
+    users: list[int],
+    movies: list[int],
+    scores: list[float],
+    k: int,
+    min_support: int,
+    block_size: int = 1024,
+) -> Iterator[tuple[int, list[tuple[int, float]]]]:
+    user_ids, user_index = np.unique(np.asarray(users), return_inverse=True)
+    movie_ids, movie_index = np.unique(np.asarray(movies), return_inverse=True)
+    scores = np.asarray(scores, dtype=np.float64)
+    means = np.bincount(user_index, weights=scores) / np.bincount(user_index)
+    shape = (len(user_ids), len(movie_ids))
+
+    centered = sparse.csc_matrix(
+        (scores - means[user_index], (user_index, movie_index)), shape=shape
+    )
+    rated = sparse.csc_matrix(
+        (np.ones_like(scores), (user_index, movie_index)), shape=shape
+    )
+    norms = np.sqrt(np.asarray(centered.multiply(centered).sum(axis=0)).ravel())
+    inverse_norms = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+    centered_t, rated_t = centered.T.tocsr(), rated.T.tocsr()
+
+    for start in range(0, len(movie_ids), block_size):
+        block = slice(start, min(start + block_size, len(movie_ids)))
+        supported = (rated_t @ rated[:, block]) >= min_support
+        similarities = (
+            sparse.diags(inverse_norms)
+            @ (centered_t @ centered[:, block]).multiply(supported)
+            @ sparse.diags(inverse_norms[block])
+        ).tocsc()
+        for j in range(block.stop - block.start):
+            lo, hi = similarities.indptr[j], similarities.indptr[j + 1]
+            rows, values = similarities.indices[lo:hi], similarities.data[lo:hi]
+            keep = (values > 0) & (rows != start + j)
+            rows, values = rows[keep], values[keep]
+            if len(values) > k:
+                top = np.argpartition(-values, k)[:k]
+                rows, values = rows[top], values[top]
+            order = np.lexsort((movie_ids[rows], -values))
+            yield int(movie_ids[start + j]), [
+                (int(movie_ids[rows[i]]), float(values[i])) for i in order
+            ]
+
+
+def top_neighbors_python(
+    users: list[int], movies: list[int], scores: list[float], k: int, min_support: int
+) -> Iterator[tuple[int, list[tuple[int, float]]]]:
+    rated_by = defaultdict(list)
+    for user_id, movie_id, score in zip(users, movies, scores):
+        rated_by[user_id].append((movie_id, score))
+
+    norms, dots, supports = defaultdict(float), defaultdict(float), defaultdict(int)
+    for rated in rated_by.values():
+        mean = sum(score for _, score in rated) / len(rated)
+        centered = sorted((movie_id, score - mean) for movie_id, score in rated)
+        for movie_id, c in centered:
+            norms[movie_id] += c * c
+        for (m1, c1), (m2, c2) in combinations(centered, 2):
+            dots[m1, m2] += c1 * c2
+            supports[m1, m2] += 1
+
+    similar = defaultdict(list)
+    for (m1, m2), dot in dots.items():
+        if supports[m1, m2] >= min_support and dot > 0:
+            score = dot / (norms[m1] * norms[m2]) ** 0.5
+            similar[m1].append((m2, score))
+            similar[m2].append((m1, score))
+    for movie_id in sorted(norms):
+        yield movie_id, heapq.nsmallest(
+            k, similar[movie_id], key=lambda neighbor: (-neighbor[1], neighbor[0])
+        )
+
+
+def compute_similarities(
+    k: int = 50, min_support: int = 2, vectorized: Optional[bool] = None
+) -> int:
+    """
+    Replace stored top k neighbours of every rated movie (returns number of rows)
+    """
+    if vectorized is None:
+        vectorized = np is not None
+    top_neighbors = top_neighbors_numpy if vectorized else top_neighbors_python
+
+    users, movies, scores = load_ratings()
+    with transaction.atomic():
+        MovieSimilarity.objects.all().delete()
+        if not scores:
+            return 0
+        created = MovieSimilarity.objects.bulk_create(
+            (
+                MovieSimilarity(movie_id=movie_id, neighbor_id=neighbor_id, score=score)
+                for movie_id, neighbors in top_neighbors(
+                    users, movies, scores, k, min_support
+                )
+                for neighbor_id, score in neighbors
+            ),
+            batch_size=5000,
+        )
+    return len(created)
+
+
+def similar_movies(movie_id: Any, limit: int) -> list[tuple[int, float]]:
+    """
+    (neighbor pk, similarity) in O(limit) w/ index on (movie, -score, neighbor)
+    """
+    return list(
+        MovieSimilarity.objects.filter(movie_id=movie_id)
+        .order_by("-score", "neighbor_id")
+        .values_list("neighbor_id", "score")[:limit]
+    )
+
+
+def recommend(user_id: Any, limit: int) -> list[tuple[int, float]]:
+    """
+    (movie pk, score) of top unrated & unblocked neighbours of movies rated by user
+      score: sum of similarity * (rating - NEUTRAL_SCORE) over rated movies
+    """
+    ratings = dict(
+        Rating.objects.filter(user_id=user_id).values_list("movie_id", "score")
+    )
+    if not ratings:
+        return []
+    excluded = set(ratings).union(
+        Blocklist.objects.filter(user_id=user_id).values_list("movie_id", flat=True)
+    )
+
+    scores = defaultdict(float)
+    for movie_id, neighbor_id, similarity in MovieSimilarity.objects.filter(
+        movie_id__in=ratings
+    ).values_list("movie_id", "neighbor_id", "score"):
+        if neighbor_id not in excluded:
+            scores[neighbor_id] += similarity * (ratings[movie_id] - NEUTRAL_SCORE)
+    return heapq.nsmallest(
+        limit,
+        ((movie_id, score) for movie_id, score in scores.items() if score > 0),
+        key=lambda item: (-item[1], item[0]),
+    )
+
+
+def ranked_movies(ranked: Iterable[tuple[int, float]], queryset) -> list[Any]:
+    """
+    Movies (from queryset) in ranked order w/ their score set as `score` attribute
+    """
+    ranked = list(ranked)
+    movies = queryset.in_bulk([pk for pk, _ in ranked])
+    for pk, score in ranked:
+        if pk in movies:
+            movies[pk].score = score
+    return [movies[pk] for pk, _ in ranked if pk in movies]
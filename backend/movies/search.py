@@ -0,0 +1,172 @@
+import re
+from typing import Any, Optional, Type
+
+from django.db import connection, models
+
+from .autocomplete import autocompleter
+from .models import Movie, Person
+
+MIN_TERM_LENGTH = 3  # shortest substring a trigram index can look up
+
+
+class FullTextIndex:
+    """
+    SQLite FTS5 index (trigram tokenized) over text columns of a model's table
+      - external content table: only the index is stored, rows are read from model table
+      - kept in sync on writes by triggers (created by migration, see `install()`)
+      - trigram tokenizer matches any substring of 3+ characters regardless of
+        language (Korean titles & names have no word boundaries to tokenize by);
+        shorter terms are looked up in autocomplete prefix index (see `search()`)
+    """
+
+    def __init__(
+        self,
+        model: Type[models.Model],
+        columns: tuple[str, ...],
+        weights: tuple[float, ...],
+        prefix_index: str,
+    ):
+        self.model = model
+        self.columns = columns
+        self.weights = weights  # bm25 weight of each column
+        self.prefix_index = prefix_index  # name of autocompleter's index of model
+
+    @property
+    def table(self) -> str:
+        return f"{self.model._meta.db_table}_fts"
+
+    @property
+    def content_table(self) -> str:
+        return self.model._meta.db_table
+
+    def ddl(self) -> list[str]:
+        """
+        Statements creating the index & triggers syncing it w/ content table
+          (SQLite drops triggers when it remakes a table, so `install()` after
+          a migration altering the content table, then `rebuild()`)
+        """
+        t, c = self.table, self.content_table
+        columns = ", ".join(self.columns)
+        new = ", ".join(f"new.{col}" for col in self.columns)
+        old = ", ".join(f"old.{col}" for col in self.columns)
+        delete_old = (
+            f"INSERT INTO {t}({t}, rowid, {columns}) VALUES ('delete', old.id, {old});"
+        )
+        insert_new = f"INSERT INTO {t}(rowid, {columns}) VALUES (new.id, {new});"
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {t} USING fts5({columns}, "
+            f"content='{c}', content_rowid='id', tokenize='trigram')",
+            f"CREATE TRIGGER IF NOT EXISTS {t}_ai AFTER INSERT ON {c} "
+            f"BEGIN {insert_new} END",
+            f"CREATE TRIGGER IF NOT EXISTS {t}_ad AFTER DELETE ON {c} "
+            f"BEGIN {delete_old} END",
+            f"CREATE TRIGGER IF NOT EXISTS {t}_au AFTER UPDATE OF {columns} ON {c} "
+            f"BEGIN {delete_old} {insert_new} END",
+        ]
+
+    def install(self):
+        with connection.cursor() as cursor:
+            for statement in self.ddl():
+                cursor.execute(statement)
+
+    def rebuild(self):
+        """
+        Re-index every row of content table in bulk & merge index b-trees
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')")
+            cursor.execute(
+                f"INSERT INTO {self.table}({self.table}) VALUES ('optimize')"
+            )
+
+    @staticmethod
+    def split_terms(query: str) -> tuple[list[str], list[str]]:
+        """
+        (terms to MATCH, terms too short for trigrams) of whitespace separated query
+        """
+        terms = [t for t in dict.fromkeys(query.split()) if t]
+        return (
+            [t for t in terms if len(t) >= MIN_TERM_LENGTH],
+            [t for t in terms if len(t) < MIN_TERM_LENGTH],
+        )
+
+    @staticmethod
+    def match_expression(terms: list[str]) -> Optional[str]:
+        """
+        FTS5 query matching rows containing every term (as quoted string, no syntax)
+        """
+        if terms:
+            return " AND ".join('"{}"'.format(t.replace('"', '""')) for t in terms)
+
+    @staticmethod
+    def like_pattern(term: str) -> str:
+        return "%{}%".format(re.sub(r"([\\%_])", r"\\\1", term))
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[int, float]]:
+        """
+        (pk, rank) of best matching rows, lower rank is better
+          - ranked by bm25 w/ column weights if any term can be matched by index
+            (short terms then filter matched rows only)
+          - else words starting w/ short terms are looked up in model's autocomplete
+            prefix index & ranked by popularity, as substrings shorter than
+            trigrams could only be matched by scanning the table
+          - prefix index only on other databases than SQLite (w/o FTS5 index)
+        """
+        match_terms, short_terms = self.split_terms(query)
+        if connection.vendor != "sqlite":
+            match_terms, short_terms = [], match_terms + short_terms
+        if not match_terms:
+            return self.search_prefixes(short_terms, limit) if short_terms else []
+
+        where, params = [f"{self.table} MATCH %s"], [self.match_expression(match_terms)]
+        for term in short_terms:
+            where.append(
+                "({})".format(
+                    " OR ".join(f"{col} LIKE %s ESCAPE '\\'" for col in self.columns)
+                )
+            )
+            params.extend([self.like_pattern(term)] * len(self.columns))
+        rank = "bm25({}, {})".format(
+            self.table, ", ".join(str(w) for w in self.weights)
+        )
+
+        sql = (
+            f"SELECT rowid, {rank} AS score FROM {self.table} "
+            f"WHERE {' AND '.join(where)} ORDER BY score, rowid LIMIT %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*params, limit])
+            return cursor.fetchall()
+
+    def search_prefixes(self, terms: list[str], limit: int) -> list[tuple[int, float]]:
+        autocompleter.ensure_fresh()
+        index = autocompleter.indexes[self.prefix_index]
+        docs = index.state.docs
+        return [
+            (pk, -docs[pk]["popularity"])
+            for pk in index.rank(index.lookup(terms), limit, docs)
+        ]
+
+    def search_queryset(
+        self, query: str, limit: int = 10, queryset: Optional[models.QuerySet] = None
+    ) -> list[Any]:
+        """
+        Best matching model instances (from `queryset`) in rank order
+        """
+        if not (ranked := self.search(query, limit)):
+            return []
+        queryset = self.model._default_manager if queryset is None else queryset
+        instances = queryset.in_bulk([pk for pk, _ in ranked])
+        return [instances[pk] for pk, _ in ranked if pk in instances]
+
+
+movie_search_index = FullTextIndex(
+    Movie,
+    columns=("title", "original_title", "synopsys"),
+    weights=(10.0, 5.0, 1.0),
+    prefix_index="movies",
+)
+person_search_index = FullTextIndex(
+    Person, columns=("name", "en_name"), weights=(1.0, 1.0), prefix_index="persons"
+)
+search_indexes = (movie_search_index, person_search_index)
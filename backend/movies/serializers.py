@@ -1,7 +1,15 @@
+from accounts.serializers import FollowUserSerializer
 from django.contrib.auth import get_user_model
-from rest_framework.fields import ChoiceField
+from rest_framework.fields import (
+    CharField,
+    ChoiceField,
+    DictField,
+    FloatField,
+    IntegerField,
+    URLField,
+)
 from rest_framework.relations import PrimaryKeyRelatedField
-from rest_framework.serializers import ModelSerializer
+from rest_framework.serializers import ModelSerializer, Serializer
 
 from serializers import QueryStringValidateMixin, UseIndexedListSerializerMixin
 
@@ -9,6 +17,7 @@ from .models import (
     Blocklist,
     Country,
     Credit,
+    FeedEntry,
     Genre,
     Movie,
     Person,
@@ -84,6 +93,9 @@ class MovieRetrieveSerializer(ModelSerializer):
             "running_time",
             "synopsys",
             "film_rating",
+            "rating_count",
+            "rating_average",
+            "rating_histogram",
             "countries",
             "genres",
             "credits",
@@ -99,6 +111,92 @@ class MovieRetrieveSerializer(ModelSerializer):
     poster_set = PosterRetrieveSerializer(many=True)
     still_set = StillRetrieveSerializer(many=True)
     video_set = VideoRetrieveSerializer(many=True)
+    rating_average = FloatField(read_only=True, allow_null=True)
+    rating_histogram = DictField(child=IntegerField(), read_only=True)
+
+
+class MovieListSerializer(QueryStringValidateMixin, ModelSerializer):
+    """
+    Slim movie card (w/ main poster annotated as `main_poster_url`) & its filters
+    """
+
+    genres = IntegerField(required=False, write_only=True)
+    countries = CharField(max_length=2, required=False, write_only=True)
+    production_year = IntegerField(required=False)
+    film_rating = ChoiceField(Movie.FILM_RATING_CHOICES, required=False)
+    main_poster_url = URLField(read_only=True)
+    rating_average = FloatField(read_only=True, allow_null=True)
+    rating_histogram = DictField(child=IntegerField(), read_only=True)
+
+    class Meta:
+        model = Movie
+        fields = [
+            "id",
+            "title",
+            "production_year",
+            "release_date",
+            "film_rating",
+            "main_poster_url",
+            "rating_count",
+            "rating_average",
+            "rating_histogram",
+            "genres",
+            "countries",
+        ]
+        read_only_fields = ["title", "release_date", "rating_count"]
+
+
+class RankedMovieSerializer(MovieListSerializer):
+    """
+    Movie card w/ its similarity or recommendation `score`
+    """
+
+    score = FloatField(read_only=True)
+
+    class Meta(MovieListSerializer.Meta):
+        fields = [*MovieListSerializer.Meta.fields, "score"]
+
+
+class FeedMovieSerializer(ModelSerializer):
+    class Meta:
+        model = Movie
+        fields = ["id", "title", "production_year"]
+        read_only_fields = fields
+
+
+class FeedEntrySerializer(ModelSerializer):
+    """
+    Feed entry w/ `activity` details set by `Feed.hydrate()`
+      (score of rating, comment of review, nothing of wishlist)
+    """
+
+    actor = FollowUserSerializer(read_only=True)
+    movie = FeedMovieSerializer(read_only=True)
+    activity = DictField(read_only=True)
+
+    class Meta:
+        model = FeedEntry
+        fields = ["id", "kind", "object_id", "created_at", "actor", "movie", "activity"]
+        read_only_fields = fields
+
+
+class PersonListSerializer(ModelSerializer):
+    class Meta:
+        model = Person
+        fields = ["id", "name", "en_name", "avatar_url"]
+        read_only_fields = fields
+
+
+class LimitQuerySerializer(QueryStringValidateMixin, Serializer):
+    limit = IntegerField(min_value=1, max_value=50, default=10)
+
+
+class SearchQuerySerializer(LimitQuerySerializer):
+    q = CharField(max_length=100)
+
+
+class AutocompleteQuerySerializer(SearchQuerySerializer):
+    limit = IntegerField(min_value=1, max_value=20, default=10)
 
 
 class RatingCreateSerializer(ModelSerializer):
@@ -0,0 +1,98 @@
+from functools import partial
+
+from accounts.models import Follow
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .caches import movie_detail_cache
+from .feeds import feed
+from .models import (
+    Credit,
+    FeedEntry,
+    Movie,
+    Person,
+    Poster,
+    Rating,
+    Review,
+    Still,
+    Video,
+    Wishlist,
+)
+
+
+@receiver(post_save, sender=Movie)
+@receiver(post_delete, sender=Movie)
+def invalidate_movie_detail(sender, instance: Movie, **kwargs):
+    movie_detail_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Credit)
+@receiver(post_delete, sender=Credit)
+@receiver(post_save, sender=Poster)
+@receiver(post_delete, sender=Poster)
+@receiver(post_save, sender=Still)
+@receiver(post_delete, sender=Still)
+@receiver(post_save, sender=Video)
+@receiver(post_delete, sender=Video)
+def invalidate_movie_detail_of_related(sender, instance, **kwargs):
+    movie_detail_cache.invalidate(instance.movie_id)
+
+
+@receiver(post_save, sender=Person)
+def invalidate_movie_detail_of_person(
+    sender, instance: Person, created: bool, **kwargs
+):
+    if not created and instance.detail_changed:  # new person has no credits yet
+        movie_detail_cache.invalidate(
+            *instance.credits_history.values_list("movie_id", flat=True).distinct()
+        )
+
+
+@receiver(m2m_changed, sender=Movie.countries.through)
+@receiver(m2m_changed, sender=Movie.genres.through)
+def invalidate_movie_detail_of_m2m(
+    sender, instance, action: str, reverse: bool, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        movie_detail_cache.invalidate(instance.pk)
+    elif action == "pre_clear":  # movies to be cleared from country or genre
+        movie_detail_cache.invalidate(*instance.movie_set.values_list("pk", flat=True))
+    else:
+        movie_detail_cache.invalidate(*pk_set)
+
+
+@receiver(post_save, sender=Rating)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Wishlist)
+def push_to_feeds(sender, instance, created: bool, **kwargs):
+    if created:  # updated ones are rendered up to date from entries
+        transaction.on_commit(partial(feed.push, feed.kind_of(sender), instance))
+
+
+@receiver(post_delete, sender=Rating)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Wishlist)
+def retract_from_feeds(sender, instance, **kwargs):
+    feed.retract(feed.kind_of(sender), instance.pk)
+
+
+@receiver(m2m_changed, sender=Follow)
+def sync_feeds_w_follows(
+    sender, instance, action: str, reverse: bool, pk_set, **kwargs
+):
+    """
+    `user.followings` changed (or `user.followers` if reverse)
+    """
+    if action in ("post_add", "post_remove"):
+        followers, followings = (
+            (pk_set, [instance.pk]) if reverse else ([instance.pk], pk_set)
+        )
+        if action == "post_add":
+            transaction.on_commit(partial(feed.follow, followers, followings))
+        else:
+            feed.unfollow(followers, followings)
+    elif action == "pre_clear":
+        FeedEntry.objects.filter(**{"actor" if reverse else "owner": instance}).delete()
@@ -1,3 +1,1957 @@
-from django.test import TestCase
+import copy
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, astuple, fields, is_dataclass
+from datetime import timedelta
+from importlib import import_module
+from math import inf
+from typing import Any, Optional
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_save
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+    skipUnlessDBFeature,
+)
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.serializers import ModelSerializer
+from rest_framework.test import APIClient
+
+from accounts.models import Follow
+from dataclass_mixins import (
+    EmptyStringToNoneMixin,
+    LazyDataClassList,
+    NestedInitMixin,
+    TypeHintsMixin,
+)
+from decorators import (
+    MemoStats,
+    flexible_dataclass,
+    lazy_load_classmethod,
+    lazy_load_property,
+    memoize,
+)
+from instrumentation import Histogram, Registry, registry, span
+from serializers import ReusableFieldsMixin
+
+from . import factorization, recommendations
+from .autocomplete import PrefixIndex, autocompleter, decompose
+from .caches import movie_detail_cache
+from .crawlers import benchmarks, custom_types
+from .crawlers.agents import TMDBAPIAgent
+from .crawlers.custom_types import ImageFromTMDB, SimpleMovieFromTMDB
+from .crawlers.interface import APICrawler
+from .crawlers.mixins.crawler import MultiListMixin, TMDBSerializeMixin
+from .crawlers.serializers import (
+    MovieRegisterSerializer,
+    PersonCreateOrMergeSerializer,
+)
+from .crawlers.utils import ISO_3166_1
+from .feeds import feed
+from .management.commands.crawlmovies import Command as CrawlMoviesCommand
+from .models import (
+    AutocompleteChange,
+    Blocklist,
+    Country,
+    Credit,
+    FeedEntry,
+    FeedPullActor,
+    Genre,
+    Movie,
+    Person,
+    Poster,
+    Rating,
+    Review,
+    Still,
+    Video,
+    Wishlist,
+)
+from .views import RatingViewSet
+
+User = get_user_model()
+
+
+@skipUnlessDBFeature("supports_explaining_query_execution")
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class HotQueryPlanTestCase(TestCase):
+    """
+    EXPLAIN QUERY PLAN of each hot path query must search by index w/o sorting rows
+      - full table scans & temp B-trees (rows sorted for ORDER BY) fail
+      - an index is only scanned as an ordered walk stopped by LIMIT (first pages)
+    """
+
+    full_scan = re.compile(r"\bSCAN (?:TABLE )?(\w+)(?! USING)(?:\s|$)")
+    index_scan = re.compile(r"\bSCAN (?:TABLE )?\w+ USING (?:COVERING )?INDEX")
+    temp_b_tree = re.compile(r"\bUSE TEMP B-TREE\b")
+
+    @classmethod
+    def setUpTestData(cls):
+        users = [
+            User.objects.create_user(
+                email=f"user{i}@watchb.com", username=f"user{i}", password="watchb1234!"
+            )
+            for i in range(2)
+        ]
+        movies = [
+            Movie.objects.create(
+                tmdb_id=i,
+                title=f"movie{i}",
+                production_year=2000,
+                release_date=f"2000-0{i + 1}-01",
+                film_rating="ALL",
+            )
+            for i in range(3)
+        ]
+        person = Person.objects.create(tmdb_id=1, name="person")
+        country = Country.objects.create(alpha_2="KR", name="대한민국")
+        genre = Genre.objects.create(name="드라마")
+        for movie in movies:
+            movie.countries.add(country)
+            movie.genres.add(genre)
+            Credit.objects.create(movie=movie, person=person, job="director")
+            Poster.objects.create(
+                movie=movie, image_url="https://a.b/c.jpg", is_main=True
+            )
+            for user in users:
+                Rating.objects.create(user=user, movie=movie, score=4.0)
+                Review.objects.create(user=user, movie=movie, comment="good")
+        cls.movie, cls.user, cls.person = movies[0], users[0], person
+
+    def setUp(self):
+        cache.clear()  # movie detail responses cached
+
+    def assertNoFullScan(self, sql: str, params: tuple = ()):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = "\n".join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIsNone(
+            self.full_scan.search(plan), f"Full scan in query plan:\n{plan}\n{sql}"
+        )
+        self.assertIsNone(
+            self.temp_b_tree.search(plan), f"Rows sorted in query plan:\n{plan}\n{sql}"
+        )
+        if self.index_scan.search(plan):
+            self.assertRegex(
+                sql, r"\bLIMIT\b", f"Index scanned w/o LIMIT:\n{plan}\n{sql}"
+            )
+
+    def assertRequestNoFullScan(self, url: str):
+        with CaptureQueriesContext(connection) as ctx:
+            response = APIClient().get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        for query in ctx.captured_queries:
+            with self.subTest(url=url, sql=query["sql"]):
+                self.assertNoFullScan(query["sql"])
+
+    def test_rating_list(self):
+        for qstring in (
+            "",
+            f"movie={self.movie.pk}",
+            f"user={self.user.pk}",
+            "score=4.0",
+            f"movie={self.movie.pk}&score=4.0",
+            "index_key=movie",
+            "index_key=user",
+            "index_key=score",
+        ):
+            self.assertRequestNoFullScan(f"/api/ratings/?{qstring}&page_size=2")
+            response = APIClient().get(f"/api/ratings/?{qstring}&page_size=1")
+            self.assertRequestNoFullScan(response.data["next"])  # seeks by cursor
+
+    def test_review_list(self):
+        for qstring in (
+            "",
+            f"movie={self.movie.pk}",
+            f"user={self.user.pk}",
+            "has_spoiler=false",
+            "index_key=movie",
+            "index_key=user",
+            "index_key=has_spoiler",
+        ):
+            self.assertRequestNoFullScan(f"/api/reviews/?{qstring}&page_size=2")
+
+    def test_movie_list(self):
+        genre, country = self.movie.genres.get(), self.movie.countries.get()
+        for qstring in (
+            "",
+            "ordering=release_date",
+            "ordering=-id",
+            f"genres={genre.pk}",
+            f"countries={country.pk}",
+            "production_year=2000",
+            "film_rating=ALL",
+        ):
+            with self.assertNumQueries(1):
+                response = APIClient().get(f"/api/movies/?{qstring}&page_size=1")
+            self.assertEqual(len(response.data["results"]), 1)
+            self.assertRequestNoFullScan(response.data["next"])
+
+        self.assertEqual(
+            response.data["results"][0]["main_poster_url"], "https://a.b/c.jpg"
+        )
+
+    def test_movie_retrieve(self):
+        self.assertRequestNoFullScan(f"/api/movies/{self.movie.pk}/")
+
+    def test_movie_similar(self):
+        self.assertRequestNoFullScan(f"/api/movies/{self.movie.pk}/similar/")
+
+    def test_feed(self):
+        feed_page = FeedEntry.objects.filter(owner=self.user).order_by(
+            "-created_at", "-id"
+        )
+        for queryset in (
+            feed_page[:21],
+            feed_page.filter(created_at__lt=timezone.now())[:21],
+            FeedEntry.objects.filter(kind="rating", object_id=1),
+            Follow.objects.filter(
+                follower=self.user, following__feed_pull__isnull=False
+            ),
+            Follow.objects.filter(following=self.user).values(
+                "follower_id", "following__feed_pull"
+            )[:1001],
+            Wishlist.objects.filter(user=self.user).order_by("-timestamp")[:100],
+        ):
+            self.assertNoFullScan(*queryset.query.sql_with_params())
+
+    def test_credit_by_job(self):
+        for queryset in (
+            Credit.objects.filter(movie=self.movie, job="director"),
+            Credit.objects.filter(person=self.person, job="director"),
+        ):
+            self.assertNoFullScan(*queryset.query.sql_with_params())
+
+    def test_crawler_lookups(self):
+        for queryset in (
+            Movie.objects.filter(tmdb_id=1),
+            Movie.objects.filter(kmdb_id="A00001"),
+            Person.objects.filter(tmdb_id=1),
+            Person.objects.filter(
+                Q(tmdb_id=1) | Q(kmdb_id="00000001") | Q(avatar_url="https://a.b/c")
+            ),
+            Genre.objects.filter(name__in=["드라마", "코미디"]),
+            Country.objects.filter(Q(alpha_2="KR") | Q(name="대한민국")),
+        ):
+            self.assertNoFullScan(*queryset.query.sql_with_params())
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class KeysetPaginationTestCase(TestCase):
+    """
+    Paging through lists by following `next` must yield every item once, in order
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        users = [
+            User.objects.create_user(
+                email=f"user{i}@watchb.com", username=f"user{i}", password="watchb1234!"
+            )
+            for i in range(2)
+        ]
+        movies = [
+            Movie.objects.create(
+                tmdb_id=i, title=f"movie{i}", production_year=2000, film_rating="ALL"
+            )
+            for i in range(5)
+        ]
+        for movie in movies:
+            for user in users:
+                Rating.objects.create(user=user, movie=movie, score=4.0)
+                Review.objects.create(user=user, movie=movie, comment="good")
+
+        # ties of created_at (broken by id) across page boundaries
+        now = timezone.now()
+        for model in (Rating, Review):
+            pks = list(model.objects.order_by("id").values_list("pk", flat=True))
+            model.objects.filter(pk__in=pks[:4]).update(created_at=now)
+            model.objects.filter(pk__in=pks[4:]).update(
+                created_at=now - timedelta(days=1)
+            )
+
+        # NULL release dates amid dated movies
+        for movie, release_date in zip(
+            movies, ("2000-01-01", None, "2001-01-01", None, "2000-01-01")
+        ):
+            Movie.objects.filter(pk=movie.pk).update(release_date=release_date)
+
+    def pages(self, url: str) -> list[dict]:
+        pages = []
+        while url:
+            response = APIClient().get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            pages.append(response.data)
+            url = response.data["next"]
+        return pages
+
+    def paged_pks(self, url: str) -> list[int]:
+        return [item["id"] for page in self.pages(url) for item in page["results"]]
+
+    def test_created_at_ties(self):
+        for path, model in (("ratings", Rating), ("reviews", Review)):
+            expected = list(
+                model.objects.order_by("-created_at", "-id").values_list(
+                    "pk", flat=True
+                )
+            )
+            for page_size in (1, 3, 4):
+                with self.subTest(path=path, page_size=page_size):
+                    self.assertEqual(
+                        self.paged_pks(f"/api/{path}/?page_size={page_size}"),
+                        expected,
+                    )
+
+    def test_null_cursor(self):
+        for ordering, expected in (
+            ("-release_date", ["movie2", "movie4", "movie0", "movie3", "movie1"]),
+            ("release_date", ["movie1", "movie3", "movie0", "movie4", "movie2"]),
+        ):
+            for page_size in (1, 2):
+                with self.subTest(ordering=ordering, page_size=page_size):
+                    titles = [
+                        item["title"]
+                        for page in self.pages(
+                            f"/api/movies/?ordering={ordering}&page_size={page_size}"
+                        )
+                        for item in page["results"]
+                    ]
+                    self.assertEqual(titles, expected)
+
+    def test_index_key_groups(self):
+        for path, model in (("ratings", Rating), ("reviews", Review)):
+            expected = {}
+            for movie_id, pk in model.objects.order_by(
+                "movie_id", "-created_at", "-id"
+            ).values_list("movie_id", "pk"):
+                expected.setdefault(movie_id, []).append(pk)
+
+            with self.subTest(path=path):
+                pages = self.pages(f"/api/{path}/?index_key=movie&page_size=3")
+                self.assertEqual(len(pages), 4)
+                grouped = {}
+                for page in pages:
+                    self.assertEqual(page["index_key"], "movie")
+                    for movie_id, items in page["results"].items():
+                        # group split by page boundary continues on next page
+                        if movie_id in grouped:
+                            self.assertEqual(movie_id, list(grouped)[-1])
+                        grouped.setdefault(movie_id, []).extend(
+                            item["id"] for item in items
+                        )
+                self.assertEqual(grouped, expected)
+
+    def test_invalid_cursor(self):
+        for cursor in ("invalid", "WzFd"):  # not base64 JSON, wrong length
+            response = APIClient().get(f"/api/ratings/?cursor={cursor}")
+            self.assertEqual(response.status_code, 404)
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class MovieRetrieveQueryCountTestCase(TestCase):
+    """
+    Movie detail is rendered w/ a constant number of queries regardless of its cast size
+      (movie + countries, genres, credits w/ persons, posters, stills & videos)
+      & served from cache w/o any query afterwards
+    """
+
+    num_queries = 7
+
+    @classmethod
+    def setUpClass(cls):
+        # cache shared between processes, as each has its own local memory cache
+        cache_dir = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(cache_dir.cleanup)
+        shared_cache = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": cache_dir.name,
+                }
+            }
+        )
+        shared_cache.enable()
+        cls.addClassCleanup(shared_cache.disable)
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.countries = [
+            Country.objects.create(alpha_2="KR", name="대한민국"),
+            Country.objects.create(alpha_2="US", name="미국"),
+        ]
+        cls.genres = [
+            Genre.objects.create(name="드라마"),
+            Genre.objects.create(name="코미디"),
+        ]
+
+    def setUp(self):
+        cache.clear()  # movie detail responses cached by former tests
+
+    def create_movie(self, cast_size: int) -> Movie:
+        movie = Movie.objects.create(title=f"movie w/ {cast_size} cast")
+        movie.countries.set(self.countries)
+        movie.genres.set(self.genres)
+        Credit.objects.bulk_create(
+            Credit(
+                movie=movie,
+                person=Person.objects.create(name=f"actor{i}"),
+                job="actor",
+                role_name=f"role{i}",
+            )
+            for i in range(cast_size)
+        )
+        for i in range(3):
+            Poster.objects.create(
+                movie=movie, image_url=f"https://a.b/p{i}.jpg", is_main=not i
+            )
+            Still.objects.create(movie=movie, image_url=f"https://a.b/s{i}.jpg")
+            Video.objects.create(
+                movie=movie, title=f"video{i}", site="youtube", external_id=f"v{i}"
+            )
+        return movie
+
+    def test_constant_num_queries(self):
+        for cast_size in (0, 1, 10, 100):
+            movie = self.create_movie(cast_size)
+            with self.subTest(cast_size=cast_size), self.assertNumQueries(
+                self.num_queries
+            ):
+                response = APIClient().get(f"/api/movies/{movie.pk}/")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data["credits"]), cast_size)
+            self.assertEqual(len(response.data["countries"]), len(self.countries))
+            self.assertEqual(len(response.data["video_set"]), 3)
+
+    def test_credits_w_person(self):
+        movie = self.create_movie(2)
+        response = APIClient().get(f"/api/movies/{movie.pk}/")
+        self.assertEqual(
+            sorted(c["person"]["name"] for c in response.data["credits"]),
+            ["actor0", "actor1"],
+        )
+
+    def test_cached_w_etag(self):
+        movie = self.create_movie(10)
+        client = APIClient()
+        etag = client.get(f"/api/movies/{movie.pk}/")["ETag"]
+
+        with self.assertNumQueries(0):
+            response = client.get(f"/api/movies/{movie.pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], etag)
+
+        with self.assertNumQueries(0):
+            response = client.get(f"/api/movies/{movie.pk}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_invalidated_on_write(self):
+        movie = self.create_movie(1)
+        client = APIClient()
+        etag = client.get(f"/api/movies/{movie.pk}/")["ETag"]
+
+        person = Credit.objects.filter(movie=movie).get().person
+        with self.captureOnCommitCallbacks(execute=True):
+            person.save()  # w/o any change
+        with self.assertNumQueries(0):
+            response = client.get(f"/api/movies/{movie.pk}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        person.name = "renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            person.save()
+        response = client.get(f"/api/movies/{movie.pk}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["credits"][0]["person"]["name"], "renamed")
+        etag = response["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Video.objects.filter(movie=movie).delete()
+        response = client.get(f"/api/movies/{movie.pk}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["video_set"], [])
+
+    def test_invalidated_by_other_process(self):
+        movie = self.create_movie(1)
+        client = APIClient()
+        etag = client.get(f"/api/movies/{movie.pk}/")["ETag"]
+
+        # invalidated w/ another cache instance (as by crawler or other worker)
+        other_caches = []
+
+        def invalidate():
+            other_caches.append(movie_detail_cache.cache)
+            movie_detail_cache._invalidate([movie.pk])
+
+        thread = threading.Thread(target=invalidate)
+        thread.start()
+        thread.join()
+        self.assertIsNot(other_caches[0], movie_detail_cache.cache)
+
+        with self.assertNumQueries(self.num_queries):  # rendered again
+            response = client.get(f"/api/movies/{movie.pk}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_disabled_w_process_local_backend(self):
+        self.assertFalse(movie_detail_cache.enabled)
+        movie = self.create_movie(1)
+        client = APIClient()
+        etag = client.get(f"/api/movies/{movie.pk}/")["ETag"]
+        with self.assertNumQueries(self.num_queries):
+            response = client.get(f"/api/movies/{movie.pk}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(movie_detail_cache.warm([movie.pk]), 0)
+
+
+@override_settings(
+    ALLOWED_HOSTS=["testserver"],
+    AUTOCOMPLETE_SNAPSHOT=None,
+    AUTOCOMPLETE_REFRESH_INTERVAL=0,
+)
+class SearchTestCase(TestCase):
+    """
+    Full-text search ranked by bm25 (title over synopsis) & kept in sync on writes
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.parasite = Movie.objects.create(
+            title="기생충", original_title="Parasite", synopsys="전원백수 가족의 이야기"
+        )
+        cls.mention = Movie.objects.create(title="다큐멘터리", synopsys="영화 기생충의 제작 과정")
+        cls.director = Person.objects.create(name="봉준호", en_name="Bong Joon-ho")
+
+    def setUp(self):
+        autocompleter.loaded_at = None  # built from former tests' data
+
+    def search(self, q: str) -> dict:
+        response = APIClient().get("/api/search/", {"q": q})
+        self.assertEqual(response.status_code, 200, response.content)
+        return {
+            "movies": [m["id"] for m in response.data["movies"]],
+            "persons": [p["id"] for p in response.data["persons"]],
+        }
+
+    def test_ranked(self):
+        self.assertEqual(
+            self.search("기생충"),
+            {"movies": [self.parasite.pk, self.mention.pk], "persons": []},
+        )
+        self.assertEqual(self.search("PARASITE")["movies"], [self.parasite.pk])
+        self.assertEqual(self.search("joon")["persons"], [self.director.pk])
+
+    def test_short_terms(self):
+        self.assertEqual(self.search("기생")["movies"], [self.parasite.pk])
+        self.assertEqual(self.search("봉")["persons"], [self.director.pk])
+        self.assertEqual(self.search("기생충 과정")["movies"], [self.mention.pk])
+        self.assertEqual(self.search("%")["movies"], [])
+
+    def test_short_terms_looked_up_in_prefix_index(self):
+        self.search("기")  # autocomplete indexes built
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(
+                self.search("기"), {"movies": [self.parasite.pk], "persons": []}
+            )
+            self.assertEqual(self.search("BO jo")["persons"], [self.director.pk])
+            self.assertEqual(self.search("다 기")["movies"], [])  # w/ every term
+            self.assertEqual(self.search("기새")["movies"], [])  # whole syllables
+        self.assertFalse([q["sql"] for q in ctx.captured_queries if "LIKE" in q["sql"]])
+
+    def test_migrations_skip_sqlite_ddl_on_other_databases(self):
+        schema_editor = mock.Mock(**{"connection.vendor": "postgresql"})
+        for name in (
+            "0004_search_indexes",
+            "0006_movie_rating_aggregates",
+            "0008_autocomplete_changes",
+        ):
+            migration = import_module(f"movies.migrations.{name}").Migration
+            for operation in migration.operations:
+                if getattr(operation, "code", None) and "on_sqlite" in (
+                    operation.code.__qualname__
+                ):
+                    operation.code(None, schema_editor)
+                    operation.reverse_code(None, schema_editor)
+        schema_editor.execute.assert_not_called()
+
+    def test_synced_on_write(self):
+        self.parasite.title = "괴물"
+        self.parasite.save()
+        self.assertEqual(self.search("기생충")["movies"], [self.mention.pk])
+        self.assertEqual(self.search("괴물")["movies"], [self.parasite.pk])
+
+        self.mention.delete()
+        self.assertEqual(self.search("기생충")["movies"], [])
+
+    def test_invalid_query(self):
+        for params in ({}, {"q": ""}, {"q": "기생충", "limit": 0}, {"q": "a", "x": 1}):
+            with self.subTest(params=params):
+                response = APIClient().get("/api/search/", params)
+                self.assertEqual(response.status_code, 400)
+
+
+@override_settings(
+    ALLOWED_HOSTS=["testserver"],
+    AUTOCOMPLETE_SNAPSHOT=None,
+    AUTOCOMPLETE_REFRESH_INTERVAL=0,
+)
+class AutocompleteTestCase(TestCase):
+    """
+    Jamo prefix autocomplete of text typed in progress, ranked by popularity
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        users = [
+            User.objects.create_user(
+                email=f"user{i}@watchb.com", username=f"user{i}", password="watchb1234!"
+            )
+            for i in range(2)
+        ]
+        cls.users = users
+        cls.parasite = Movie.objects.create(title="기생충")
+        cls.parasyte = Movie.objects.create(title="기생수 파트 1")
+        for user in users:
+            Rating.objects.create(user=user, movie=cls.parasyte, score=3.0)
+        cls.director = Person.objects.create(name="봉준호", en_name="Bong Joon-ho")
+
+    def setUp(self):
+        autocompleter.loaded_at = None  # built from former tests' data
+
+    def complete(self, q: str) -> dict[str, list]:
+        response = APIClient().get("/api/autocomplete/", {"q": q})
+        self.assertEqual(response.status_code, 200, response.content)
+        return {
+            name: [doc["id"] for doc in docs] for name, docs in response.data.items()
+        }
+
+    def test_decompose(self):
+        self.assertEqual(decompose("기생충"), "ㄱㅣㅅㅐㅇㅊㅜㅇ")
+        self.assertEqual(decompose("과 닭"), "ㄱㅗㅏ ㄷㅏㄹㄱ")
+        self.assertEqual(decompose(" Bong  Joon-ho "), "bong joon-ho")
+
+    def test_typed_in_progress(self):
+        for q in ("ㄱ", "기", "깃", "기새", "기생", "기생ㅊ", "기생추"):
+            with self.subTest(q=q):
+                self.assertIn(self.parasite.pk, self.complete(q)["movies"])
+        self.assertEqual(self.complete("기생충")["movies"], [self.parasite.pk])
+        self.assertEqual(self.complete("파트")["movies"], [self.parasyte.pk])
+        self.assertEqual(self.complete("jOON")["persons"], [self.director.pk])
+        self.assertEqual(self.complete("보")["persons"], [self.director.pk])
+
+    def test_ranked_by_popularity(self):
+        self.assertEqual(
+            self.complete("기생")["movies"], [self.parasyte.pk, self.parasite.pk]
+        )
+
+    def test_refreshed_w_new_rows(self):
+        self.complete("기생")
+        movie = Movie.objects.create(title="기생 수업")
+        self.assertEqual(self.complete("기생 ㅅ")["movies"], [movie.pk])
+
+    @mock.patch.object(PrefixIndex, "heavy_range", 0)  # all prefixes w/ tops
+    def test_refreshed_w_renamed_or_deleted_rows(self):
+        self.complete("기생")
+        Movie.objects.filter(pk=self.parasite.pk).update(title="살인의 추억")
+        self.director.delete()
+        completed = self.complete("기생")
+        self.assertEqual(completed["movies"], [self.parasyte.pk])
+        self.assertEqual(self.complete("살인")["movies"], [self.parasite.pk])
+        self.assertEqual(self.complete("봉")["persons"], [])
+
+    @mock.patch.object(PrefixIndex, "heavy_range", 0)  # all prefixes w/ tops
+    def test_refreshed_w_popularity_changed(self):
+        self.complete("기생")
+        Rating.objects.filter(movie=self.parasyte).delete()
+        movie = Movie.objects.create(title="기생 수업")
+        Rating.objects.create(user=self.users[0], movie=movie, score=4.0)
+        self.assertEqual(
+            self.complete("기생")["movies"],
+            [movie.pk, self.parasite.pk, self.parasyte.pk],
+        )
+
+    def test_changes_pruned_on_refresh(self):
+        self.complete("기생")
+        old = Movie.objects.create(title="기생 수업")
+        AutocompleteChange.objects.update(
+            changed_at=timezone.now()
+            - timedelta(seconds=autocompleter.change_retention + 1)
+        )
+        recent = Movie.objects.create(title="기생 일기")
+        self.assertEqual(
+            self.complete("기생")["movies"],
+            [self.parasyte.pk, self.parasite.pk, old.pk, recent.pk],
+        )
+        self.assertEqual(
+            set(AutocompleteChange.objects.values_list("object_id", flat=True)),
+            {recent.pk},
+        )
+
+    def test_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "autocomplete.json")
+            call_command("buildautocomplete", output=path, stdout=io.StringIO())
+            movie = Movie.objects.create(title="기생 수업")
+
+            # loaded & refreshed (changes read & pruned)
+            with self.settings(AUTOCOMPLETE_SNAPSHOT=path), self.assertNumQueries(3):
+                completed = self.complete("기생")
+        self.assertEqual(
+            completed["movies"], [self.parasyte.pk, self.parasite.pk, movie.pk]
+        )
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class RecommendationTestCase(TestCase):
+    """
+    Item-item CF neighbours (same w/ or w/o NumPy & SciPy) & recommendations from them
+    """
+
+    scores = {  # user: scores of movies A, B, C, D
+        "u1": (5.0, 5.0, 1.0, None),
+        "u2": (4.0, 5.0, 2.0, 3.0),
+        "u3": (1.0, 2.0, 5.0, 4.0),
+        "u4": (5.0, 4.0, 1.0, 2.0),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.movies = [Movie.objects.create(title=title) for title in "ABCD"]
+        for username, scores in cls.scores.items():
+            user = User.objects.create_user(
+                email=f"{username}@watchb.com",
+                username=username,
+                password="watchb1234!",
+            )
+            for movie, score in zip(cls.movies, scores):
+                if score is not None:
+                    Rating.objects.create(user=user, movie=movie, score=score)
+        cls.user = User.objects.create_user(
+            email="u5@watchb.com", username="u5", password="watchb1234!"
+        )
+        Rating.objects.create(user=cls.user, movie=cls.movies[0], score=5.0)
+
+    def test_vectorized_same_as_pure_python(self):
+        if recommendations.np is None:
+            self.skipTest("NumPy & SciPy not installed")
+        ratings = recommendations.load_ratings()
+        vectorized = dict(recommendations.top_neighbors_numpy(*ratings, 2, 2))
+        pure = dict(recommendations.top_neighbors_python(*ratings, 2, 2))
+        self.assertEqual(vectorized.keys(), pure.keys())
+        for movie_id, neighbors in pure.items():
+            with self.subTest(movie_id=movie_id):
+                self.assertEqual(
+                    [n for n, _ in vectorized[movie_id]], [n for n, _ in neighbors]
+                )
+                for (_, v), (_, p) in zip(vectorized[movie_id], neighbors):
+                    self.assertAlmostEqual(v, p)
+
+    def test_similar(self):
+        a, b, c, d = self.movies
+        recommendations.compute_similarities(k=2, min_support=2, vectorized=False)
+        response = APIClient().get(f"/api/movies/{a.pk}/similar/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([m["id"] for m in response.data], [b.pk])
+        self.assertGreater(response.data[0]["score"], 0)
+
+        response = APIClient().get(f"/api/movies/{c.pk}/similar/")
+        self.assertEqual([m["id"] for m in response.data], [d.pk])
+
+    def test_recommendations(self):
+        a, b, c, d = self.movies
+        recommendations.compute_similarities(k=2, min_support=2, vectorized=False)
+        client = APIClient()
+        self.assertEqual(client.get("/api/recommendations/").status_code, 401)
+
+        client.force_authenticate(self.user)
+        response = client.get("/api/recommendations/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([m["id"] for m in response.data], [b.pk])
+
+        Blocklist.objects.create(user=self.user, movie=b)
+        self.assertEqual(client.get("/api/recommendations/").data, [])
+
+    def test_predicted_rating(self):
+        if factorization.np is None:
+            self.skipTest("NumPy & SciPy not installed")
+        a, b, c, d = self.movies
+        client = APIClient()
+        url = f"/api/movies/{d.pk}/predicted-rating/"
+        self.assertEqual(client.get(url).status_code, 401)
+
+        client.force_authenticate(self.user)
+        with tempfile.TemporaryDirectory() as tmpdir, self.settings(
+            FACTORIZATION_DIR=tmpdir
+        ):
+            self.assertEqual(client.get(url).data, {"movie": d.pk, "score": None})
+
+            model = factorization.train_als(
+                *factorization.load_ratings(), factors=2, iterations=20
+            )
+            self.assertLess(factorization.rmse(model, *factorization.load_ratings()), 1)
+            model.save(tmpdir)
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(0.5 <= response.data["score"] <= 5.0)
+            self.assertIsInstance(
+                factorization.factor_store.model.user_factors, factorization.np.memmap
+            )
+
+            # cold start: movie w/o ratings while training
+            new_movie = Movie.objects.create(title="E")
+            response = client.get(f"/api/movies/{new_movie.pk}/predicted-rating/")
+            self.assertIsNone(response.data["score"])
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class RatingAggregateTestCase(TestCase):
+    """
+    Rating count, sum & histogram of movies kept in sync w/ rating API writes
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.movie = Movie.objects.create(title="기생충")
+        cls.users = [
+            User.objects.create_user(
+                email=f"user{i}@watchb.com", username=f"user{i}", password="watchb1234!"
+            )
+            for i in range(2)
+        ]
+
+    def setUp(self):
+        cache.clear()  # movie detail responses cached by former tests
+
+    def rate(self, user, method: str, url: str, **data):
+        client = APIClient()
+        client.force_authenticate(user)
+        with self.captureOnCommitCallbacks(execute=True):  # detail cache invalidated
+            response = getattr(client, method)(url, data, format="json")
+        self.assertLess(response.status_code, 300, response.content)
+        return response
+
+    def assertAggregates(self, count: int, total: float, histogram: dict[str, int]):
+        self.movie.refresh_from_db()
+        self.assertEqual(self.movie.rating_count, count)
+        self.assertEqual(self.movie.rating_sum, total)
+        self.assertEqual(
+            {s: n for s, n in self.movie.rating_histogram.items() if n}, histogram
+        )
+
+    def test_updated_w_ratings(self):
+        first, second = self.users
+        created = self.rate(
+            first, "post", "/api/ratings/", movie=self.movie.pk, score=4.0
+        )
+        self.rate(second, "post", "/api/ratings/", movie=self.movie.pk, score=5.0)
+        self.assertAggregates(2, 9.0, {"4.0": 1, "5.0": 1})
+
+        url = f"/api/ratings/{created.data['id']}/"
+        self.rate(first, "patch", url, score=2.5)
+        self.assertAggregates(2, 7.5, {"2.5": 1, "5.0": 1})
+
+        self.rate(first, "delete", url)
+        self.assertAggregates(1, 5.0, {"5.0": 1})
+        self.assertEqual(self.movie.rating_average, 5.0)
+
+    def test_stale_instance(self):
+        user = self.users[0]
+        created = self.rate(
+            user, "post", "/api/ratings/", movie=self.movie.pk, score=4.0
+        )
+        url = f"/api/ratings/{created.data['id']}/"
+        stale = Rating.objects.get(pk=created.data["id"])
+        self.rate(user, "patch", url, score=5.0)  # meanwhile
+        with mock.patch.object(RatingViewSet, "get_object", return_value=stale):
+            self.rate(user, "patch", url, score=2.5)
+        self.assertAggregates(1, 2.5, {"2.5": 1})
+
+        stale = Rating.objects.get(pk=created.data["id"])
+        self.rate(user, "patch", url, score=1.0)
+        with mock.patch.object(RatingViewSet, "get_object", return_value=stale):
+            self.rate(user, "delete", url)
+            self.assertAggregates(0, 0.0, {})
+            self.rate(user, "delete", url)  # deleted meanwhile
+        self.assertAggregates(0, 0.0, {})
+
+    def test_exposed(self):
+        detail = APIClient().get(f"/api/movies/{self.movie.pk}/").data
+        self.assertEqual(detail["rating_count"], 0)
+        self.assertIsNone(detail["rating_average"])
+
+        self.rate(
+            self.users[0], "post", "/api/ratings/", movie=self.movie.pk, score=3.5
+        )
+        detail = APIClient().get(f"/api/movies/{self.movie.pk}/").data
+        self.assertEqual(detail["rating_count"], 1)
+        self.assertEqual(detail["rating_average"], 3.5)
+        self.assertEqual(detail["rating_histogram"]["3.5"], 1)
+        self.assertEqual(len(detail["rating_histogram"]), 10)
+
+        (card,) = APIClient().get("/api/movies/").data["results"]
+        self.assertEqual(card["rating_count"], 1)
+        self.assertEqual(card["rating_average"], 3.5)
+
+    def test_reconciled(self):
+        Rating.objects.create(user=self.users[0], movie=self.movie, score=1.0)
+        Movie.objects.create(title="기생수", rating_count=3, rating_sum=6.0)
+        out = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command("reconcileratings", check=True, stdout=out)
+
+        call_command("reconcileratings", stdout=out)
+        self.assertAggregates(1, 1.0, {"1.0": 1})
+        self.assertEqual(
+            Movie.objects.filter(title="기생수").values("rating_count").get(),
+            {"rating_count": 0},
+        )
+        call_command("reconcileratings", check=True, stdout=out)
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"], FEED_FANOUT_LIMIT=1)
+class FeedTestCase(TestCase):
+    """
+    Activities pushed into followers' feeds (or pulled from users w/ many followers)
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader, cls.friend, cls.star, cls.fan = [
+            User.objects.create_user(
+                email=f"{name}@watchb.com", username=name, password="watchb1234!"
+            )
+            for name in ("reader", "friend", "star", "fan")
+        ]
+        cls.movies = [Movie.objects.create(title=title) for title in "ABC"]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def read(self, url: str = "/api/feed/") -> dict:
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data
+
+    def kinds(self, data: dict) -> list[tuple[str, int]]:
+        return [(entry["kind"], entry["actor"]["id"]) for entry in data["results"]]
+
+    def test_pushed_on_write(self):
+        a, b, c = self.movies
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reader.followings.add(self.friend)
+            Rating.objects.create(user=self.friend, movie=a, score=4.5)
+            Review.objects.create(user=self.friend, movie=b, comment="good")
+            Wishlist.objects.create(user=self.friend, movie=c)
+            Rating.objects.create(user=self.fan, movie=a, score=1.0)  # not followed
+        self.assertEqual(FeedEntry.objects.filter(owner=self.reader).count(), 3)
+
+        data = self.read("/api/feed/?page_size=2")
+        self.assertEqual(
+            self.kinds(data),
+            [("wishlist", self.friend.pk), ("review", self.friend.pk)],
+        )
+        self.assertEqual(data["results"][1]["activity"]["comment"], "good")
+        with self.assertNumQueries(2):  # entries & reviews
+            data = self.read(data["next"])
+        self.assertEqual(data["results"][0]["activity"], {"score": 4.5})
+        self.assertEqual(data["results"][0]["movie"]["title"], "A")
+
+        Review.objects.get(user=self.friend).delete()
+        self.assertEqual(len(self.read()["results"]), 2)
+        self.reader.followings.remove(self.friend)
+        self.assertEqual(self.read()["results"], [])
+
+    def test_backfilled_on_follow(self):
+        Rating.objects.create(user=self.friend, movie=self.movies[0], score=3.0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reader.followings.add(self.friend)
+        self.assertEqual(self.kinds(self.read()), [("rating", self.friend.pk)])
+
+    def test_pulled_from_many_followed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.star.followers.add(self.reader, self.fan)
+        with self.captureOnCommitCallbacks(execute=True):
+            Rating.objects.create(user=self.star, movie=self.movies[0], score=5.0)
+        self.assertTrue(FeedPullActor.objects.filter(actor=self.star).exists())
+        self.assertFalse(FeedEntry.objects.filter(kind="rating").exists())
+
+        self.assertEqual(self.kinds(self.read()), [("rating", self.star.pk)])
+        self.assertEqual(len(self.read()["results"]), 1)  # pulled once
+
+        self.client.force_authenticate(self.fan)
+        self.assertEqual(self.kinds(self.read()), [("rating", self.star.pk)])
+
+    def test_pushed_again_under_limit(self):
+        a, b, c = self.movies
+        with self.captureOnCommitCallbacks(execute=True):
+            self.star.followers.add(self.reader, self.fan)
+        with self.captureOnCommitCallbacks(execute=True):
+            Rating.objects.create(user=self.star, movie=a, score=5.0)
+        self.assertEqual(self.kinds(self.read()), [("rating", self.star.pk)])
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(user=self.star, movie=b, comment="good")
+
+        # fan neither read feed nor had activities pushed while star was pulled from
+        with self.captureOnCommitCallbacks(execute=True):
+            self.star.followers.remove(self.reader)
+        rating = Rating.objects.create(user=self.friend, movie=c, score=3.0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.friend.followers.add(self.fan)
+        with self.assertNumQueries(2):  # followers & entries of actor still pushing
+            feed.push("rating", rating)
+        with self.captureOnCommitCallbacks(execute=True):
+            Wishlist.objects.create(user=self.star, movie=c)
+        self.assertFalse(FeedPullActor.objects.filter(actor=self.star).exists())
+        self.assertEqual(
+            list(
+                FeedEntry.objects.filter(owner=self.fan)
+                .order_by("-created_at")
+                .values_list("kind", "actor_id")
+            ),
+            [
+                ("wishlist", self.star.pk),
+                ("rating", self.friend.pk),
+                ("review", self.star.pk),
+                ("rating", self.star.pk),
+            ],
+        )
+
+
+class MemoizationTestCase(SimpleTestCase):
+    """
+    Memoizing decorators cache falsy results, by scope & size, computing once per key
+    """
+
+    def test_falsy_results_cached(self):
+        calls = []
+
+        class Holder:
+            def __init__(self, value):
+                self.value = value
+
+            @lazy_load_property
+            def loaded(self):
+                calls.append("property")
+                return self.value
+
+            @memoize
+            def memoized(self):
+                calls.append("memoize")
+                return self.value
+
+        for value in (set(), {}, [], 0, None):
+            with self.subTest(value=value):
+                calls.clear()
+                holder = Holder(value)
+                for _ in range(3):
+                    self.assertEqual(holder.loaded, value)
+                    self.assertEqual(holder.memoized(), value)
+                self.assertEqual(calls, ["property", "memoize"])
+
+        calls.clear()
+        del holder.loaded
+        holder.loaded
+        self.assertEqual(calls, ["property"])
+
+    def test_class_vs_instance_scope(self):
+        calls = []
+
+        class Holder:
+            @memoize(scope="instance")
+            def per_instance(self, x):
+                calls.append(("instance", x))
+                return x
+
+            @memoize(scope="class")
+            def per_class(self, x):
+                calls.append(("class", x))
+                return x
+
+            @lazy_load_classmethod
+            def per_class_once(cls):
+                calls.append(("classmethod", cls.__name__))
+                return cls.__name__
+
+        class SubHolder(Holder):
+            pass
+
+        first, second = Holder(), Holder()
+        for holder in (first, second, first):
+            holder.per_instance(1)
+            holder.per_class(1)
+        self.assertEqual(calls.count(("instance", 1)), 2)
+        self.assertEqual(calls.count(("class", 1)), 1)
+
+        SubHolder().per_class(1)  # other class, other cache
+        self.assertEqual(calls.count(("class", 1)), 2)
+
+        self.assertEqual(Holder.per_class_once(), "Holder")
+        self.assertEqual(SubHolder.per_class_once(), "SubHolder")  # not inherited
+        self.assertEqual(Holder.per_class_once(), "Holder")
+        self.assertEqual(calls.count(("classmethod", "Holder")), 1)
+
+        Holder.per_class.cache_clear(Holder)
+        second.per_class(1)
+        self.assertEqual(calls.count(("class", 1)), 3)
+
+    def test_lru_eviction(self):
+        calls = []
+
+        class Holder:
+            @memoize(maxsize=2)
+            def square(self, x):
+                calls.append(x)
+                return x * x
+
+        holder = Holder()
+        for x in (1, 2, 1, 3):  # 1 used after 2, so 2 is evicted by 3
+            holder.square(x)
+        self.assertEqual(calls, [1, 2, 3])
+        holder.square(1)
+        holder.square(2)
+        self.assertEqual(calls, [1, 2, 3, 2])
+        self.assertEqual(len(holder._square_memo), 2)
+
+    def test_concurrent_first_access(self):
+        n_threads = 8
+        calls = []
+        barrier = threading.Barrier(n_threads)
+
+        class Holder:
+            @lazy_load_property
+            def slow(self):
+                calls.append(threading.get_ident())
+                time.sleep(0.05)
+                return object()
+
+        holder = Holder()
+        results = []
+
+        def access():
+            barrier.wait()
+            results.append(holder.slow)
+
+        threads = [threading.Thread(target=access) for _ in range(n_threads)]
+        with mock.patch.object(MemoStats, "counting", True):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({id(r) for r in results}), 1)
+        stats = Holder.slow.fget.stats
+        self.assertEqual(stats.misses, 1)
+        self.assertLessEqual(stats.hits, n_threads - 1)  # counted w/o lock
+
+    def test_counted_only_while_counting(self):
+        class Holder:
+            @lazy_load_property
+            def value(self):
+                return 1
+
+        holder = Holder()
+        stats = Holder.value.fget.stats
+        holder.value, holder.value
+        self.assertEqual((stats.misses, stats.hits), (0, 0))
+        with mock.patch.object(MemoStats, "counting", True):
+            holder.value
+        self.assertEqual((stats.misses, stats.hits), (0, 1))
+
+
+class ISO3166TestCase(SimpleTestCase):
+    """
+    Precompiled ISO 3166-1 table, as regenerated from its saved Wikipedia page
+    """
+
+    def test_previously_accepted_names(self):
+        for name, alpha_2 in (
+            ("대한민국", "KR"),
+            ("미국", "US"),
+            ("호주", "AU"),
+            ("터키", "TR"),
+            ("남아프리카 공화국", "ZA"),
+            ("남극", "AQ"),
+            ("유고슬라비아", "YU"),
+        ):
+            with self.subTest(name=name):
+                country = ISO_3166_1.get_country(name=name)
+                self.assertEqual(country.get(ISO_3166_1.alpha_2_key), alpha_2)
+
+    def test_regenerated_from_saved_page(self):
+        html = (
+            "<table><tr><th>국가명</th><th>숫자</th><th>alpha-3</th><th>alpha-2</th></tr>"
+            "<tr><td>호주</td><td>036</td><td>AUS</td><td>AU</td></tr>"
+            "<tr><td>가나</td><td>288</td><td>gha</td><td>gh</td></tr></table>"
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            page, output = (os.path.join(tmpdir, f) for f in ("page.html", "out.py"))
+            with open(page, "w", encoding="utf-8") as f:
+                f.write(html)
+            call_command("buildiso3166", page, output=output, stdout=io.StringIO())
+            namespace = {}
+            with open(output, encoding="utf-8") as f:
+                exec(f.read(), namespace)
+        self.assertEqual(
+            namespace["COUNTRIES"],
+            (("가나", "288", "GHA", "GH"), ("호주", "036", "AUS", "AU")),
+        )
+
+
+class CreateOrMergeTestCase(TestCase):
+    """
+    Rows sharing any unique field value w/ data are searched in one query & merged
+    """
+
+    def setUp(self):
+        self.by_tmdb = Person.objects.create(tmdb_id=1, name="감독")
+        self.by_kmdb = Person.objects.create(
+            kmdb_id="00000001", en_name="Director", avatar_url="https://a.b/c.jpg"
+        )
+        self.other = Person.objects.create(tmdb_id=2, name="배우")
+
+    def test_fetched_in_one_query(self):
+        serializer = PersonCreateOrMergeSerializer()
+        with self.assertNumQueries(1):
+            fetched = serializer.fetch_instances(
+                [
+                    {"tmdb_id": 1, "kmdb_id": "00000001", "name": "감독"},
+                    {"tmdb_id": 2, "name": "배우"},
+                    {"kmdb_id": "00000001", "name": "감독"},  # shares a row w/ first
+                    {"tmdb_id": 3, "name": "신인"},
+                    {"name": "무명"},  # w/o any lookup
+                    None,
+                ]
+            )
+        self.assertEqual(
+            fetched, [[self.by_tmdb, self.by_kmdb], [self.other], None, [], None, None]
+        )
+
+    def test_merged_across_lookups(self):
+        serializer = PersonCreateOrMergeSerializer(
+            data={"tmdb_id": 1, "kmdb_id": "00000001", "name": "감독"}
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        # search, delete of row merged away (collecting its credits & likes)
+        #   & update of kept one
+        with self.assertNumQueries(5):
+            person = serializer.save()
+
+        self.assertEqual(person.pk, self.by_tmdb.pk)  # lowest pk kept
+        self.assertFalse(Person.objects.filter(pk=self.by_kmdb.pk).exists())
+        self.assertEqual(
+            Person.objects.values_list("pk", flat=True).get(
+                tmdb_id=1, kmdb_id="00000001"
+            ),
+            self.by_tmdb.pk,
+        )
+        self.assertEqual(Person.objects.count(), 2)
+
+
+class BulkCreateChildrenTestCase(TestCase):
+    """
+    Movie registered w/ new children bulk created same as w/ children saved one by one
+      (rows, skipped child errors & signals received of saved rows)
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.kept = Person.objects.create(tmdb_id=1, name="봉준호")
+        cls.merged = Person.objects.create(kmdb_id="00000002", name="봉준호")
+
+    payload = {
+        "title": "기생충",
+        "genres": [{"name": "드라마"}],
+        "credits": [
+            # person merged into `kept` (& deleted) while saving next credit
+            {
+                "job": "actor",
+                "person": {"kmdb_id": "00000002", "name": "봉준호"},
+                "role_name": "행인",
+            },
+            {
+                "job": "director",
+                "person": {"tmdb_id": 1, "kmdb_id": "00000002", "name": "봉준호"},
+            },
+            {"job": "actor", "person": {"name": "송강호"}, "role_name": "기택"},
+            {"job": "actor", "person": {}},
+        ],
+        "poster_set": [
+            {"image_url": "https://image.watchb.com/1.jpg", "is_main": True},
+            {"image_url": "not a url", "is_main": False},
+        ],
+        "video_set": [
+            {"site": "youtube", "external_id": "abcdefghijk", "title": "예고편"},
+            {"site": "youtube", "external_id": "short"},
+        ],
+    }
+
+    def register(self, bulk: bool) -> dict:
+        """
+        Registered rows, skipped errors & signals (rolled back after)
+        """
+        saved, added = set(), set()
+
+        def on_save(sender, instance, created: bool, **kwargs):
+            saved.add((sender, instance.pk, created))
+
+        def on_m2m(sender, instance, action: str, pk_set, **kwargs):
+            if action == "post_add":
+                added.update((sender, instance.pk, pk) for pk in pk_set)
+
+        post_save.connect(on_save, weak=False)
+        m2m_changed.connect(on_m2m, weak=False)
+        try:
+            with transaction.atomic(), mock.patch.object(
+                MovieRegisterSerializer.Meta, "bulk_create_children", bulk
+            ):
+                serializer = MovieRegisterSerializer(data=copy.deepcopy(self.payload))
+                self.assertTrue(serializer.is_valid(), serializer.errors)
+                movie = serializer.save()
+                children = [
+                    *((Credit, c.pk) for c in movie.credits.all()),
+                    *((Poster, p.pk) for p in movie.poster_set.all()),
+                    *((Video, v.pk) for v in movie.video_set.all()),
+                ]
+                genres = Movie.genres.through.objects.filter(movie=movie)
+                result = {
+                    "credits": sorted(
+                        movie.credits.values_list("person_id", "job", "role_name")
+                    ),
+                    "posters": list(movie.poster_set.values_list("image_url")),
+                    "videos": list(movie.video_set.values_list("external_id")),
+                    "merged": Person.objects.filter(pk=self.merged.pk).exists(),
+                    "skipped": serializer.skipped_errors,
+                    "unsignaled_children": [
+                        (model, pk)
+                        for model, pk in children
+                        if (model, pk, True) not in saved
+                    ],
+                    "unsignaled_links": [
+                        link
+                        for link in genres.values_list("movie_id", "genre_id")
+                        if (Movie.genres.through, *link) not in added
+                    ],
+                }
+                transaction.set_rollback(True)
+        finally:
+            post_save.disconnect(on_save)
+            m2m_changed.disconnect(on_m2m)
+        return result
+
+    def test_parity(self):
+        bulk, one_by_one = self.register(bulk=True), self.register(bulk=False)
+        self.assertEqual(bulk, one_by_one)
+        self.assertEqual(len(bulk["credits"]), 2)
+        self.assertIn((self.kept.pk, "director", ""), bulk["credits"])
+        self.assertEqual((len(bulk["posters"]), len(bulk["videos"])), (1, 1))
+        self.assertEqual(bulk["unsignaled_children"], [])
+        self.assertEqual(bulk["unsignaled_links"], [])
+
+    def test_skipped_child_errors(self):
+        skipped = self.register(bulk=True)["skipped"]
+        self.assertEqual([bool(e) for e in skipped["credits"]], [0, 0, 0, 1])
+        self.assertEqual([bool(e) for e in skipped["poster_set"]], [0, 1])
+        self.assertEqual([bool(e) for e in skipped["video_set"]], [0, 1])
+
+    def test_drop_cascaded(self):
+        result = self.register(bulk=True)
+        self.assertFalse(result["merged"])  # merged into `kept`, w/ its credit
+        self.assertNotIn("행인", [role for _, _, role in result["credits"]])
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class InstrumentationTestCase(TestCase):
+    """
+    Span histograms, their JSON & Prometheus export, `instrument` command & metrics API
+    """
+
+    def setUp(self):
+        self.was_enabled = registry.enabled
+        registry.reset()
+
+    def tearDown(self):
+        registry.enabled = self.was_enabled
+        registry.reset()
+
+    def test_histogram_bucketing(self):
+        histogram = Histogram(buckets=(0.1, 1.0, inf))
+        for seconds in (0.05, 0.1, 0.5, 2.0):  # bucket bounds are inclusive (le)
+            histogram.observe(seconds)
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.cumulative_counts(), [2, 3, 4])
+        self.assertEqual(
+            (histogram.count, histogram.min, histogram.max), (4, 0.05, 2.0)
+        )
+        self.assertAlmostEqual(histogram.sum, 2.65)
+
+    def test_export(self):
+        local = Registry(enabled=True)
+        local.observe("agent.request", (("agent", 'tm"db'),), 0.2)
+        local.observe("agent.request", (("agent", 'tm"db'),), 20.0)
+        snapshot = local.snapshot()
+        self.assertEqual(json.loads(json.dumps(snapshot)), snapshot)
+        self.assertEqual(snapshot[0]["count"], 2)
+        self.assertEqual(snapshot[0]["buckets"][-1], ["+Inf", 2])
+        self.assertEqual(snapshot[0]["buckets"][-2], [10.0, 1])
+
+        lines = Registry.to_prometheus(snapshot).splitlines()
+        self.assertEqual(lines[1], "# TYPE watchb_span_seconds histogram")
+        labels = 'span="agent.request",agent="tm\\"db"'
+        self.assertIn(f'watchb_span_seconds_bucket{{{labels},le="+Inf"}} 2', lines)
+        self.assertIn(f"watchb_span_seconds_count{{{labels}}} 2", lines)
+        self.assertIn(f"watchb_span_seconds_sum{{{labels}}} 20.2", lines)
+
+    def test_instrument_command(self):
+        def command(name, *args):
+            self.assertTrue(registry.enabled)
+            with span("command", command=name):
+                pass
+
+        registry.disable()
+        stdout = io.StringIO()
+        with mock.patch(
+            "movies.management.commands.instrument.call_command", side_effect=command
+        ) as called:
+            call_command("instrument", "crawlmovies", "-c", "1", stdout=stdout)
+        called.assert_called_once_with("crawlmovies", "-c", "1")
+        self.assertFalse(registry.enabled)
+        [exported] = json.loads(stdout.getvalue())
+        self.assertEqual(
+            (exported["name"], exported["tags"]),
+            ("command", {"command": "crawlmovies"}),
+        )
+
+        with self.assertRaises(CommandError):
+            call_command("instrument", stdout=io.StringIO())
+
+    def test_metrics_view_admin_only(self):
+        registry.observe("agent.request", (), 0.2)
+        user = User.objects.create_user(
+            email="user@watchb.com", username="user", password="watchb1234!"
+        )
+        admin = User.objects.create_user(
+            email="admin@watchb.com",
+            username="admin",
+            password="watchb1234!",
+            is_staff=True,
+        )
+        client = APIClient()
+        self.assertIn(client.get("/api/metrics/").status_code, (401, 403))
+        client.force_authenticate(user)
+        self.assertEqual(client.get("/api/metrics/").status_code, 403)
+
+        client.force_authenticate(admin)
+        response = client.get("/api/metrics/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["name"], "agent.request")
+        response = client.get("/api/metrics/", {"format": "prometheus"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'watchb_span_seconds_count{span="agent.request"} 1',
+            response.content.decode(),
+        )
+
+
+class TitleSerializer(ModelSerializer):
+    class Meta:
+        model = Movie
+        fields = ["title"]
+
+    def create(self, validated_data):
+        movie = super().create(validated_data)
+        if movie.title == "bad":
+            raise DatabaseError("bad movie")
+        return movie
+
+
+class ReusedTitleSerializer(ReusableFieldsMixin, TitleSerializer):
+    pass
+
+
+class ReusableFieldsTestCase(TestCase):
+    """
+    Fields tree reused by one live instance at a time, handed over once it is done
+    """
+
+    def serializer(self, title: str) -> ReusedTitleSerializer:
+        serializer = ReusedTitleSerializer(
+            data={"title": title}, reuse_fields=True, context={"title": title}
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        return serializer
+
+    def assertBound(self, serializer: ReusedTitleSerializer):
+        field = serializer.fields["title"]
+        self.assertIs(field.parent, serializer)
+        self.assertIs(field.root, serializer)
+        self.assertEqual(field.context, serializer.context)
+
+    def test_two_live_instances(self):
+        first = self.serializer("first")
+        tree = first.fields
+        second = self.serializer("second")
+        self.assertIsNot(second.fields, tree)  # built its own while first is live
+        self.assertBound(first)
+        self.assertBound(second)
+
+        self.assertEqual(first.save().title, "first")
+        self.assertEqual(first.data, {"title": "first"})
+        self.assertEqual(second.save().title, "second")
+        self.assertEqual(second.data, {"title": "second"})
+
+    def test_handed_over_once_done(self):
+        first = self.serializer("first")
+        tree = first.fields
+        first.save()
+
+        second = self.serializer("second")
+        self.assertIs(second.fields, tree)  # reused after first was saved
+        self.assertBound(second)
+        self.assertEqual(first.data, {"title": "first"})  # w/ fields rebuilt
+        self.assertBound(first)
+
+        invalid = ReusedTitleSerializer(data={}, reuse_fields=True)
+        second.save()
+        self.assertFalse(invalid.is_valid())  # validated w/ tree & done w/ it
+        self.assertIs(self.serializer("third").fields, tree)
+
+
+class ListingCrawler(MultiListMixin):
+    def get_or_detail(self, movie: SimpleMovieFromTMDB) -> Movie:
+        self.detailed.append(movie.id)
+        return Movie(tmdb_id=movie.id, title=movie.title)
+
+    def serialize(self, movie_fetched: SimpleMovieFromTMDB) -> dict[str, Any]:
+        raise NotImplementedError
+
+
+class MultiListTestCase(SimpleTestCase):
+    """
+    Movies listed from several sources merged in listed order & detailed once each,
+      w/ sources given by list methods & queries (from CLI & query file)
+    """
+
+    def setUp(self):
+        def search_movies(query: str, year=None, max_count=None):
+            return {
+                "기생충": [SimpleMovieFromTMDB(id=2, title="기생충"), self.movies[2]],
+                "괴물": [self.movies[3]],
+            }[query]
+
+        self.movies = {
+            i: SimpleMovieFromTMDB(id=i, title=title)
+            for i, title in ((1, "살인의 추억"), (2, "Parasite"), (3, "괴물"))
+        }
+        self.crawler = ListingCrawler()
+        self.crawler.detailed = []
+        self.crawler.tmdb_agent = mock.Mock(
+            popular_movies=mock.Mock(return_value=[self.movies[1], self.movies[2]]),
+            search_movies=mock.Mock(side_effect=search_movies),
+        )
+
+    def options(self, *args: str) -> dict[str, Any]:
+        parser = CrawlMoviesCommand().create_parser("manage.py", "crawlmovies")
+        return vars(parser.parse_args(["-dm", "TMDB", *args]))
+
+    def test_merged_w_duplicates_detailed_once(self):
+        results = self.crawler.run(
+            sources=[
+                ("Popular", {"max_count": None}),
+                ("Search", {"query": "기생충"}),
+                ("Search", {"query": "괴물"}),
+            ]
+        )
+        self.assertEqual(self.crawler.detailed, [1, 2, 3])
+        self.assertEqual(
+            [(m.title, s) for m, s in results],
+            [("살인의 추억", None), ("Parasite", None), ("괴물", None)],
+        )
+
+    def test_list_sources(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("# 봉준호\n괴물\n\n  기생충  \n괴물\n")
+        self.addCleanup(os.remove, f.name)
+        command = CrawlMoviesCommand()
+        self.assertEqual(
+            command.list_sources(
+                self.options(
+                    "-lm", "Popular", "Search", "Popular", "-q", "기생충", "-c", "5"
+                )
+            ),
+            [
+                ("Popular", {"max_count": 5}),
+                ("Search", {"query": "기생충", "max_count": 5}),
+            ],
+        )
+        self.assertEqual(
+            command.list_sources(self.options("--query-file", f.name, "-y", "2006")),
+            [
+                ("Search", {"query": "괴물", "max_count": None, "year": 2006}),
+                ("Search", {"query": "기생충", "max_count": None, "year": 2006}),
+            ],
+        )
+        for args in ((), ("-lm", "Search")):
+            with self.subTest(args=args), self.assertRaises(CommandError):
+                command.list_sources(self.options(*args))
+
+
+class TitleCrawler(APICrawler):
+    serializer_class = TitleSerializer
+
+    def fetch(self, titles: list[str]) -> list[str]:
+        return titles
+
+    def serialize(self, title: str) -> dict[str, str]:
+        return {"title": title}
+
+
+class BatchingTestCase(TransactionTestCase):
+    """
+    Movies committed in batches, each saved in its own savepoint
+    """
+
+    def titles(self) -> list[str]:
+        return list(Movie.objects.order_by("pk").values_list("title", flat=True))
+
+    def test_committed_in_batches(self):
+        crawler = TitleCrawler()
+        crawler.commit_every = 2
+        results = crawler.run(["A", "B", "C"])
+        self.assertEqual([movie.title for movie, _ in results], ["A", "B", "C"])
+        self.assertFalse(connection.in_atomic_block)
+        self.assertEqual(self.titles(), ["A", "B", "C"])
+
+    def test_bad_movie_rolls_back_own_savepoint(self):
+        for commit_every in (2, 10):  # bad movie in 2nd batch or w/ all in 1st
+            with self.subTest(commit_every=commit_every):
+                Movie.objects.all().delete()
+                crawler = TitleCrawler()
+                crawler.commit_every = commit_every
+                with self.assertRaises(DatabaseError):
+                    crawler.run(["A", "B", "C", "bad", "D"])
+                self.assertFalse(connection.in_atomic_block)
+                self.assertEqual(self.titles(), ["A", "B", "C"])
+
+    def test_committed_before_network_io(self):
+        class RequestingCrawler(TitleCrawler):
+            def serialize(self, title: str) -> dict[str, str]:
+                if title == "C":
+                    with self.stage("detail"):
+                        committed.append(not connection.in_atomic_block)
+                return super().serialize(title)
+
+        committed = []
+        crawler = RequestingCrawler()
+        crawler.commit_every = 10
+        crawler.run(["A", "B", "C", "D"])
+        self.assertEqual(committed, [True])
+        self.assertEqual(self.titles(), ["A", "B", "C", "D"])
+
+    def test_batch_bounded_by_busy_timeout(self):
+        crawler = TitleCrawler()
+        crawler.commit_interval = 60
+        self.assertEqual(crawler.max_batch_seconds, 2.5)  # sqlite3 default timeout: 5 s
+        with mock.patch.dict(connection.settings_dict["OPTIONS"], timeout=20):
+            self.assertEqual(crawler.max_batch_seconds, 10)
+
+    def test_connection_restored(self):
+        def pragmas() -> tuple:
+            with connection.cursor() as cursor:
+                return tuple(
+                    cursor.execute(f"PRAGMA {pragma}").fetchone()[0]
+                    for pragma in ("journal_mode", "synchronous")
+                )
+
+        before = pragmas()
+        crawler = TitleCrawler()
+        crawler.commit_interval = 60
+        with crawler.batching():
+            self.assertEqual(pragmas()[1], 1)  # NORMAL
+        self.assertEqual(pragmas(), before)
+
+
+class SlottedDataclassTestCase(SimpleTestCase):
+    """
+    Leaf API response dataclasses w/o per-instance dict & w/ low cardinality
+      strings interned, comparing same as dict-backed ones
+    """
+
+    def test_slotted_leaves(self):
+        payload = benchmarks.fake_tmdb_movie_payload(1)
+        crew = [custom_types.CrewFromTMDB(**c) for c in payload["credits"]["crew"]]
+        for leaf in (
+            crew[0],
+            custom_types.ImageFromTMDB(**payload["images"]["posters"][0]),
+            custom_types.VideoFromTMDB(**payload["videos"]["results"][0]),
+            custom_types.MovieCreditsFromTMDB(**payload["credits"]),
+        ):
+            with self.subTest(dataclass=type(leaf).__name__):
+                self.assertFalse(hasattr(leaf, "__dict__"))
+                with self.assertRaises(AttributeError):
+                    leaf.undefined = None
+                self.assertEqual(leaf, type(leaf)(**asdict(leaf)))
+
+        @flexible_dataclass
+        class DictCrew:
+            id: int
+            name: str
+            job: str
+
+        dict_crew = DictCrew(**payload["credits"]["crew"][0])
+        self.assertEqual(astuple(dict_crew), astuple(crew[0]))
+        self.assertNotEqual(crew[0], crew[1])
+        self.assertEqual(
+            custom_types.CrewFromTMDB(**payload["credits"]["crew"][0], extra=1),
+            crew[0],
+        )
+
+    def test_interned(self):
+        job = "".join(["Dir", "ector"])  # built at runtime, so not interned yet
+        crew = [custom_types.CrewFromTMDB(id=i, name="", job=job) for i in range(2)]
+        self.assertIs(crew[0].job, sys.intern("Director"))
+        self.assertIs(crew[0].job, crew[1].job)
+        self.assertIsNone(
+            custom_types.ImageFromTMDB(file_path="/", vote_count=0).iso_639_1
+        )
+
+
+class TypeHintPlansTestCase(SimpleTestCase):
+    """
+    Type hints & converter plans resolved once per dataclass, same as resolved
+      from uncached type hints
+    """
+
+    def test_same_as_uncached(self):
+        for cls in vars(custom_types).values():
+            if not (is_dataclass(cls) and issubclass(cls, TypeHintsMixin)):
+                continue
+            with self.subTest(dataclass=cls.__name__):
+                type_hints = cls._with_args_kwargs()
+                self.assertEqual(cls.class_type_hints(), type_hints)
+                if issubclass(cls, EmptyStringToNoneMixin):
+                    self.assertEqual(
+                        cls.optional_string_field_names(),
+                        tuple(
+                            f.name
+                            for f in fields(cls)
+                            if cls.is_optional_string_type(type_hints[f.name])
+                        ),
+                    )
+                if issubclass(cls, NestedInitMixin):
+                    self.assertEqual(
+                        [(fname, case) for fname, case, _ in cls.nested_fields_plan()],
+                        [
+                            (f.name, case)
+                            for f in fields(cls)
+                            if (case := cls.nested_case(type_hints[f.name]))
+                        ],
+                    )
+
+    def test_resolved_per_class(self):
+        @flexible_dataclass(slots=True)
+        class NamedVideo(custom_types.VideoFromTMDB):
+            nickname: Optional[str] = None
+
+        self.assertEqual(
+            custom_types.VideoFromTMDB.optional_string_field_names(),
+            ("name", "published_at", "iso_639_1"),
+        )
+        self.assertEqual(
+            NamedVideo.optional_string_field_names(),
+            ("name", "published_at", "iso_639_1", "nickname"),
+        )
+        video = NamedVideo(site="YouTube", key="k", name="", nickname="")
+        self.assertEqual((video.name, video.nickname), (None, None))
+
+        credits = custom_types.MovieCreditsFromTMDB(
+            cast=[{"id": 1, "name": "송강호", "character": ""}], crew=[]
+        )
+        self.assertEqual(
+            credits.cast, [custom_types.CastFromTMDB(id=1, name="송강호", character="")]
+        )
+
+
+class StageProfilingTestCase(TestCase):
+    """
+    Wall time & calls of each crawling stage reported by `crawlmovies --profile`,
+      w/ cProfile stats dumped or memory traced per stage
+    """
+
+    def crawl(self, tmdb_id: int, *args: str) -> str:
+        movie = custom_types.MovieFromTMDB(
+            **benchmarks.fake_tmdb_movie_payload(tmdb_id)
+        )
+        stdout = io.StringIO()
+        with mock.patch.object(
+            TMDBAPIAgent,
+            "popular_movies",
+            return_value=[custom_types.SimpleMovieFromTMDB(id=tmdb_id, title="")],
+        ), mock.patch.object(
+            TMDBAPIAgent, "movie_detail", return_value=movie
+        ), mock.patch.object(
+            TMDBAPIAgent, "image_base_url", "https://image.tmdb.org/t/p/original"
+        ), mock.patch.object(
+            MemoStats, "counting", False
+        ), benchmarks.no_person_lookup():
+            call_command(
+                "crawlmovies",
+                *("-lm", "Popular", "-dm", "TMDB", "--tmdb-token", "token"),
+                *args,
+                stdout=stdout,
+            )
+        return stdout.getvalue()
+
+    def stage_calls(self, output: str) -> dict[str, int]:
+        return {
+            m["stage"]: int(m["calls"])
+            for m in re.finditer(
+                r"^(?P<stage>\w+) +(?P<calls>\d+) +[\d.]+ +[\d.]+$", output, re.M
+            )
+        }
+
+    def test_stages(self):
+        output = self.crawl(1, "--profile", "stages")
+        self.assertIn("Registered: 1", output)
+        self.assertEqual(
+            self.stage_calls(output),
+            {"list": 1, "detail": 1, "serialize": 1, "validate": 1, "save": 1},
+        )
+
+    def test_cprofile(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = self.crawl(2, "--profile", "cprofile", "--profile-dir", tmpdir)
+            self.assertEqual(
+                sorted(os.listdir(tmpdir)),
+                sorted(f"{stage}.prof" for stage in self.stage_calls(output)),
+            )
+        self.assertIn("detail", self.stage_calls(output))
+
+    def test_memory(self):
+        output = self.crawl(3, "--profile", "memory")
+        for stage in self.stage_calls(output):
+            self.assertRegex(output, rf"\[{stage}\] peak: [\d.]+ MiB")
+        self.assertIn("save", self.stage_calls(output))
+
+
+class SerializePlanTestCase(TestCase):
+    """
+    Serialize methods resolved once per class into plans, serializing same as
+      `serialize_<field name>` methods looked up per field
+    """
+
+    def setUp(self):
+        self.crawler = benchmarks.BenchmarkCrawler()
+        self.movies = [
+            benchmarks.parse(
+                json.dumps(benchmarks.fake_tmdb_movie_payload(i)),
+                json.dumps(benchmarks.fake_kmdb_movie_payload(i)),
+            )
+            for i in range(1, 4)
+        ]
+
+    def test_serialized_same_as_getattr(self):
+        crawler = self.crawler
+        with benchmarks.no_person_lookup():
+            for tmdb_movie, kmdb_movie in self.movies:
+                self.assertEqual(
+                    benchmarks.plan_serialize_fields(crawler, tmdb_movie, kmdb_movie),
+                    benchmarks.getattr_serialize_fields(
+                        crawler, tmdb_movie, kmdb_movie
+                    ),
+                )
+                self.assertEqual(
+                    crawler.serialize(tmdb_movie, None),
+                    {
+                        fname: serialized
+                        for fname in TMDBSerializeMixin.fields_to_serialize
+                        if (
+                            serializer := getattr(
+                                TMDBSerializeMixin, f"serialize_{fname}", False
+                            )
+                        )
+                        and (serialized := serializer(crawler, tmdb_movie))
+                    },
+                )
+
+    def test_resolved_once_per_class(self):
+        class UpperTitleMixin(TMDBSerializeMixin):
+            def serialize_title(self, movie_fetched, filtered=None) -> str:
+                return movie_fetched.title.upper()
+
+        fields = ["title", "no_such_field", "running_time"]
+        plan = UpperTitleMixin.serialize_plan(fields)
+        self.assertIs(UpperTitleMixin.serialize_plan(tuple(fields)), plan)
+        self.assertEqual(
+            plan,
+            (
+                ("title", UpperTitleMixin.serialize_title),
+                ("running_time", TMDBSerializeMixin.serialize_running_time),
+            ),
+        )
+        self.assertEqual(
+            TMDBSerializeMixin.serialize_plan(fields)[0],
+            ("title", TMDBSerializeMixin.serialize_title),
+        )
+        self.assertIs(
+            self.crawler.complementary_plan(),
+            benchmarks.BenchmarkCrawler.complementary_plan(),
+        )
+
+
+class LazyDecodingTestCase(TestCase):
+    """
+    Nested arrays decoded lazily (& projected) serialized same as decoded eagerly
+    """
+
+    def test_converted_on_every_read(self):
+        raw = [{"file_path": f"/{i}.jpg", "vote_count": i} for i in range(3)]
+        images = LazyDataClassList(raw, convert=lambda item: ImageFromTMDB(**item))
+        self.assertEqual(len(images), 3)
+        self.assertIsInstance(images[1:][0], ImageFromTMDB)
+        for converted in (list(images), [*reversed(images)], [images[-1]]):
+            self.assertTrue(all(isinstance(i, ImageFromTMDB) for i in converted))
+        self.assertEqual(images, [ImageFromTMDB(**item) for item in raw])
+        self.assertEqual(images.index(ImageFromTMDB(**raw[2])), 2)
+        self.assertNotIn(raw[0], images)
+
+    def test_projected_decoding_parity(self):
+        crawler = benchmarks.BenchmarkCrawler()
+        responses = [
+            (
+                json.dumps(benchmarks.fake_tmdb_movie_payload(i)),
+                json.dumps(benchmarks.fake_kmdb_movie_payload(i)),
+            )
+            for i in range(1, 4)
+        ]
+        serialized = {}
+        with benchmarks.no_person_lookup():
+            for lazy_decoding in (False, True):
+                crawler.lazy_decoding = lazy_decoding
+                serialized[lazy_decoding] = []
+                for tmdb_json, kmdb_json in responses:
+                    with crawler.decoding():
+                        movies = benchmarks.parse(tmdb_json, kmdb_json)
+                    serialized[lazy_decoding].append(crawler.serialize(*movies))
+        self.assertEqual(serialized[True], serialized[False])
+        self.assertTrue(all(movie["credits"] for movie in serialized[True]))
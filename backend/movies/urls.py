@@ -4,6 +4,7 @@ from rest_framework.routers import DefaultRouter
 from . import views
 
 router = DefaultRouter()
+router.register("movies", views.MovieViewSet, basename="movie")
 router.register("ratings", views.RatingViewSet, basename="rating")
 router.register("reviews", views.ReviewViewSet, basename="review")
 router.register("wishlists", views.RatingViewSet, basename="wishlist")
@@ -12,4 +13,20 @@ router.register("blocklists", views.RatingViewSet, basename="blocklist")
 urlpatterns = [
     *router.urls,
     path("movies/<int:pk>/", views.MovieRetrieveView.as_view(), name="movie-detail"),
+    path(
+        "movies/<int:pk>/similar/",
+        views.SimilarMoviesView.as_view(),
+        name="movie-similar",
+    ),
+    path(
+        "movies/<int:pk>/predicted-rating/",
+        views.PredictedRatingView.as_view(),
+        name="movie-predicted-rating",
+    ),
+    path(
+        "recommendations/", views.RecommendationView.as_view(), name="recommendations"
+    ),
+    path("feed/", views.FeedView.as_view(), name="feed"),
+    path("search/", views.SearchView.as_view(), name="search"),
+    path("autocomplete/", views.AutocompleteView.as_view(), name="autocomplete"),
 ]
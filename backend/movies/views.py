@@ -1,21 +1,58 @@
+from typing import Any
+
 from accounts.permissions import IsAuthorOrAdmin
-from rest_framework.generics import RetrieveAPIView
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch, QuerySet, Subquery
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework.mixins import CreateModelMixin, DestroyModelMixin, UpdateModelMixin
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 
-from movies.models import Blocklist, Movie, Rating, Review, Wishlist
-from views import CollectUserFromRequestMixin, SearchAndIndexModelMixin
+from movies.models import (
+    Blocklist,
+    Credit,
+    FeedEntry,
+    Movie,
+    Poster,
+    Rating,
+    Review,
+    Wishlist,
+)
+from paginations import KeysetCursorPagination
+from views import (
+    CollectUserFromRequestMixin,
+    SearchAndIndexModelMixin,
+    SearchAndListModelMixin,
+)
 
+from .aggregates import update_rating_aggregates
+from .autocomplete import autocompleter
+from .caches import movie_detail_cache
+from .factorization import factor_store
+from .feeds import feed
+from .recommendations import ranked_movies, recommend, similar_movies
+from .search import movie_search_index, person_search_index
 from .serializers import (
+    AutocompleteQuerySerializer,
     BlocklistCreateSerializer,
+    FeedEntrySerializer,
+    LimitQuerySerializer,
+    MovieListSerializer,
     MovieRetrieveSerializer,
+    PersonListSerializer,
+    RankedMovieSerializer,
     RatingCreateSerializer,
     RatingListSerializer,
     RatingUpdateSerializer,
     ReviewCreateSerializer,
     ReviewListSerializer,
     ReviewUpdateSerializer,
+    SearchQuerySerializer,
     WishlistCreateSerializer,
 )
 
@@ -23,7 +60,215 @@ from .serializers import (
 class MovieRetrieveView(RetrieveAPIView):
     serializer_class = MovieRetrieveSerializer
     permission_classes = [AllowAny]
-    queryset = Movie.objects.all()
+    queryset = Movie.objects.prefetch_related(
+        "countries",
+        "genres",
+        Prefetch("credits", queryset=Credit.objects.select_related("person")),
+        "poster_set",
+        "still_set",
+        "video_set",
+    )
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        """
+        Movie detail from versioned cache w/ strong ETag (304 on matching If-None-Match)
+        """
+        pk = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        if (cached := movie_detail_cache.get(pk)) is None:
+            version = movie_detail_cache.version(pk)  # read before rendering
+            cached = movie_detail_cache.set(
+                pk, self.get_serializer(self.get_object()).data, version
+            )
+
+        etag, data = cached
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return Response(data, headers={"ETag": etag})
+
+
+class MovieCursorPagination(KeysetCursorPagination):
+    ordering = ("-release_date", "-id")
+    ordering_choices = {
+        "-release_date": ("-release_date", "-id"),
+        "release_date": ("release_date", "id"),
+        "-id": ("-id",),
+        "id": ("id",),
+    }
+    ordering_query_param = "ordering"
+
+
+class MovieViewSet(SearchAndListModelMixin, GenericViewSet):
+    permission_classes = [AllowAny]
+    queryset = Movie.objects.only(
+        "id",
+        "title",
+        "production_year",
+        "release_date",
+        "film_rating",
+        *Movie.rating_aggregate_fields,
+    ).annotate(
+        main_poster_url=Subquery(
+            Poster.objects.filter(movie=OuterRef("pk"), is_main=True).values(
+                "image_url"
+            )[:1]
+        )
+    )
+    qstring_serializer_class = MovieListSerializer
+    pagination_class = MovieCursorPagination
+    probed_filters = ("genres", "countries")
+
+    def apply_filters(self, queryset: QuerySet, filters: dict[str, Any]) -> QuerySet:
+        """
+        Many-to-many filters as EXISTS probes of each movie walked in ordering index
+          (instead of joining every movie of a genre or country & sorting them all)
+          - rows walked per page grow as the genre or country gets rarer
+        """
+        for name in self.probed_filters:
+            if (value := filters.pop(name, None)) is not None:
+                field = Movie._meta.get_field(name)
+                queryset = queryset.filter(
+                    Exists(
+                        field.remote_field.through.objects.filter(
+                            **{
+                                field.m2m_field_name(): OuterRef("pk"),
+                                field.m2m_reverse_field_name(): value,
+                            }
+                        )
+                    )
+                )
+        return super().apply_filters(queryset, filters)
+
+
+class SearchView(APIView):
+    """
+    Movies & persons ranked by full-text match of `q` (see movies.search)
+    """
+
+    permission_classes = [AllowAny]
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        qstring_serializer = SearchQuerySerializer(data=request.query_params.dict())
+        qstring_serializer.is_valid(raise_exception=True)
+        query, limit = (
+            qstring_serializer.validated_data["q"],
+            qstring_serializer.validated_data["limit"],
+        )
+        movies = movie_search_index.search_queryset(
+            query, limit, queryset=MovieViewSet.queryset
+        )
+        persons = person_search_index.search_queryset(query, limit)
+        return Response(
+            {
+                "movies": MovieListSerializer(movies, many=True).data,
+                "persons": PersonListSerializer(persons, many=True).data,
+            }
+        )
+
+
+class AutocompleteView(APIView):
+    """
+    Popular movies & persons w/ any word starting w/ `q` typed in progress
+      (answered from in-memory prefix indexes, see movies.autocomplete)
+    """
+
+    permission_classes = [AllowAny]
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        qstring_serializer = AutocompleteQuerySerializer(
+            data=request.query_params.dict()
+        )
+        qstring_serializer.is_valid(raise_exception=True)
+        return Response(
+            autocompleter.complete(
+                qstring_serializer.validated_data["q"],
+                qstring_serializer.validated_data["limit"],
+            )
+        )
+
+
+class SimilarMoviesView(APIView):
+    """
+    Top neighbours of a movie by item-item CF (see movies.recommendations)
+    """
+
+    permission_classes = [AllowAny]
+
+    def get(self, request: Request, pk: int, *args, **kwargs) -> Response:
+        qstring_serializer = LimitQuerySerializer(data=request.query_params.dict())
+        qstring_serializer.is_valid(raise_exception=True)
+        movies = ranked_movies(
+            similar_movies(pk, qstring_serializer.validated_data["limit"]),
+            MovieViewSet.queryset,
+        )
+        return Response(RankedMovieSerializer(movies, many=True).data)
+
+
+class RecommendationView(APIView):
+    """
+    Movies recommended to request user from neighbours of movies one rated
+      (w/o ones already rated or blocked)
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        qstring_serializer = LimitQuerySerializer(data=request.query_params.dict())
+        qstring_serializer.is_valid(raise_exception=True)
+        movies = ranked_movies(
+            recommend(request.user.pk, qstring_serializer.validated_data["limit"]),
+            MovieViewSet.queryset,
+        )
+        return Response(RankedMovieSerializer(movies, many=True).data)
+
+
+class PredictedRatingView(APIView):
+    """
+    Score request user is predicted to rate a movie by matrix factorization
+      (null if either is unknown to latest trained factors, see movies.factorization)
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request, pk: int, *args, **kwargs) -> Response:
+        return Response(
+            {"movie": pk, "score": factor_store.predict(request.user.pk, pk)}
+        )
+
+
+class FeedCursorPagination(KeysetCursorPagination):
+    ordering = ("-created_at", "-id")
+
+
+class FeedView(ListAPIView):
+    """
+    Activities of users request user follows, latest first (see movies.feeds)
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = FeedEntrySerializer
+    pagination_class = FeedCursorPagination
+
+    def get_queryset(self):
+        return (
+            FeedEntry.objects.filter(owner=self.request.user)
+            .select_related("actor", "movie")
+            .only(
+                "kind",
+                "object_id",
+                "created_at",
+                "actor__username",
+                "actor__avatar",
+                "movie__title",
+                "movie__production_year",
+            )
+        )
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        if not request.query_params.get(self.paginator.cursor_query_param):
+            feed.refresh(request.user.pk)  # first page
+        page = feed.hydrate(self.paginate_queryset(self.get_queryset()))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
 
 
 class RatingViewSet(
@@ -36,6 +281,7 @@ class RatingViewSet(
 ):
     queryset = Rating.objects.all()
     qstring_serializer_class = RatingListSerializer
+    pagination_class = KeysetCursorPagination
 
     def get_permissions(self):
         if self.action == "create":
@@ -55,6 +301,34 @@ class RatingViewSet(
         else:
             return super().get_serializer_class()
 
+    @transaction.atomic
+    def perform_create(self, serializer: RatingCreateSerializer):
+        rating = serializer.save()
+        update_rating_aggregates(rating.movie_id, added=rating.score)
+
+    @transaction.atomic
+    def perform_update(self, serializer: RatingUpdateSerializer):
+        # score re-read locked, as instance was fetched before (& out of) transaction
+        removed = (
+            Rating.objects.select_for_update()
+            .values_list("score", flat=True)
+            .get(pk=serializer.instance.pk)
+        )
+        rating = serializer.save()
+        update_rating_aggregates(rating.movie_id, added=rating.score, removed=removed)
+
+    @transaction.atomic
+    def perform_destroy(self, instance: Rating):
+        removed = (
+            Rating.objects.select_for_update()
+            .values_list("score", flat=True)
+            .filter(pk=instance.pk)
+            .first()
+        )
+        if removed is not None:  # not deleted meanwhile
+            instance.delete()
+            update_rating_aggregates(instance.movie_id, removed=removed)
+
 
 class ReviewViewSet(
     SearchAndIndexModelMixin,
@@ -66,6 +340,7 @@ class ReviewViewSet(
 ):
     queryset = Review.objects.all()
     qstring_serializer_class = ReviewListSerializer
+    pagination_class = KeysetCursorPagination
 
     def get_permissions(self):
         if self.action == "create":
@@ -0,0 +1,219 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+from typing import Any, Mapping, Optional, Type
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import F, Field, Model, Q, QuerySet
+from django.db.models.expressions import OrderBy
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Cursor pagination seeking by the keyset of unique `ordering` fields (w/o OFFSET)
+      - cursor: encoded `ordering` field values of the last item of previous page
+      - works for both flat & `index_key` grouped (IndexedListSerializer) list data
+        (ordered by index column first, so that groups stay contiguous across pages)
+      - w/ `ordering_query_param`, clients choose ordering among `ordering_choices`
+      - NULL sorts first in ascending & last in descending order (as SQLite does)
+      - each page is sought by index w/o sorting (items w/ NULL of leading field
+        sought after or before others, by one more query on the page crossing them)
+    """
+
+    ordering = ("-created_at", "-id")  # should end w/ unique field
+    ordering_choices: Mapping[str, tuple[str, ...]] = {}
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    ordering_query_param: Optional[str] = None
+    invalid_cursor_message = _("Invalid cursor")
+    invalid_ordering_message = _("Invalid ordering. Expected one of {choices}.")
+
+    @property
+    def query_params(self) -> tuple[str, ...]:
+        return tuple(
+            filter(
+                None,
+                (
+                    self.cursor_query_param,
+                    self.page_size_query_param,
+                    self.ordering_query_param,
+                ),
+            )
+        )
+
+    def get_ordering(self, model: Type[Model], view=None) -> tuple[str, ...]:
+        """
+        `ordering` (or one chosen by client) led by index column (`*_id` for foreign key)
+          when listing w/ `index_key`
+        """
+        ordering = self.ordering
+        if self.ordering_query_param and (
+            chosen := self.request.query_params.get(self.ordering_query_param)
+        ):
+            if chosen not in self.ordering_choices:
+                raise ValidationError(
+                    {
+                        self.ordering_query_param: [
+                            self.invalid_ordering_message.format(
+                                choices=list(self.ordering_choices)
+                            )
+                        ]
+                    }
+                )
+            ordering = self.ordering_choices[chosen]
+
+        if index_key := getattr(view, "index_key", None):
+            try:
+                index_field = model._meta.get_field(index_key)
+            except FieldDoesNotExist:
+                pass  # left for serializer to reject
+            else:
+                if attname := getattr(index_field, "attname", None):
+                    return (attname, *ordering)
+        return ordering
+
+    def get_ordering_fields(
+        self, model: Type[Model], ordering: tuple[str, ...]
+    ) -> list[tuple[Field, bool]]:
+        """
+        (model field, whether descending) for each ordering field
+        """
+        return [
+            (model._meta.get_field(o.lstrip("-")), o.startswith("-")) for o in ordering
+        ]
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view=None
+    ) -> list[Model]:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        ordering = self.get_ordering(queryset.model, view)
+        self.ordering_fields = self.get_ordering_fields(queryset.model, ordering)
+
+        queryset = queryset.order_by(*self.order_by())
+        if cursor := request.query_params.get(self.cursor_query_param):
+            segments = self.after(self.decode_cursor(cursor))
+        else:
+            segments = [Q()]
+
+        page = []
+        for segment in segments:
+            page.extend(queryset.filter(segment)[: self.page_size + 1 - len(page)])
+            if len(page) > self.page_size:
+                break
+        self.has_next = len(page) > self.page_size
+        self.page = page[: self.page_size]
+        return self.page
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def order_by(self) -> list[str | OrderBy]:
+        """
+        Ordering expressions w/ explicit NULL placement for nullable fields
+        """
+        return [
+            (
+                F(f.attname).desc(nulls_last=True)
+                if desc
+                else F(f.attname).asc(nulls_first=True)
+            )
+            if f.null
+            else f"{'-' if desc else ''}{f.attname}"
+            for f, desc in self.ordering_fields
+        ]
+
+    def after(self, position: list[Any]) -> list[Q]:
+        """
+        Items after position in ordering, as segments to seek one after another
+          (a > x) | (a = x & b > y) | (a = x & b = y & c > z) ...
+          - NULL is before any value ascending & after any value descending
+          - items w/ NULL & w/ values of leading field are separate segments
+          - values segment bounded by a >= x, so that index led by `a` is searched
+            from position (instead of sorting items of each disjunct merged)
+        """
+        (first, first_desc), first_value = self.ordering_fields[0], position[0]
+        values, nulls = [], []
+        conditions = nulls if first_value is None else values
+        equals = Q()
+        for (field, desc), value in zip(self.ordering_fields, position):
+            name = field.attname
+            if value is None:
+                if not desc:
+                    (values if field is first else conditions).append(
+                        equals & Q(**{f"{name}__isnull": False})
+                    )
+                equals &= Q(**{f"{name}__isnull": True})
+            else:
+                conditions.append(
+                    equals & Q(**{f"{name}__{'lt' if desc else 'gt'}": value})
+                )
+                if desc and field.null:
+                    (nulls if field is first else conditions).append(
+                        equals & Q(**{f"{name}__isnull": True})
+                    )
+                equals &= Q(**{name: value})
+
+        if values and first_value is not None:
+            bound = Q(
+                **{f"{first.attname}__{'lte' if first_desc else 'gte'}": first_value}
+            )
+            values = [bound & reduce(or_, values)]
+        segments = [values, nulls] if first_desc else [nulls, values]
+        return [reduce(or_, segment) for segment in segments if segment]
+
+    def encode_cursor(self, item: Model) -> str:
+        position = [
+            None
+            if field.value_from_object(item) is None
+            else field.value_to_string(item)
+            for field, _ in self.ordering_fields
+        ]
+        return urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    def decode_cursor(self, cursor: str) -> list[Any]:
+        try:
+            position = json.loads(urlsafe_b64decode(cursor.encode()))
+            if len(position) != len(self.ordering_fields):
+                raise ValueError
+            return [
+                None if value is None else field.to_python(value)
+                for (field, _), value in zip(self.ordering_fields, position)
+            ]
+        except (BinasciiError, ValueError, TypeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self) -> Optional[str]:
+        if self.has_next:
+            return replace_query_param(
+                self.request.build_absolute_uri(),
+                self.cursor_query_param,
+                self.encode_cursor(self.page[-1]),
+            )
+        return None
+
+    def get_paginated_response(self, data: list | Mapping) -> Response:
+        if isinstance(data, Mapping):  # index_key grouped
+            return Response(
+                OrderedDict([("next", self.get_next_link()), *data.items()])
+            )
+        else:
+            return Response(
+                OrderedDict([("next", self.get_next_link()), ("results", data)])
+            )
@@ -1,12 +1,21 @@
+import threading
+import weakref
 from collections import OrderedDict, defaultdict
-from itertools import chain
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import reduce
+from itertools import chain, groupby
+from operator import or_
 from typing import Any, Container, Iterable, Mapping, Optional, Type
 
 from django.contrib.contenttypes.fields import GenericRelation
+from django.core.exceptions import FieldDoesNotExist
 from django.core.exceptions import ValidationError as DjangoValidationError
-from django.db.models import Manager, Model, UniqueConstraint
+from django.db.models import CASCADE, Manager, Model, Q, QuerySet, UniqueConstraint
 from django.db.models.fields.related import RelatedField
+from django.db.models.signals import m2m_changed, post_save
 from django.forms.models import model_to_dict
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from drf_writable_nested.mixins import NestedCreateMixin
 from rest_framework.fields import SkipField, get_error_detail, set_value
@@ -19,22 +28,49 @@ from rest_framework.serializers import (
 )
 from rest_framework.settings import api_settings
 from rest_framework.utils.html import is_html_input, parse_html_list
-from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+from rest_framework.utils.serializer_helpers import (
+    BindingDict,
+    ReturnDict,
+    ReturnList,
+)
 
-from decorators import lazy_load_property
+from decorators import lazy_load_classmethod, lazy_load_property
 
 
 class CreateOrMergeWithDataMixin:
+    """
+    Save into the rows sharing any unique field (or unique constraint fields) value
+      w/ validated data, merging them into one if several are found
+    """
+
+    fetched_instances: Optional[list[Model]]
+
     def save(self, **kwargs) -> Model:
-        self.instance, extra_kwargs = self.search_instance(**self.validated_data)
+        if (instances := getattr(self, "fetched_instances", None)) is not None:
+            self.instance, extra_kwargs = self.merge_instances(instances)
+        else:
+            self.instance, extra_kwargs = self.search_instance(**self.validated_data)
         self.instance = super().save(**extra_kwargs | kwargs)
         return self.instance
 
-    def search_instance(
-        self, **validated_data
-    ) -> tuple[Optional[Model], dict[str, Any]]:
-        ModelClass: Type[Model] = self.Meta.model
+    @lazy_load_classmethod
+    def unique_lookup_fields(cls) -> tuple[tuple[str, ...], ...]:
+        """
+        Field names of each unique field & unique constraint
+          (related fields are not searched)
+        """
+        ModelClass: Type[Model] = cls.Meta.model
+        return tuple(
+            (f.name,)
+            for f in ModelClass._meta.fields
+            if f.unique and not isinstance(f, RelatedField)
+        ) + tuple(
+            tuple(c.fields)
+            for c in ModelClass._meta.constraints
+            if isinstance(c, UniqueConstraint)
+        )
 
+    def get_lookups(self, validated_data: Mapping[str, Any]) -> list[dict[str, Any]]:
         search_kwargs = {
             k: v
             for k, v in validated_data.items()
@@ -42,48 +78,75 @@ class CreateOrMergeWithDataMixin:
             and k
             in {
                 f.name
-                for f in ModelClass._meta.fields
+                for f in self.Meta.model._meta.fields
                 if not isinstance(f, RelatedField)  # TODO: RelationField Search
             }
         }
+        return [
+            {fname: search_kwargs[fname] for fname in fields}
+            for fields in self.unique_lookup_fields()
+            if all(fname in search_kwargs for fname in fields)
+        ]
+
+    def fetch_instances(
+        self, validated_data_list: Iterable[Optional[Mapping[str, Any]]]
+    ) -> list[Optional[list[Model]]]:
+        """
+        Rows to merge w/ for each validated data, searched in one query
+          - None for data w/o any lookup or data sharing lookups or rows w/ previous ones
+            (to be searched again on save, after previous ones are saved)
+        """
+        lookups_list = [
+            self.get_lookups(validated_data) if validated_data is not None else []
+            for validated_data in validated_data_list
+        ]
+        if not (lookups_all := [lookup for ls in lookups_list for lookup in ls]):
+            return [None] * len(lookups_list)
+
+        fetched = list(
+            self.Meta.model.objects.filter(
+                reduce(or_, (Q(**lookup) for lookup in lookups_all))
+            )
+        )
 
-        instances = []
+        result = []
+        seen_lookups, seen_pks = set(), set()
+        for lookups in lookups_list:
+            instances = [
+                inst
+                for lookup in lookups
+                for inst in fetched
+                if all(getattr(inst, k) == v for k, v in lookup.items())
+            ]
+            instances = list(dict.fromkeys(instances))  # in lookups order
+            lookup_keys = {tuple(lookup.items()) for lookup in lookups}
+            pks = {inst.pk for inst in instances}
+            if not lookups or lookup_keys & seen_lookups or pks & seen_pks:
+                result.append(None)
+            else:
+                result.append(instances)
+            seen_lookups |= lookup_keys
+            seen_pks |= pks
+        return result
 
-        for model_field in ModelClass._meta.fields:
-            if (
-                model_field.unique
-                and model_field.name in search_kwargs.keys()
-                and (
-                    fetched := ModelClass.objects.filter(
-                        **{model_field.name: search_kwargs[model_field.name]}
-                    )
-                )
-            ):
-                if (inst := fetched.get()) not in instances:
-                    instances.append(inst)
-
-        if constraints := ModelClass._meta.constraints:
-            for unique_contraint in [
-                c for c in constraints if isinstance(c, UniqueConstraint)
-            ]:
-                if all(
-                    fname in search_kwargs.keys() for fname in unique_contraint.fields
-                ) and (
-                    fetched := ModelClass.objects.filter(
-                        **{
-                            fname: search_kwargs[fname]
-                            for fname in unique_contraint.fields
-                        }
-                    )
-                ):
-                    if (inst := fetched.get()) not in instances:
-                        instances.append(inst)
+    def search_instance(
+        self, **validated_data
+    ) -> tuple[Optional[Model], dict[str, Any]]:
+        instances = self.fetch_instances([validated_data])[0] or []
+        return self.merge_instances(instances)
 
+    def merge_instances(
+        self, instances: list[Model]
+    ) -> tuple[Optional[Model], dict[str, Any]]:
+        instances = list(instances)
+        merge_fields = [
+            k for k, v in self.validated_data.items() if v not in {None, ""}
+        ]
         extra_kwargs = {
             k: v
             for inst in instances
-            for k, v in model_to_dict(inst).items()
-            if self.validated_data.get(k) not in {None, ""} and v not in {None, ""}
+            for k, v in model_to_dict(inst, fields=merge_fields).items()
+            if v not in {None, ""}
         }
 
         if len(instances) > 1:
@@ -180,17 +243,15 @@ class CollectSkippedErrorsMixin:
 
     @skipped_errors.deleter
     def skipped_errors(self):
-        del self._skipped_errors
+        self.__dict__.pop("_skipped_errors", None)
         if hasattr(self, "skipped_field_errors"):
             del self.skipped_field_errors
         if hasattr(self, "skipped_child_errors"):
             del self.skipped_child_errors
         if isinstance(self, Serializer):
             for f in self.fields.values():
-                if isinstance(f, BaseSerializer) and getattr(
-                    f, "skipped_errors", False
-                ):
-                    del f.skipped_errors
+                if isinstance(f, CollectSkippedErrorsMixin):
+                    del f.skipped_errors  # empty ones are cached as well
 
 
 class SkipFieldsMixin(CollectSkippedErrorsMixin):
@@ -294,20 +355,18 @@ class SkipChildsMixin(CollectSkippedErrorsMixin):
 
         for item in data:
             try:
-                if getattr(self.child, "skipped_errors", False):
-                    import ipdb
-
-                    ipdb.set_trace()
                 validated = self.child.run_validation(item)
             except ValidationError as exc:
                 err = exc.detail
             else:
                 ret.append(validated)
                 err = {}
-            if getattr(self.child, "skipped_errors", False):
-                assert isinstance(self.child, CollectSkippedErrorsMixin)
-                err = self.child.merge_serializer_errors(self.child.skipped_errors, err)
-                del self.child.skipped_errors
+            if isinstance(self.child, CollectSkippedErrorsMixin):
+                if self.child.skipped_errors:
+                    err = self.child.merge_serializer_errors(
+                        self.child.skipped_errors, err
+                    )
+                del self.child.skipped_errors  # child is reused for next item
             errors.append(err)
 
         if any(errors):
@@ -317,6 +376,28 @@ class SkipChildsMixin(CollectSkippedErrorsMixin):
 
 
 class NestedCreateMixin(NestedCreateMixin):
+    fetched_relations: dict[str, Optional[list[Model]]]
+
+    def fetch_related_instances(
+        self, field: BaseSerializer, related_data: list[Mapping[str, Any]]
+    ) -> dict[Optional[str], list[Optional[list[Model]]]]:
+        """
+        Rows to merge w/ for each related data, searched in one query per
+          CreateOrMergeWithDataMixin serializer of the child or of its direct relations
+          - key None: child itself / field name: direct relation of child
+        """
+        child = getattr(field, "child", field)
+        fetched = {}
+        if isinstance(child, CreateOrMergeWithDataMixin):
+            fetched[None] = child.fetch_instances(related_data)
+        if isinstance(child, NestedCreateMixin):
+            for fname, nested in child.fields.items():
+                if isinstance(nested, CreateOrMergeWithDataMixin):
+                    fetched[fname] = nested.fetch_instances(
+                        [data.get(fname) for data in related_data]
+                    )
+        return fetched
+
     def update_or_create_direct_relations(self, attrs, relations):
         for field_name, (field, field_source) in relations.items():
             obj = None
@@ -332,6 +413,9 @@ class NestedCreateMixin(NestedCreateMixin):
                 instance=obj,
                 data=data,
             )
+            serializer.fetched_instances = getattr(self, "fetched_relations", {}).get(
+                field_name
+            )
 
             try:
                 serializer.is_valid(raise_exception=True)
@@ -381,20 +465,38 @@ class NestedCreateMixin(NestedCreateMixin):
             elif not related_field.many_to_many:
                 save_kwargs[related_field.name] = instance
 
+            fetched = self.fetch_related_instances(field, related_data)
+            bulk_create = self.can_bulk_create(related_field, field)
+
             new_related_instances = []
+            to_bulk_create: list[tuple[dict, Model]] = []
             errors = []
-            for data in related_data:
+            for idx, data in enumerate(related_data):
                 obj = instances.get(self._get_related_pk(data, field.Meta.model))
                 serializer = self._get_serializer_for_field(
                     field,
                     instance=obj,
                     data=data,
                 )
+                fetched_at = {fname: f[idx] for fname, f in fetched.items()}
+                serializer.fetched_instances = fetched_at.pop(None, None)
+                serializer.fetched_relations = fetched_at
                 try:
                     serializer.is_valid(raise_exception=True)
-                    related_instance = serializer.save(**save_kwargs)
-                    data["pk"] = related_instance.pk
-                    new_related_instances.append(related_instance)
+                    if (
+                        bulk_create
+                        and obj is None
+                        and (
+                            unsaved := self.build_related_instance(
+                                serializer, save_kwargs
+                            )
+                        )
+                    ):
+                        to_bulk_create.append((data, unsaved))
+                    else:
+                        related_instance = serializer.save(**save_kwargs)
+                        data["pk"] = related_instance.pk
+                        new_related_instances.append(related_instance)
                     errors.append({})
                 except ValidationError as exc:
                     errors.append(exc.detail)
@@ -405,10 +507,146 @@ class NestedCreateMixin(NestedCreateMixin):
                 else:
                     raise ValidationError({field_name: errors})
 
+            if to_bulk_create := self.drop_cascaded(to_bulk_create, related_field):
+                created = field.Meta.model.objects.bulk_create(
+                    [unsaved for _, unsaved in to_bulk_create]
+                )
+                for data, child in to_bulk_create:
+                    data["pk"] = child.pk
+                self.send_created_signals(field.Meta.model, created)
+
             if related_field.many_to_many:
-                # Add m2m instances to through model via add
                 m2m_manager = getattr(instance, field_source)
-                m2m_manager.add(*new_related_instances)
+                if self.bulk_create_children and m2m_manager.through._meta.auto_created:
+                    # Add m2m instances to through model in one insert w/o reading existing links
+                    with self.m2m_add_signals(m2m_manager, new_related_instances):
+                        m2m_manager.through.objects.bulk_create(
+                            [
+                                m2m_manager.through(
+                                    **{
+                                        f"{m2m_manager.source_field_name}_id": instance.pk,
+                                        f"{m2m_manager.target_field_name}_id": related.pk,
+                                    }
+                                )
+                                for related in new_related_instances
+                            ],
+                            ignore_conflicts=True,
+                        )
+                else:
+                    # Add m2m instances to through model via add
+                    m2m_manager.add(*new_related_instances)
+
+    def drop_cascaded(
+        self, to_bulk_create: list[tuple[dict, Model]], related_field: Any
+    ) -> list[tuple[dict, Model]]:
+        """
+        Drop children whose direct relation was deleted while saving later siblings
+          (ex. person merged into another one), as cascade would have done
+          if they were saved one by one
+        """
+        if not to_bulk_create:
+            return to_bulk_create
+
+        ModelClass: Type[Model] = related_field.model
+        for fk in ModelClass._meta.concrete_fields:
+            if (
+                fk.many_to_one
+                and fk is not related_field
+                and fk.remote_field.on_delete is CASCADE
+                and (
+                    pks := {
+                        pk
+                        for _, unsaved in to_bulk_create
+                        if (pk := getattr(unsaved, fk.attname)) is not None
+                    }
+                )
+            ):
+                existing = set(
+                    fk.related_model._base_manager.filter(pk__in=pks).values_list(
+                        "pk", flat=True
+                    )
+                )
+                to_bulk_create = [
+                    (data, unsaved)
+                    for data, unsaved in to_bulk_create
+                    if getattr(unsaved, fk.attname) in existing | {None}
+                ]
+        return to_bulk_create
+
+    @staticmethod
+    def send_created_signals(ModelClass: Type[Model], created: list[Model]):
+        """
+        Send post_save of each bulk created child, as saving it would have
+          (pre_save is not sent, as rows are inserted already)
+        """
+        for child in created:
+            post_save.send(
+                sender=ModelClass,
+                instance=child,
+                created=True,
+                update_fields=None,
+                raw=False,
+                using=child._state.db,
+            )
+
+    @staticmethod
+    @contextmanager
+    def m2m_add_signals(m2m_manager: Manager, related_instances: list[Model]):
+        """
+        Send pre_add & post_add m2m_changed around links bulk created, as add() would
+          (pk_set includes links existing already, as they are not read)
+        """
+        if not related_instances:
+            yield
+            return
+        kwargs = {
+            "sender": m2m_manager.through,
+            "instance": m2m_manager.instance,
+            "reverse": m2m_manager.reverse,
+            "model": m2m_manager.model,
+            "pk_set": {related.pk for related in related_instances},
+            "using": m2m_manager.instance._state.db,
+        }
+        m2m_changed.send(action="pre_add", **kwargs)
+        yield
+        m2m_changed.send(action="post_add", **kwargs)
+
+    @property
+    def bulk_create_children(self) -> bool:
+        return getattr(self.Meta, "bulk_create_children", False)
+
+    def can_bulk_create(self, related_field: Any, field: BaseSerializer) -> bool:
+        """
+        Whether new children of many-to-one relation can be inserted w/ one bulk_create
+          (w/ `Meta.bulk_create_children`, sending post_save & m2m_changed of
+          inserted rows explicitly, so that receivers see them as if saved one by one)
+        """
+        return (
+            self.bulk_create_children
+            and related_field.many_to_one
+            and not isinstance(field, CreateOrMergeWithDataMixin)
+        )
+
+    def build_related_instance(
+        self, serializer: BaseSerializer, save_kwargs: dict[str, Any]
+    ) -> Optional[Model]:
+        """
+        Unsaved instance of validated child to bulk create (its direct relations saved)
+          - None for children w/ many-to-many or reverse relations data to save by itself
+        """
+        validated_data = {**serializer.validated_data, **save_kwargs}
+        ModelClass: Type[Model] = serializer.Meta.model
+        if any(f.name in validated_data for f in ModelClass._meta.many_to_many):
+            return None
+
+        if isinstance(serializer, NestedCreateMixin):
+            relations, reverse_relations = serializer._extract_relations(validated_data)
+            if reverse_relations:
+                return None
+            serializer._save_kwargs = defaultdict(dict, save_kwargs)
+            serializer.update_or_create_direct_relations(validated_data, relations)
+
+        return ModelClass(**validated_data)
 
 
 class SkipChildsListSerializer(SkipChildsMixin, ListSerializer):
@@ -430,39 +668,60 @@ class IndexedListSerializer(ListSerializer):
             )
         self.index_key = index_key
 
+    def get_index_attname(self, model: Type[Model]) -> str:
+        """
+        Model attribute for `index_key` (`*_id` for foreign key w/o fetching related object)
+        """
+        try:
+            return getattr(
+                model._meta.get_field(self.index_key), "attname", self.index_key
+            )
+        except FieldDoesNotExist:
+            return self.index_key
+
+    def get_index(self, item) -> Any:
+        if isinstance(item, Model):
+            if hasattr(item, attname := self.get_index_attname(item.__class__)):
+                idx_field = getattr(item, attname)
+                if isinstance(idx_field, Model):
+                    return idx_field.pk  # use related model pk as index
+                else:
+                    return idx_field
+            else:
+                raise ValueError(
+                    f"Cannot find index key '{self.index_key}' in model '{item.__class__.__name__}' attributes"
+                )
+        else:
+            if self.index_key in item.keys():
+                return item[self.index_key]
+            else:
+                raise ValueError(
+                    f"Cannot find index key '{self.index_key}' in mapping {item} keys"
+                )
+
     def to_representation(self, data):
         """
         List of object instances -> List of dicts of primitive datatypes.
+          - w/ `index_key`, queryset is ordered by index column in SQL & streamed,
+            so that each group is represented as soon as its rows are read
         """
         # Dealing with nested relationships, data can be a Manager,
         # so, first get a queryset from the Manager if needed
         iterable = data.all() if isinstance(data, Manager) else data
         if self.index_key:
+            if isinstance(iterable, QuerySet):
+                iterable = iterable.order_by(
+                    self.get_index_attname(iterable.model),
+                    *(iterable.query.order_by or iterable.model._meta.ordering),
+                ).iterator()
+
             idx_representation = {
                 "index_key": self.index_key,
                 "results": defaultdict(list),
             }
-            for item in iterable:
-                if isinstance(item, Model):
-                    if hasattr(item, self.index_key):
-                        idx_field = getattr(item, self.index_key)
-                        if isinstance(idx_field, Model):
-                            idx_key = idx_field.pk  # use related model pk as index
-                        else:
-                            idx_key = idx_field
-                    else:
-                        raise ValueError(
-                            f"Cannot find index key '{self.index_key}' in model '{item.__class__.__name__}' attributes"
-                        )
-                else:
-                    if self.index_key in item.keys():
-                        idx_key = item[self.index_key]
-                    else:
-                        raise ValueError(
-                            f"Cannot find index key '{self.index_key}' in mapping {item} keys"
-                        )
-                idx_representation["results"][idx_key].append(
-                    self.child.to_representation(item)
+            for idx_key, items in groupby(iterable, key=self.get_index):
+                idx_representation["results"][idx_key].extend(
+                    self.child.to_representation(item) for item in items
                 )
             return idx_representation
         else:
@@ -477,6 +736,106 @@ class IndexedListSerializer(ListSerializer):
             return ReturnList(ret, serializer=self)
 
 
+@dataclass
+class FieldsTree:
+    fields: BindingDict
+    owner: Optional[weakref.ref] = None  # instance using fields, if any
+
+
+class ReusableFieldsMixin:
+    """
+    Build nested fields tree once per serializer class (& thread) & reuse it for
+      every instance w/ `reuse_fields` (for validating many inputs in bulk)
+      - reused fields are re-parented to one instance at a time, & handed over once
+        it is saved or fails validation (rebuilt for it, if used again afterwards)
+      - an instance created while the tree is used by another builds its own
+      - per validation state of nested serializers is cleared after each `is_valid()`
+        (skipped errors are kept on the instance validated)
+    """
+
+    reuse_fields: bool = False
+    per_validation_attrs = (
+        "skipped_field_errors",
+        "skipped_child_errors",
+        "_skipped_errors",
+    )
+
+    _fields_trees = threading.local()
+    _fields_released = False
+
+    def __init__(self, *args, reuse_fields: Optional[bool] = None, **kwargs):
+        if reuse_fields is not None:
+            self.reuse_fields = reuse_fields
+        super().__init__(*args, **kwargs)
+
+    @cached_property
+    def fields(self) -> BindingDict:
+        if not self.reuse_fields or self._fields_released:
+            return super().fields
+
+        trees = self._fields_trees.__dict__
+        if (tree := trees.get(self.__class__)) is None:
+            fields = super().fields
+            trees[self.__class__] = FieldsTree(fields, weakref.ref(self))
+            return fields
+        if tree.owner is not None and tree.owner() is not None:
+            return super().fields  # still used by another instance
+        tree.owner = weakref.ref(self)
+        tree.fields.serializer = self
+        for field in tree.fields.values():
+            field.parent = self
+        return tree.fields
+
+    def release_fields(self):
+        """
+        Hand reused fields tree over to next instance
+        """
+        tree = self._fields_trees.__dict__.get(self.__class__)
+        if (
+            tree is not None
+            and tree.owner is not None
+            and tree.owner() is self
+            and self.__dict__.get("fields") is tree.fields
+        ):
+            tree.owner = None
+            del self.__dict__["fields"]
+            self._fields_released = True
+
+    def is_valid(self, raise_exception: bool = False) -> bool:
+        valid = False
+        try:
+            valid = super().is_valid(raise_exception=raise_exception)
+            return valid
+        finally:
+            if self.reuse_fields:
+                if isinstance(self, CollectSkippedErrorsMixin):
+                    skipped_errors = self.skipped_errors
+                    self.clear_fields_state()
+                    self._skipped_errors = skipped_errors
+                else:
+                    self.clear_fields_state()
+                if not valid:
+                    self.release_fields()
+
+    def save(self, **kwargs) -> Model:
+        try:
+            return super().save(**kwargs)
+        finally:
+            if self.reuse_fields:
+                self.release_fields()
+
+    def clear_fields_state(self):
+        nodes = list(self.fields.values())
+        while nodes:
+            node = nodes.pop()
+            for attr in self.per_validation_attrs:
+                node.__dict__.pop(attr, None)
+            if isinstance(node, ListSerializer):
+                nodes.append(node.child)
+            elif isinstance(node, Serializer):
+                nodes.extend(node.fields.values())
+
+
 class UseIndexedListSerializerMixin:
     @classmethod
     def many_init(cls, *args, **kwargs):
@@ -1,9 +1,15 @@
-from typing import Any, Type
+from typing import Any, Optional, Type
 
 from django.db.models.query import QuerySet
 from rest_framework.mixins import ListModelMixin
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.serializers import ModelSerializer
+from rest_framework.views import APIView
+
+from instrumentation import Registry, registry
 
 
 class CollectUserFromRequestMixin:
@@ -17,16 +23,22 @@ class SearchAndListModelMixin(ListModelMixin):
     qstring_serializer_class: Type[ModelSerializer]
 
     def prepare_qstring_data(self) -> dict[str, Any]:
-        return self.request.query_params.dict()
+        qstring_data = self.request.query_params.dict()
+        for pagination_param in getattr(self.paginator, "query_params", ()):
+            qstring_data.pop(pagination_param, None)
+        return qstring_data
 
     def filter_queryset(self, queryset: QuerySet) -> QuerySet:
         if self.action == "list":
             qstring_serializer = self.get_serializer(data=self.prepare_qstring_data())
             qstring_serializer.is_valid(raise_exception=True)
-            return queryset.filter(**qstring_serializer.validated_data)
+            return self.apply_filters(queryset, dict(qstring_serializer.validated_data))
         else:
             return queryset
 
+    def apply_filters(self, queryset: QuerySet, filters: dict[str, Any]) -> QuerySet:
+        return queryset.filter(**filters)
+
     def get_serializer_class(self) -> Type[ModelSerializer]:
         if self.action == "list":
             return self.qstring_serializer_class
@@ -36,11 +48,40 @@ class SearchAndListModelMixin(ListModelMixin):
 
 class SearchAndIndexModelMixin(SearchAndListModelMixin):
     def prepare_qstring_data(self) -> dict[str, Any]:
-        qstring_data = self.request.query_params.dict()
+        qstring_data = super().prepare_qstring_data()
         qstring_data.pop("index_key", None)
         return qstring_data
 
+    @property
+    def index_key(self) -> Optional[str]:
+        if self.action == "list":
+            return self.request.query_params.get("index_key")
+
     def get_serializer(self, *args, **kwargs):
         if self.action == "list" and (args or "instance" in kwargs):
-            kwargs.update({"index_key": self.request.query_params.get("index_key")})
+            kwargs.update({"index_key": self.index_key})
         return super().get_serializer(*args, **kwargs)
+
+
+class PrometheusRenderer(BaseRenderer):
+    media_type = "text/plain"
+    format = "prometheus"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> str:
+        if isinstance(data, list):
+            return Registry.to_prometheus(data)
+        else:  # error details
+            return "\n".join(f"# {k}: {v}" for k, v in data.items()) + "\n"
+
+
+class MetricsView(APIView):
+    """
+    Instrumentation spans recorded in this process (`?format=prometheus` for scraping)
+    """
+
+    permission_classes = [IsAdminUser]
+    renderer_classes = [JSONRenderer, PrometheusRenderer]
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        return Response(registry.snapshot())